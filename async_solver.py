@@ -0,0 +1,206 @@
+from board import Board
+from solve_budget import CancellationToken
+import asyncio
+import constants
+import os
+import weakref
+
+
+class AsyncSolver:
+    """Solves and generates boards for asyncio code without blocking the event loop. The work runs in a pool of
+    worker processes (or threads), and at most max_pending jobs are handed to the pool at once. Callers past that
+    wait their turn, which holds back a flood of requests instead of queueing them all in the pool. Cancelling the
+    awaiting task drops a job that has not started. In a thread pool, it also stops a solve that is running through
+    its cancellation token. A process cannot be interrupted, so give a timeout to bound work that may be dropped."""
+
+    def __init__(self, workers=None, max_pending=None, processes=True):
+        """
+        Create an AsyncSolver object (the pool is started when it is first needed)
+        :param workers: None or Integer: The number of workers in the pool (None for one per CPU)
+        :param max_pending: None or Integer: The most jobs handed to the pool at once from each event loop (None for
+        two per worker)
+        :param processes: Boolean: Should the work run in processes, which use every CPU, instead of threads, which
+        can be cancelled while running but share one CPU?
+        """
+        self._workers = workers or os.cpu_count() or 1
+        self._max_pending = max_pending or self._workers * 2
+        self._processes = processes
+        self._executor = None  # The pool of workers once it is started
+        # Limits the jobs handed to the pool from each event loop (made in the loop on first use, since a semaphore
+        # only works in the loop it was first used in, and dropped once the loop is gone):
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    async def solve(self, board, engine=constants.BACKTRACKING_ENGINE, max_nodes=None, timeout=None):
+        """
+        Solve a board without blocking the event loop. The board is filled in once the solution comes back, so it is
+        left unchanged if solving fails or is cancelled.
+        :param board: Board: The board to solve
+        :param engine: String: The solver engine to use (constants.BACKTRACKING_ENGINE or constants.DLX_ENGINE)
+        :param max_nodes: None or Integer: The most values the search can try (None for no limit)
+        :param timeout: None or Float: The most seconds the solve can take once it starts (None for no limit)
+        :return: None
+        """
+        # Only the 81 values are sent to the worker, which sends back the solved values:
+        state = await self._run(_solve_state, board.snapshot(), engine, max_nodes, timeout)
+        board.restore(state)
+
+    async def count_solutions(self, board, limit=2, engine=constants.BACKTRACKING_ENGINE, max_nodes=None,
+                              timeout=None):
+        """
+        Count the solutions of a board without blocking the event loop
+        :param board: Board: The board to check
+        :param limit: None or Integer: The number of solutions to stop counting at (None to count all of them)
+        :param engine: String: The solver engine to use (constants.BACKTRACKING_ENGINE or constants.DLX_ENGINE)
+        :param max_nodes: None or Integer: The most values the search can try (None for no limit)
+        :param timeout: None or Float: The most seconds the search can take once it starts (None for no limit)
+        :return: Integer: The number of solutions found (at most limit)
+        """
+        return await self._run(_count_state, board.snapshot(), limit, engine, max_nodes, timeout)
+
+    async def generate(self, max_remove=constants.HARD_REMOVE):
+        """
+        Generate a board with one solution without blocking the event loop
+        :param max_remove: Integer: The maximum amount of numbers to remove from the board (the difficulty)
+        :return: Board: An unsolved sudoku board with one unique solution
+        """
+        puzzle = await self._run(_generate_puzzle, max_remove)
+        return Board.from_string(puzzle)
+
+    def close(self):
+        """
+        Stop the pool, dropping any jobs that have not started
+        :return: None
+        """
+        if self._executor is not None:
+            executor = self._executor
+            self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self):
+        """
+        Use the solver in an async with block that closes it at the end
+        :return: AsyncSolver: This solver
+        """
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        """
+        Close the solver at the end of an async with block
+        :return: None
+        """
+        self.close()
+
+    async def _run(self, func, *args):
+        """
+        Run a function in the pool once there is room for another job
+        :param func: Function: A module-level function (so it can be sent to a process) taking args and a
+        CancellationToken or None
+        :param args: Any: The arguments of the function
+        :return: Any: The result of the function
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self._max_pending)
+        async with semaphore:
+            # A token cannot be shared with a process, so only threads get one:
+            token = None if self._processes else CancellationToken()
+            try:
+                return await loop.run_in_executor(self._get_executor(), func, *args, token)
+            except asyncio.CancelledError:
+                # The caller went away, so stop the solve if it is running in a thread:
+                if token is not None:
+                    token.cancel()
+                raise
+
+    def _get_executor(self):
+        """
+        Get the pool of workers, starting it the first time
+        :return: Executor: The process or thread pool
+        """
+        if self._executor is None:
+            # Only import the pools when used since they are slow to import:
+            if self._processes:
+                from concurrent.futures import ProcessPoolExecutor
+                self._executor = ProcessPoolExecutor(max_workers=self._workers)
+            else:
+                from concurrent.futures import ThreadPoolExecutor
+                self._executor = ThreadPoolExecutor(max_workers=self._workers)
+        return self._executor
+
+
+_default_solver = None  # The AsyncSolver used by the module-level functions, made on first use
+
+
+async def solve_async(board, engine=constants.BACKTRACKING_ENGINE, max_nodes=None, timeout=None):
+    """
+    Solve a board without blocking the event loop, using a shared AsyncSolver
+    :param board: Board: The board to solve
+    :param engine: String: The solver engine to use (constants.BACKTRACKING_ENGINE or constants.DLX_ENGINE)
+    :param max_nodes: None or Integer: The most values the search can try (None for no limit)
+    :param timeout: None or Float: The most seconds the solve can take once it starts (None for no limit)
+    :return: None
+    """
+    await get_default_solver().solve(board, engine, max_nodes, timeout)
+
+
+async def generate_async(max_remove=constants.HARD_REMOVE):
+    """
+    Generate a board with one solution without blocking the event loop, using a shared AsyncSolver
+    :param max_remove: Integer: The maximum amount of numbers to remove from the board (the difficulty)
+    :return: Board: An unsolved sudoku board with one unique solution
+    """
+    return await get_default_solver().generate(max_remove)
+
+
+def get_default_solver():
+    """
+    Get the AsyncSolver shared by solve_async and generate_async
+    :return: AsyncSolver: The shared solver, with a process per CPU
+    """
+    global _default_solver
+    if _default_solver is None:
+        _default_solver = AsyncSolver()
+    return _default_solver
+
+
+def _solve_state(state, engine, max_nodes, timeout, cancel):
+    """
+    Solve the values of a board in a worker
+    :param state: Bytes: The values of the board from Board.snapshot
+    :param engine: String: The solver engine to use
+    :param max_nodes: None or Integer: The most values the search can try
+    :param timeout: None or Float: The most seconds the solve can take
+    :param cancel: None or CancellationToken: A token that stops the solve once it is cancelled
+    :return: Bytes: The values of the solved board
+    """
+    b = Board()
+    b.restore(state)
+    b.solve(engine=engine, max_nodes=max_nodes, timeout=timeout, cancel=cancel)
+    return b.snapshot()
+
+
+def _count_state(state, limit, engine, max_nodes, timeout, cancel):
+    """
+    Count the solutions of the values of a board in a worker
+    :param state: Bytes: The values of the board from Board.snapshot
+    :param limit: None or Integer: The number of solutions to stop counting at
+    :param engine: String: The solver engine to use
+    :param max_nodes: None or Integer: The most values the search can try
+    :param timeout: None or Float: The most seconds the search can take
+    :param cancel: None or CancellationToken: A token that stops the search once it is cancelled
+    :return: Integer: The number of solutions found
+    """
+    b = Board()
+    b.restore(state)
+    return b.count_solutions(limit, engine, max_nodes=max_nodes, timeout=timeout, cancel=cancel)
+
+
+def _generate_puzzle(max_remove, cancel):
+    """
+    Generate a puzzle in a worker
+    :param max_remove: Integer: The maximum amount of numbers to remove from the board
+    :param cancel: None or CancellationToken: Unused since generating is quick and cannot be cancelled
+    :return: String: The generated puzzle as 81 characters
+    """
+    return Board.generate_board(max_remove).to_string()
@@ -0,0 +1,275 @@
+from collections import deque
+from board import Board
+from solve_budget import BudgetExceededError
+import constants
+import os
+
+
+class SolveResult:
+    """Represents the outcome of solving one puzzle from a batch"""
+
+    __slots__ = ('_puzzle', '_solution', '_error')  # Fixed attributes so large batches of results stay small
+
+    def __init__(self, puzzle, solution=None, error=None):
+        """
+        Create a SolveResult object
+        :param puzzle: String: The puzzle that was solved as 81 characters
+        :param solution: None or String: The solution as 81 characters, None if the puzzle could not be solved
+        :param error: None or String: The error message if the puzzle could not be solved
+        """
+        self._puzzle = puzzle
+        self._solution = solution
+        self._error = error
+
+    def get_puzzle(self):
+        """
+        Get the puzzle that was solved
+        :return: String: The puzzle as 81 characters
+        """
+        return self._puzzle
+
+    def get_solution(self):
+        """
+        Get the solution of the puzzle
+        :return: None or String: The solution as 81 characters, None if the puzzle could not be solved
+        """
+        return self._solution
+
+    def get_error(self):
+        """
+        Get the reason the puzzle could not be solved
+        :return: None or String: The error message, None if the puzzle was solved
+        """
+        return self._error
+
+    def is_solved(self):
+        """
+        Check if the puzzle was solved
+        :return: Boolean: Was a solution found?
+        """
+        return self._solution is not None
+
+
+class CountResult:
+    """Represents the outcome of counting the solutions of one puzzle from a batch"""
+
+    __slots__ = ('_puzzle', '_count', '_error')  # Fixed attributes so large batches of results stay small
+
+    def __init__(self, puzzle, count=None, error=None):
+        """
+        Create a CountResult object
+        :param puzzle: String: The puzzle that was checked as 81 characters
+        :param count: None or Integer: The number of solutions found (up to the limit), None if the puzzle is invalid
+        :param error: None or String: The error message if the puzzle is invalid
+        """
+        self._puzzle = puzzle
+        self._count = count
+        self._error = error
+
+    def get_puzzle(self):
+        """
+        Get the puzzle that was checked
+        :return: String: The puzzle as 81 characters
+        """
+        return self._puzzle
+
+    def get_count(self):
+        """
+        Get the number of solutions of the puzzle
+        :return: None or Integer: The number of solutions found (up to the limit), None if the puzzle is invalid
+        """
+        return self._count
+
+    def get_error(self):
+        """
+        Get the reason the puzzle could not be checked
+        :return: None or String: The error message, None if the solutions were counted
+        """
+        return self._error
+
+
+def solve_many(puzzles, workers=None, chunksize=64, engine=constants.BACKTRACKING_ENGINE, max_nodes=None,
+               timeout=None):
+    """
+    Solve many puzzles using a pool of worker processes
+    :param puzzles: Iterable of (String or Board): The puzzles to solve, as 81 characters ('0' or '.' for empty cells)
+    or boards
+    :param workers: None or Integer: The number of worker processes (None for one per CPU, 1 to solve in this process)
+    :param chunksize: Integer: The number of puzzles sent to a worker at a time
+    :param engine: String: The solver engine to use (constants.BACKTRACKING_ENGINE or constants.DLX_ENGINE)
+    :param max_nodes: None or Integer: The most values the search can try for each puzzle (None for no limit)
+    :param timeout: None or Float: The most seconds each puzzle can take (None for no limit)
+    :return: List of SolveResult: The result for each puzzle in the same order as the puzzles were given
+    """
+    return list(solve_iter(puzzles, workers, chunksize, engine, max_nodes, timeout))
+
+
+def solve_iter(puzzles, workers=None, chunksize=64, engine=constants.BACKTRACKING_ENGINE, max_nodes=None,
+               timeout=None):
+    """
+    Solve puzzles using a pool of worker processes, yielding each result as soon as it and all of the results before
+    it are ready. Only a few chunks are sent to the workers ahead of time, so puzzles are read as they are needed.
+    :param puzzles: Iterable of (String or Board): The puzzles to solve, as 81 characters ('0' or '.' for empty cells)
+    or boards
+    :param workers: None or Integer: The number of worker processes (None for one per CPU, 1 to solve in this process)
+    :param chunksize: Integer: The number of puzzles sent to a worker at a time
+    :param engine: String: The solver engine to use (constants.BACKTRACKING_ENGINE or constants.DLX_ENGINE)
+    :param max_nodes: None or Integer: The most values the search can try for each puzzle (None for no limit)
+    :param timeout: None or Float: The most seconds each puzzle can take (None for no limit)
+    :return: Generator of SolveResult: The result for each puzzle in the same order as the puzzles were given, with
+    an error for the puzzles that ran out of budget
+    """
+    for result in _map_ordered(_solve_puzzle, _as_strings(puzzles), workers, chunksize, engine, max_nodes, timeout):
+        yield SolveResult(*result)
+
+
+def count_iter(puzzles, limit=2, workers=None, chunksize=64, engine=constants.BACKTRACKING_ENGINE):
+    """
+    Count the solutions of puzzles using a pool of worker processes, yielding each result in order as soon as it is
+    ready
+    :param puzzles: Iterable of (String or Board): The puzzles to check, as 81 characters ('0' or '.' for empty cells)
+    or boards
+    :param limit: None or Integer: The number of solutions to stop counting at for each puzzle (None to count all)
+    :param workers: None or Integer: The number of worker processes (None for one per CPU, 1 to count in this process)
+    :param chunksize: Integer: The number of puzzles sent to a worker at a time
+    :param engine: String: The solver engine to use (constants.BACKTRACKING_ENGINE or constants.DLX_ENGINE)
+    :return: Generator of CountResult: The result for each puzzle in the same order as the puzzles were given
+    """
+    for result in _map_ordered(_count_puzzle, _as_strings(puzzles), workers, chunksize, limit, engine):
+        yield CountResult(*result)
+
+
+def generate_iter(count, max_remove=constants.HARD_REMOVE, workers=None, chunksize=4, grade=None, symmetry=None,
+                  minimal=False, seed=None):
+    """
+    Generate puzzles using a pool of worker processes, yielding each one as soon as it is ready
+    :param count: Integer: The number of puzzles to generate
+    :param max_remove: Integer: The maximum amount of numbers to remove from each board
+    :param workers: None or Integer: The number of worker processes (None for one per CPU, 1 to generate in this
+    process)
+    :param chunksize: Integer: The number of puzzles given to a worker at a time
+    :param grade: None or String: The grade each puzzle should have (one of constants.GRADES), or None to only use
+    max_remove as the difficulty. Raises ValueError when a puzzle with the grade cannot be generated.
+    :param symmetry: None or String: The symmetry the empty cells of each puzzle should have (see
+    generator.SYMMETRIES), or None for no symmetry
+    :param minimal: Boolean: Should values be removed until none can be without a second solution?
+    :param seed: None or Integer: The seed of the first puzzle, with each next puzzle using the next seed so the
+    same puzzles come out however many workers there are (None for different puzzles each run)
+    :return: Generator of String: Each generated puzzle as 81 characters
+    """
+    return _map_ordered(_generate_puzzle, range(count), workers, chunksize, max_remove, grade, symmetry, minimal,
+                        seed)
+
+
+def _map_ordered(func, items, workers, chunksize, *args):
+    """
+    Call a function on each item using a pool of worker processes, yielding the results in the same order as the
+    items. Only a couple of chunks per worker are sent ahead of time, so the items are read as they are needed.
+    :param func: Function: A module-level function taking an item and args (so it can be sent to the workers)
+    :param items: Iterable: The items to call the function on
+    :param workers: None or Integer: The number of worker processes (None for one per CPU, 1 to run in this process)
+    :param chunksize: Integer: The number of items sent to a worker at a time
+    :param args: Any: Extra arguments given to every call of the function
+    :return: Generator: The result of the function for each item
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        # No pool is needed for a single worker:
+        for item in items:
+            yield func(item, *args)
+        return
+    # Only import the pool when it is used since it is slow to import and single puzzle calls never need it:
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()  # Futures for the chunks sent to the workers, in the order they were sent
+        for chunk in _chunks(items, chunksize):
+            pending.append(executor.submit(_run_chunk, func, chunk, args))
+            # Keep each worker busy with a couple of chunks, and wait for the oldest one before sending any more:
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _as_strings(puzzles):
+    """
+    Convert boards to strings, which are much cheaper to send to the workers than the objects
+    :param puzzles: Iterable of (String or Board): The puzzles to convert
+    :return: Generator of String: Each puzzle as 81 characters
+    """
+    for puzzle in puzzles:
+        yield puzzle if isinstance(puzzle, str) else puzzle.to_string()
+
+
+def _chunks(items, chunksize):
+    """
+    Split the items into lists of at most chunksize items
+    :param items: Iterable: The items to split
+    :param chunksize: Integer: The maximum number of items in each chunk
+    :return: Generator of List: The chunks of items in order
+    """
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _run_chunk(func, chunk, args):
+    """
+    Call a function on each item of a chunk in a worker process
+    :param func: Function: The function to call
+    :param chunk: List: The items to call the function on
+    :param args: Tuple: Extra arguments given to every call of the function
+    :return: List: The result of the function for each item
+    """
+    return [func(item, *args) for item in chunk]
+
+
+def _solve_puzzle(puzzle, engine, max_nodes=None, timeout=None):
+    """
+    Solve one puzzle, catching the error if it is not valid, cannot be solved, or runs out of budget
+    :param puzzle: String: The puzzle to solve as 81 characters
+    :param engine: String: The solver engine to use
+    :param max_nodes: None or Integer: The most values the search can try (None for no limit)
+    :param timeout: None or Float: The most seconds the solve can take (None for no limit)
+    :return: Tuple of (String, None or String, None or String): The puzzle, its solution, and the error message
+    """
+    try:
+        b = Board.from_string(puzzle)
+        b.solve(engine=engine, max_nodes=max_nodes, timeout=timeout)
+    except (ValueError, BudgetExceededError) as e:
+        return puzzle, None, str(e)
+    return puzzle, b.to_string(), None
+
+
+def _count_puzzle(puzzle, limit, engine):
+    """
+    Count the solutions of one puzzle, catching the error if it is not valid
+    :param puzzle: String: The puzzle to check as 81 characters
+    :param limit: None or Integer: The number of solutions to stop counting at
+    :param engine: String: The solver engine to use
+    :return: Tuple of (String, None or Integer, None or String): The puzzle, its number of solutions, and the error
+    message
+    """
+    try:
+        return puzzle, Board.from_string(puzzle).count_solutions(limit, engine), None
+    except ValueError as e:
+        return puzzle, None, str(e)
+
+
+def _generate_puzzle(num, max_remove, grade, symmetry, minimal, seed):
+    """
+    Generate one puzzle
+    :param num: Integer: The number of the puzzle being generated (from 0)
+    :param max_remove: Integer: The maximum amount of numbers to remove from the board
+    :param grade: None or String: The grade the puzzle should have
+    :param symmetry: None or String: The symmetry the empty cells should have
+    :param minimal: Boolean: Should values be removed until none can be?
+    :param seed: None or Integer: The seed of the first puzzle
+    :return: String: The generated puzzle as 81 characters
+    """
+    return Board.generate_board(max_remove, grade, symmetry, minimal, None if seed is None else seed + num).to_string()
@@ -0,0 +1,293 @@
+from board import Board
+from deductions import DeductionPipeline
+from solve_stats import SolveStats
+import constants
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Benchmark suite for the solver and generator:
+# Each benchmark times one operation over a list of items and reports its throughput, its median (p50) and 99th
+# percentile (p99) latency, the search nodes and backtracks it took, and the peak memory allocated while running it.
+# Results can be saved as JSON and compared with an earlier run to flag regressions.
+
+# Puzzles embedded so every run measures the same work:
+CORPORA = {
+    # Easy puzzles that the naked and hidden single checks solve with little or no searching:
+    "easy": (
+        "003020600900305001001806400008102900700000008006708200002609500800203009005010300",
+        "200080300060070084030500209000105408000000000402706000301007040720040060004010003",
+        "000000907000420180000705026100904000050000040000507009920108000034059000507000000",
+        "030050040008010500460000012070502080000603000040109030250000098001020600080060020",
+        "530070000600195000098000060800060003400803001700020006060000280000419005000080079",
+        "020810740700003100090002805009040087400208003160030200302700060005600008076051090",
+        "100920000524010000000000070050008102000000000402700090060000000000030945000071006",
+        "043080250600000000000001094900004070000608000010200003820500000000000005034090710",
+    ),
+    # Minimal puzzles with only 17 clues:
+    "minimal17": (
+        "000000010400000000020000000000050407008000300001090000300400200050100000000806000",
+        "000000010400000000020000000000050604008000300001090000300400200050100000000807000",
+        "000000012000035000000600070700000300000400800100000000000120000080000040050000600",
+        "000000012003600000000007000410020000000500300700000600280000040000300500000000000",
+        "000000012008030000000000040120500000000004700060000000507000300000620000000100000",
+        "000000013000030080070000000000206000030000900000010000600500204000400700100000000",
+        "000000013000200000000000080000760200008000400010000000200000750600340000000008000",
+    ),
+    # Puzzles known to be hard for humans or built to defeat simple backtracking:
+    "adversarial": (
+        "1.......2.9.4...5...6...7...5.9.3.......7.......85..4.7.....6...3...9.8...2.....1",  # Easter Monster
+        "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..",  # Arto Inkala's
+        "..............3.85..1.2.......5.7.....4...1...9.......5......73..2.1........4...9",  # Anti-backtracking
+        "1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..",  # AI Escargot
+        "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+        "52...6.........7.13...........4..8..6......5...........418.........3..2...87.....",
+    ),
+}
+
+# Names for the difficulty constants that puzzles are generated at:
+DIFFICULTIES = {"easy": constants.EASY_REMOVE, "medium": constants.MEDIUM_REMOVE, "hard": constants.HARD_REMOVE}
+
+ENGINES = (constants.BACKTRACKING_ENGINE, constants.DLX_ENGINE)  # Solver engines to benchmark
+
+FORMAT_VERSION = 1  # Version of the saved results format
+
+
+def run_suite(repeat=3, generate_count=20, memory=True):
+    """
+    Run every benchmark in the suite
+    :param repeat: Integer: The number of times to go through each corpus (and the generated puzzles) when timing
+    :param generate_count: Integer: The number of puzzles to generate at each difficulty, each from its own seed
+    :param memory: Boolean: Should each benchmark be run one more time while tracing its peak memory use?
+    :return: Dictionary: The saved results format, with the metrics of each benchmark under "results"
+    """
+    results = {}
+    for corpus, puzzles in CORPORA.items():
+        for engine in ENGINES:
+            results["solve/" + corpus + "/" + engine] = _measure(_solve, puzzles, repeat, memory, True, engine)
+            results["count/" + corpus + "/" + engine] = _measure(_count, puzzles, repeat, memory, True, engine)
+        # The backtracking engine after every deduction technique instead of only singles:
+        results["solve/" + corpus + "/deductions"] = _measure(_solve_deduced, puzzles, repeat, memory, True,
+                                                              DeductionPipeline())
+    for difficulty, max_remove in DIFFICULTIES.items():
+        # Each puzzle has a fixed seed so every run generates the same puzzles, and the uniqueness checks search the
+        # same nodes:
+        seeds = [(max_remove, seed) for seed in range(generate_count)]
+        results["generate/" + difficulty] = _measure(_generate, seeds, repeat, memory, True)
+    results["import/board"] = _summarize(_import_times(repeat), None, None)
+    return {
+        "version": FORMAT_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "results": results,
+    }
+
+
+def save_results(results, path):
+    """
+    Save the results of a run as JSON
+    :param results: Dictionary: The results returned by run_suite
+    :param path: String or PathLike: The path of the file to write
+    :return: None
+    """
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def load_results(path):
+    """
+    Load the results of an earlier run
+    :param path: String or PathLike: The path of the file saved by save_results
+    :return: Dictionary: The saved results
+    """
+    with open(path) as f:
+        results = json.load(f)
+    if results.get("version") != FORMAT_VERSION:
+        raise ValueError("Unsupported benchmark results version: " + str(results.get("version")))
+    return results
+
+
+def compare_results(baseline, current, tolerance=0.1):
+    """
+    Find the benchmarks that got slower between two runs
+    :param baseline: Dictionary: The results of the earlier run
+    :param current: Dictionary: The results of the new run
+    :param tolerance: Float: The fraction that a metric can get worse by before it is a regression
+    :return: List of String: A description of each regression found
+    """
+    regressions = []
+    for name, metrics in sorted(current["results"].items()):
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        # Lower throughput is worse:
+        if old.get("per_sec") and metrics.get("per_sec") and metrics["per_sec"] < old["per_sec"] * (1 - tolerance):
+            regressions.append(_describe(name, "per_sec", old["per_sec"], metrics["per_sec"]))
+        # Higher latency, search counters, and memory are worse:
+        for key in ("p50_ms", "p99_ms", "nodes", "backtracks", "peak_kib"):
+            if old.get(key) and metrics.get(key) and metrics[key] > old[key] * (1 + tolerance):
+                regressions.append(_describe(name, key, old[key], metrics[key]))
+    return regressions
+
+
+def format_results(results):
+    """
+    Format the results of a run as a table
+    :param results: Dictionary: The results returned by run_suite
+    :return: String: One line for each benchmark with its metrics
+    """
+    columns = ("count", "per_sec", "p50_ms", "p99_ms", "nodes", "backtracks", "peak_kib")
+    lines = [format("benchmark", "<34") + "".join(format(column, ">12") for column in columns)]
+    for name, metrics in sorted(results["results"].items()):
+        line = format(name, "<34")
+        for column in columns:
+            val = metrics.get(column)
+            if val is None:
+                val = "-"
+            elif isinstance(val, float):
+                val = format(val, ".4g")
+            line += format(val, ">12")
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _measure(func, items, repeat, memory, counted, *args):
+    """
+    Time a function on each item and summarize the latencies
+    :param func: Function: The operation to time, taking an item, a SolveStats or None, and args
+    :param items: Sequence: The items to run the operation on
+    :param repeat: Integer: The number of times to go through the items
+    :param memory: Boolean: Should the items be run one more time while tracing the peak memory use?
+    :param counted: Boolean: Should the items be run one more time while counting the search nodes and backtracks?
+    :param args: Any: Extra arguments given to every call of the function
+    :return: Dictionary: The metrics of the benchmark
+    """
+    latencies = []
+    for _ in range(repeat):
+        for item in items:
+            start = time.perf_counter()
+            func(item, None, *args)
+            latencies.append(time.perf_counter() - start)
+    stats = None
+    if counted:
+        # Counting is kept out of the timed passes so the latencies are what callers without stats get:
+        stats = SolveStats()
+        for item in items:
+            func(item, stats, *args)
+    peak = None
+    if memory:
+        # Tracing slows everything down, so it gets its own pass that is not timed:
+        import tracemalloc
+        tracemalloc.start()
+        for item in items:
+            func(item, None, *args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return _summarize(latencies, stats, peak)
+
+
+def _summarize(latencies, stats, peak):
+    """
+    Summarize a list of latencies
+    :param latencies: List of Float: The time taken by each call in seconds
+    :param stats: None or SolveStats: The counters from one pass over the items
+    :param peak: None or Integer: The peak memory traced in bytes
+    :return: Dictionary: The number of calls, calls per second, p50 and p99 latency in milliseconds, search nodes and
+    backtracks for one pass, and peak memory in KiB
+    """
+    latencies = sorted(latencies)
+    total = sum(latencies)
+    return {
+        "count": len(latencies),
+        "per_sec": len(latencies) / total if total else None,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "nodes": stats.get_nodes() if stats is not None else None,
+        "backtracks": stats.get_backtracks() if stats is not None else None,
+        "peak_kib": peak / 1024 if peak is not None else None,
+    }
+
+
+def _percentile(latencies, pct):
+    """
+    Get a percentile of sorted latencies using the nearest-rank method
+    :param latencies: List of Float: The sorted latencies
+    :param pct: Integer: The percentile to get (0-100)
+    :return: Float: The latency at that percentile
+    """
+    rank = max(1, -(-pct * len(latencies) // 100))  # Ceiling of pct% of the count
+    return latencies[rank - 1]
+
+
+def _describe(name, key, old, new):
+    """
+    Describe a regression
+    :param name: String: The name of the benchmark
+    :param key: String: The metric that got worse
+    :param old: Float: The metric in the earlier run
+    :param new: Float: The metric in the new run
+    :return: String: A description of the regression
+    """
+    return name + ": " + key + " " + format(old, ".4g") + " -> " + format(new, ".4g") + \
+        " (" + format((new - old) / old * 100, "+.1f") + "%)"
+
+
+def _import_times(runs):
+    """
+    Time importing the board module in fresh interpreters
+    :param runs: Integer: The number of interpreters to start
+    :return: List of Float: The time each import took in seconds
+    """
+    code = "import time\nstart = time.perf_counter()\nimport board\nprint(time.perf_counter() - start)"
+    directory = os.path.dirname(os.path.abspath(__file__))
+    times = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", code], cwd=directory, capture_output=True, text=True, check=True)
+        times.append(float(output.stdout))
+    return times
+
+
+def _solve(puzzle, stats, engine):
+    """
+    Solve a puzzle (one benchmark operation)
+    :param puzzle: String: The puzzle as 81 characters
+    :param stats: None or SolveStats: Counters to add the solve to
+    :param engine: String: The solver engine to use
+    :return: None
+    """
+    Board.from_string(puzzle).solve(engine=engine, stats=stats)
+
+
+def _solve_deduced(puzzle, stats, deductions):
+    """
+    Solve a puzzle using a deduction pipeline before searching (one benchmark operation)
+    :param puzzle: String: The puzzle as 81 characters
+    :param stats: None or SolveStats: Counters to add the solve to
+    :param deductions: DeductionPipeline: The techniques to use
+    :return: None
+    """
+    Board.from_string(puzzle).solve(stats=stats, deductions=deductions)
+
+
+def _count(puzzle, stats, engine):
+    """
+    Check that a puzzle has exactly one solution (one benchmark operation)
+    :param puzzle: String: The puzzle as 81 characters
+    :param stats: None or SolveStats: Counters to add the search to
+    :param engine: String: The solver engine to use
+    :return: None
+    """
+    Board.from_string(puzzle).count_solutions(2, engine, stats)
+
+
+def _generate(item, stats):
+    """
+    Generate a puzzle (one benchmark operation)
+    :param item: Tuple of (Integer, Integer): The maximum amount of numbers to remove from the board and the seed
+    :param stats: None or SolveStats: Counters to add the uniqueness checks to
+    :return: None
+    """
+    max_remove, seed = item
+    Board.generate_board(max_remove, seed=seed, stats=stats)
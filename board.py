@@ -1,19 +1,31 @@
 from entry import Entry
-from position import Position
-import random
-import copy
+from solve_budget import BudgetExceededError, SolveBudget
+from solve_stats import SolveStats
+import constants
+import masks
+import time
+import units
 
 
 class Board:
     """Represents a sudoku board"""
 
+    __slots__ = ('_cells', '_rows', '_cols', '_boxes', '_hooks')  # Fixed attributes so each board stays small
+
+    _DIGITS = bytes.maketrans(bytes(range(10)), b"0123456789")  # Table to convert cell values to digit characters
+
     def __init__(self):
-        """Creates a Board object with a matrix to hold each entry and also arrays to store the rows, cols, and boxes"""
-        self._matrix = [[Entry() for x in range(9)] for _ in range(9)]  # Matrix of entries (9 x 9 like sudoku board)
-        self._rows = [set() for _ in range(9)]  # List of sets, 1 for each row showing the values in that row
-        self._cols = [set() for _ in range(9)]  # List of sets, 1 for each column showing the values in that col
-        # Matrix of sets, 1 for each box, showing values in that box:
-        self._boxes = [[set() for x in range(3)] for _ in range(3)]
+        """Creates a Board object with an array to hold each cell's value and also arrays to store the rows, cols, and
+        boxes"""
+        # Value of each cell indexed row-wise from 0 to 80 (row * 9 + col), with 0 for an empty cell:
+        self._cells = bytearray(81)
+        # The rows, cols, and boxes are stored as bitmasks (see masks.py) where bit (val - 1) is set if val is in it:
+        self._rows = [0] * 9  # List of bitmasks, 1 for each row showing the values in that row
+        self._cols = [0] * 9  # List of bitmasks, 1 for each column showing the values in that col
+        # List of bitmasks, 1 for each box (numbered row-wise from the top-left), showing values in that box:
+        self._boxes = [0] * 9
+        # Dictionary of hook event to the list of functions registered for it, None until a hook is added:
+        self._hooks = None
 
     def set_val(self, val, pos):
         """
@@ -36,8 +48,8 @@ class Board:
         else:
             # If not possible, raise an error
             raise ValueError("Not a valid value (None or 1-9) or Value already exists in column, row, or box")
-        # Set the value in the matrix at that position to the given value:
-        self._matrix[pos.get_row()][pos.get_col()].set_val(val)
+        # Set the value in the cell array at that position to the given value (0 if it is None):
+        self._cells[pos.get_index()] = val or 0
 
     def remove_val(self, val, pos):
         """
@@ -46,13 +58,14 @@ class Board:
         :param pos: Position: The position of the cell where the value is being removed
         :return: None
         """
-        # Remove the given value from the proper row, column, and box set if it is in any of them:
-        if val in self.get_row(pos):  # Remove from row
-            self.get_row(pos).remove(val)
-        if val in self.get_col(pos):  # Remove from col
-            self.get_col(pos).remove(val)
-        if val in self.get_box(pos):  # Remove from box
-            self.get_box(pos).remove(val)
+        # There is nothing to remove for an empty cell:
+        if val is None:
+            return
+        # Clear the value's bit from the proper row, column, and box mask if it is in any of them:
+        clear = masks.ALL_VALUES ^ masks.VALUE_BITS[val]
+        self._rows[pos.get_row()] &= clear  # Remove from row
+        self._cols[pos.get_col()] &= clear  # Remove from col
+        self._boxes[units.BOX_OF[pos.get_index()]] &= clear  # Remove from box
 
     def add_val(self, val, pos):
         """
@@ -61,224 +74,551 @@ class Board:
         :param pos: Position: The position on the board where the value is being added
         :return: None
         """
-        self.get_row(pos).add(val)  # Add to row set
-        self.get_col(pos).add(val)  # Add to column set
-        self.get_box(pos).add(val)  # Add to box set
+        bit = masks.VALUE_BITS[val]
+        self._rows[pos.get_row()] |= bit  # Add to row mask
+        self._cols[pos.get_col()] |= bit  # Add to column mask
+        self._boxes[units.BOX_OF[pos.get_index()]] |= bit  # Add to box mask
+
+    def add_hook(self, event, callback):
+        """
+        Register a function to be called whenever an event happens while this board is being solved or its solutions
+        counted by the backtracking engine (the DLX engine only reports the values it fills in when solving). Solving
+        with no hooks registered does not pay for any of them.
+        :param event: String: The event to listen for (one of constants.HOOK_EVENTS)
+        :param callback: Function: Called with the arguments of the event (see constants.py)
+        :return: None
+        """
+        if event not in constants.HOOK_EVENTS:
+            raise ValueError("Unknown hook event: " + str(event))
+        if self._hooks is None:
+            self._hooks = {}
+        self._hooks.setdefault(event, []).append(callback)
 
-    def solve(self, rand=False, restrict_val=None, restrict_pos=None, revert_if_unsolvable=False):
+    def remove_hook(self, event, callback):
         """
-        Attempt to solve the board from the current state
-        :param rand: Boolean: Should the values be shuffled for each iteration before placing them to add randomness?
+        Unregister a function added with add_hook
+        :param event: String: The event the function was registered for
+        :param callback: Function: The function to remove
+        :return: None
+        """
+        callbacks = self._hooks.get(event) if self._hooks else None
+        if not callbacks or callback not in callbacks:
+            raise ValueError("Hook is not registered for event: " + str(event))
+        callbacks.remove(callback)
+        # Drop the empty list so the solver sees there is nothing to call:
+        if not callbacks:
+            del self._hooks[event]
+
+    def solve(self, rand=False, restrict_val=None, restrict_pos=None, revert_if_unsolvable=False, mrv=True,
+              engine=constants.BACKTRACKING_ENGINE, stats=None, max_nodes=None, timeout=None, cancel=None,
+              deductions=None):
+        """
+        Attempt to solve the board from the current state. If a budget (max_nodes, timeout, or cancel) is given and
+        runs out first, BudgetExceededError is raised and the board is put back the way it was.
+        :param rand: Boolean or Random: Should the values be shuffled for each iteration before placing them to add
+        randomness? Give a random.Random to shuffle with it, so the solution can be reproduced from its seed.
         :param restrict_val: None or Integer: If there is a value that should be restricted, what is it?
         :param restrict_pos: None or Position: If there is a position that should be restricted, what is it?
         :param revert_if_unsolvable: Boolean: Should the board be forced to revert to its initial state if it is
         found to be unsolvable?
-        :return: None
-        """
-        if revert_if_unsolvable:
-            # Make a copy to revert to if necessary
-            board_copy = copy.deepcopy(self)
-        if not rand:
-            # Try to solve obvious values without backtracking first (if shuffling is not required):
-            self._solve_simple(restrict_val, restrict_pos)
-        # Attempt to finish solving using the backtracking algorithm:
-        solved = self._solve_backtracking(Position(0, 0), rand, restrict_val, restrict_pos)
+        :param mrv: Boolean: Should the backtracking always branch on the empty cell with the fewest candidates
+        (most-constrained cell) instead of going through the cells row by row?
+        :param engine: String: The solver engine to use (constants.BACKTRACKING_ENGINE or constants.DLX_ENGINE)
+        :param stats: None or SolveStats: Counters to add this solve's nodes, backtracks, singles, and phase times to
+        (None to not collect any, which keeps the search loop as fast as possible)
+        :param max_nodes: None or Integer: The most values the search can try before giving up (None for no limit)
+        :param timeout: None or Float: The most seconds the solve can take before giving up (None for no limit)
+        :param cancel: None or CancellationToken: A token that stops the solve once it is cancelled
+        :param deductions: None or DeductionPipeline: Techniques to fill in values with before searching, instead of
+        only naked and hidden singles (not used with rand, like the singles)
+        :return: None or SolveStats: The stats given, also added to when the board is found to be unsolvable
+        """
+        budget = SolveBudget.make(max_nodes, timeout, cancel)  # None if there is nothing to check
+        if engine == constants.DLX_ENGINE:
+            # The DLX engine works on its own copy of the values, so the board is only changed if it is solved:
+            self._solve_dlx(rand, restrict_val, restrict_pos, stats, budget)
+            return stats
+        if engine != constants.BACKTRACKING_ENGINE:
+            raise ValueError("Unknown solver engine: " + str(engine))
+        if revert_if_unsolvable or budget is not None:
+            # Take a snapshot to revert to if necessary
+            state = self.snapshot()
+        try:
+            if not rand:
+                # Try to solve obvious values without backtracking first (if shuffling is not required):
+                if deductions is None:
+                    self._solve_simple(restrict_val, restrict_pos, stats)
+                else:
+                    self._solve_deductions(deductions, restrict_val, restrict_pos, stats)
+            # Attempt to finish solving using the backtracking algorithm:
+            solved = self._solve_backtracking(rand, restrict_val, restrict_pos, mrv, stats, budget)
+        except BudgetExceededError:
+            # The search already took back its guesses through the hooks, so take back the singles placed before it:
+            self.restore(state)
+            raise
         if not solved:
             if revert_if_unsolvable:
-                # If the board can't be solved and it needs to be reverted, alter the object of self to hold the values
-                # of board_copy:
-                self.__dict__.update(board_copy.__dict__)
+                # If the board can't be solved and it needs to be reverted, restore the values from the snapshot:
+                self.restore(state)
             # Raise error if board is unsolvable
             raise ValueError("Given board is not solvable")
+        return stats
 
-    def _solve_simple(self, restrict_val=None, restrict_pos=None):
+    def count_solutions(self, limit=2, engine=constants.BACKTRACKING_ENGINE, stats=None, max_nodes=None, timeout=None,
+                        cancel=None):
+        """
+        Count the solutions of the board from the current state, stopping as soon as the limit is reached. The board
+        is left unchanged, and BudgetExceededError is raised if a budget runs out first.
+        :param limit: None or Integer: The number of solutions to stop counting at (None to count all of them)
+        :param engine: String: The solver engine to use (constants.BACKTRACKING_ENGINE or constants.DLX_ENGINE)
+        :param stats: None or SolveStats: Counters to add the search's nodes, backtracks, and time to
+        :param max_nodes: None or Integer: The most values the search can try before giving up (None for no limit)
+        :param timeout: None or Float: The most seconds the search can take before giving up (None for no limit)
+        :param cancel: None or CancellationToken: A token that stops the search once it is cancelled
+        :return: Integer: The number of solutions found (at most limit)
+        """
+        budget = SolveBudget.make(max_nodes, timeout, cancel)  # None if there is nothing to check
+        if engine == constants.DLX_ENGINE:
+            from dlx import DLXSolver  # Only imported when needed since most callers use the backtracking search
+            return DLXSolver(self._get_cells()).count_solutions(limit, stats, budget)
+        if engine != constants.BACKTRACKING_ENGINE:
+            raise ValueError("Unknown solver engine: " + str(engine))
+        # Search the board in place and undo every value the search placed once it is done:
+        return self._search(limit, undo=True, stats=stats, budget=budget)
+
+    def _solve_dlx(self, rand=False, restrict_val=None, restrict_pos=None, stats=None, budget=None):
         """
-        Find and fill in clearly solvable values on the board before moving to recursive solution that is slower
+        Solve the board as an exact cover problem using the dancing links solver
+        :param rand: Boolean or Random: Should the options be shuffled before trying them to add randomness (with the
+        given random.Random if there is one)?
         :param restrict_val: None or Integer: If there is a value that should be restricted, what is it?
         :param restrict_pos: None or Position: If there is a position that should be restricted, what is it?
+        :param stats: None or SolveStats: Counters to add the search's nodes, backtracks, and time to
+        :param budget: None or SolveBudget: The limits that stop the search early
+        :return: None
+        """
+        from dlx import DLXSolver  # Only imported when needed since most callers use the backtracking search
+        solver = DLXSolver(self._get_cells(), restrict_val, Board._restrict_index(restrict_pos))
+        solution = solver.solve(rand, stats, budget)
+        if solution is None:
+            raise ValueError("Given board is not solvable")
+        assigned_hooks = self._get_hooks(constants.CELL_ASSIGNED_EVENT)
+        # Fill in each empty cell with its value from the solution:
+        for ind, val in enumerate(solution):
+            if not self._cells[ind]:
+                self._place(val, ind)
+                if assigned_hooks:
+                    Board._call_hooks(assigned_hooks, ind, val, 0)
+
+    def snapshot(self):
+        """
+        Get a compact, immutable copy of the values on the board that can be given to restore later
+        :return: Bytes: The 81 values of the board row-wise with 0 for empty cells
+        """
+        return bytes(self._cells)
+
+    def restore(self, state):
+        """
+        Set the board back to the values of a snapshot
+        :param state: Bytes: A snapshot returned by the snapshot method
         :return: None
         """
-        made_change = True  # Boolean to keep track of whether the board is still being changed
-        # Loop until this algorithm can no longer solve any items:
-        while made_change:
-            made_change = False
-            # Check individual cells to see if they can only hold one value:
-            made_change = self._check_ind_cells(restrict_val, restrict_pos) or made_change
-            # Check rows, cols, and boxes respectively to see if there are places where only one value could fit:
-            made_change = self._check_rows(restrict_val, restrict_pos) or made_change
-            made_change = self._check_cols(restrict_val, restrict_pos) or made_change
-            made_change = self._check_boxes(restrict_val, restrict_pos) or made_change
-
-    def _solve_backtracking(self, pos, rand=False, restrict_val=None, restrict_pos=None):
-        """
-        Attempt to solve the board from the given state using the recursive backtracking algorithm
-        :param pos: Position: The current position to test different values with
-        :param rand: Boolean: Should the values be shuffled for each iteration before placing them to add randomness?
+        # Clear the row, col, and box masks and put each value from the snapshot back on the board:
+        self._rows = [0] * 9
+        self._cols = [0] * 9
+        self._boxes = [0] * 9
+        self._cells[:] = bytes(81)
+        for ind, val in enumerate(state):
+            if val:
+                self._place(val, ind)
+
+    def _get_cells(self):
+        """
+        Get the values of the board as a flat list
+        :return: List of Integer: The 81 values of the board row-wise with 0 for empty cells
+        """
+        return list(self._cells)
+
+    def _solve_simple(self, restrict_val=None, restrict_pos=None, stats=None):
+        """
+        Find and fill in clearly solvable values on the board before moving to the backtracking search that is slower.
+        Every cell and unit is checked once, and after that only the cells and units affected by a newly placed value
+        are queued to be checked again. The queues are worked through last-in first-out since the order they are
+        checked in does not change the result.
         :param restrict_val: None or Integer: If there is a value that should be restricted, what is it?
         :param restrict_pos: None or Position: If there is a position that should be restricted, what is it?
-        :return: Boolean: Is the board solved?
+        :param stats: None or SolveStats: Counters to add the naked and hidden singles placed and the time taken to
+        :return: None
         """
-        # If the position gets past the ninth and final row, the board is solved:
-        if pos.get_row() == 9:
-            solved = True
-        # If the given position already has a value, move to the next one:
-        elif self.get_val(pos) is not None:
-            solved = self._solve_backtracking(pos.next(), rand, restrict_val, restrict_pos)
-        # Otherwise:
-        else:
-            vals = list(range(1, 10))  # Create list of possible values to use
-            solved = False
-            if rand:
-                random.shuffle(vals)  # Shuffle the list of values if necessary to randomize solution
-            # If this is the restricted position, remove the restricted value from the list so it cannot be tested
-            # as a possible solution:
-            if pos == restrict_pos:
-                vals.remove(restrict_val)
-            # Check each value
-            for val in vals:
-                # If the value can be put in this position:
-                if self.entry_non_conflicting(val, pos):
-                    # Set the entry at the current position to that value:
-                    self.set_val(val, pos)
-                    # Attempt to solve the board with this value starting from the next position:
-                    solved = self._solve_backtracking(pos.next(), rand, restrict_val, restrict_pos)
-                    # If the solving worked, then break out of the loop, but if not, remove the value that was tried
-                    # from the board
-                    if solved:
-                        break
-                    self.remove_val(val, pos)
-            # If no value could solve the board, reset the value at that position to None and backtrack
-            if not solved:
-                self.set_val(None, pos)
-        return solved  # Return whether the board is solved or not
-
-    def _check_ind_cells(self, restrict_val=None, restrict_pos=None):
-        """
-        Check each cell to see if there is only one possible value that could fit in that cell based on what is
-        already in its row, col, and box
+        assigned_hooks = self._get_hooks(constants.CELL_ASSIGNED_EVENT)
+        pass_hooks = self._get_hooks(constants.PASS_COMPLETED_EVENT)
+        # Only count and time when the stats or a hook needs it, so the checks below stay cheap:
+        counting = stats is not None or pass_hooks is not None
+        if counting:
+            start = time.perf_counter()
+        naked = hidden = 0  # Number of values placed by the cell checks and by the unit checks
+        restrict_ind = Board._restrict_index(restrict_pos)
+        # Queue every empty cell to check for naked singles and every unit to check for hidden singles:
+        cell_queue = [ind for ind in range(81) if not self._cells[ind]]
+        unit_queue = list(range(27))
+        # Flags for what is currently in each queue so nothing is queued twice:
+        queued_cells = bytearray(not val for val in self._cells)
+        queued_units = bytearray(b'\x01' * 27)
+        unit_masks = (self._rows, self._cols, self._boxes)  # Masks of each kind of unit, indexed by unit // 9
+        # Loop until the queues are empty and this algorithm can no longer solve any items:
+        while cell_queue or unit_queue:
+            # Check individual cells first since they are cheaper, then units:
+            if cell_queue:
+                ind = cell_queue.pop()
+                queued_cells[ind] = 0
+                placed = self._check_ind_cell(ind, restrict_val, restrict_ind)
+                if counting:
+                    naked += len(placed)
+            else:
+                unit = unit_queue.pop()
+                queued_units[unit] = 0
+                placed = self._check_unit(unit, restrict_val, restrict_ind)
+                if counting:
+                    hidden += len(placed)
+            # Queue the empty peers and the units of every cell that was filled in:
+            for ind in placed:
+                val = self._cells[ind]
+                if assigned_hooks:
+                    Board._call_hooks(assigned_hooks, ind, val, 0)
+                bit = masks.VALUE_BITS[val]
+                for peer in units.PEERS[ind]:
+                    if not self._cells[peer]:
+                        if not queued_cells[peer]:
+                            queued_cells[peer] = 1
+                            cell_queue.append(peer)
+                        # The peer lost the value as a candidate, which can leave a hidden single for it in the
+                        # peer's other units (the units still missing the value):
+                        for unit in units.UNITS_OF[peer]:
+                            if not queued_units[unit] and not unit_masks[unit // 9][unit % 9] & bit:
+                                queued_units[unit] = 1
+                                unit_queue.append(unit)
+                for unit in units.UNITS_OF[ind]:
+                    if not queued_units[unit]:
+                        queued_units[unit] = 1
+                        unit_queue.append(unit)
+        if stats is not None:
+            stats.add_singles(naked, hidden)
+            stats.add_phase_time(SolveStats.SIMPLE_PHASE, time.perf_counter() - start)
+        if pass_hooks:
+            Board._call_hooks(pass_hooks, naked, hidden)
+
+    def _solve_deductions(self, deductions, restrict_val=None, restrict_pos=None, stats=None):
+        """
+        Fill in the values that a deduction pipeline finds before moving to the backtracking search
+        :param deductions: DeductionPipeline: The techniques to use
         :param restrict_val: None or Integer: If there is a value that should be restricted, what is it?
         :param restrict_pos: None or Position: If there is a position that should be restricted, what is it?
-        :return: Boolean: Were any changes made to the board?
+        :param stats: None or SolveStats: Counters to add the singles, eliminations, and time taken to
+        :return: None
         """
-        made_change = False
-        # Iterate through each possible position:
-        for i in range(9):
-            for j in range(9):
-                pos = Position(i, j)
-                # If there is already a value at this position, move to the next one
-                if self.get_val(pos) is not None:
-                    continue
-                # Get a set of all of the values in the row, col, and box of that position:
-                union = self.get_box(pos) | self.get_col(pos) | self.get_row(pos)
-                # If 8 values are already there, there can only be 1 left:
-                if len(union) == 8:
-                    # Find the value that is not already in the row/col/box:
-                    val = ({1, 2, 3, 4, 5, 6, 7, 8, 9} - union).pop()
-                    # If this is the restrict_pos and restrict_val, do not put the value in:
-                    if pos == restrict_pos and restrict_val == val:
-                        continue
-                    # Otherwise, set the value at that position to the only possible one
-                    made_change = True
-                    self.set_val(val, pos)
-        return made_change  # Return whether a change was made to the board
-
-    def _check_rows(self, restrict_val=None, restrict_pos=None):
-        """
-        Check each row to see if there are any cells where only 1 value could fit and add them if so
+        pass_hooks = self._get_hooks(constants.PASS_COMPLETED_EVENT)
+        # Counters for this run alone, since the stats given may already hold other runs:
+        run_stats = SolveStats() if stats is not None or pass_hooks else None
+        if stats is not None:
+            start = time.perf_counter()
+        placements = deductions.run(self._get_cells(), restrict_val, Board._restrict_index(restrict_pos), run_stats)
+        assigned_hooks = self._get_hooks(constants.CELL_ASSIGNED_EVENT)
+        for ind, val in placements:
+            self._place(val, ind)
+            if assigned_hooks:
+                Board._call_hooks(assigned_hooks, ind, val, 0)
+        if stats is not None:
+            stats.add_singles(run_stats.get_naked_singles(), run_stats.get_hidden_singles())
+            for technique in deductions.get_techniques():
+                stats.add_eliminations(technique, run_stats.get_eliminations(technique))
+            stats.add_phase_time(SolveStats.DEDUCTION_PHASE, time.perf_counter() - start)
+        if pass_hooks:
+            Board._call_hooks(pass_hooks, run_stats.get_naked_singles(), run_stats.get_hidden_singles())
+
+    def _solve_backtracking(self, rand=False, restrict_val=None, restrict_pos=None, mrv=True, stats=None,
+                            budget=None):
+        """
+        Attempt to solve the board from the given state using the iterative backtracking search
+        :param rand: Boolean or Random: Should the values be shuffled for each iteration before placing them to add
+        randomness (with the given random.Random if there is one)?
         :param restrict_val: None or Integer: If there is a value that should be restricted, what is it?
         :param restrict_pos: None or Position: If there is a position that should be restricted, what is it?
-        :return: Boolean: Were any changes made to the board?
-        """
-        made_change = False
-        # Iterate through each row:
-        for i in range(len(self._rows)):
-            # Find what values are not already in this row:
-            missing_vals = set(range(1, 10)) - self._rows[i]
-            # Iterate through each value not already in the row:
-            for val in missing_vals:
-                possible_positions = []  # List to store the positions that value could go in
-                # Go through each position in that row:
-                for j in range(9):
-                    pos = Position(i, j)
-                    # If this is the restricted position and value, then skip
-                    if restrict_pos == pos and restrict_val == val:
-                        continue
-                    # If there is no value at this position and the value is valid for this position, add it to the list
-                    # of possible positions for the value
-                    if self.get_val(pos) is None and self.entry_non_conflicting(val, pos):
-                        possible_positions.append(pos)
-                # If there is only one possible position for the missing value, then set the entry at that position
-                # to that value:
-                if len(possible_positions) == 1:
-                    self.set_val(val, possible_positions.pop())
-                    made_change = True
-        return made_change  # Return whether a change was made
-
-    def _check_cols(self, restrict_val=None, restrict_pos=None):
-        """
-        Check each column to see if there are any cells where only 1 value could fit and add them if so
+        :param mrv: Boolean: Should the search branch on the most constrained cell instead of the next one row-wise?
+        :param stats: None or SolveStats: Counters to add the search's nodes, backtracks, and time to
+        :param budget: None or SolveBudget: The limits that stop the search early
+        :return: Boolean: Is the board solved?
+        """
+        # Stop at the first solution and leave it on the board:
+        return self._search(1, rand, restrict_val, restrict_pos, mrv, stats=stats, budget=budget) == 1
+
+    def _search(self, limit=None, rand=False, restrict_val=None, restrict_pos=None, mrv=True, undo=False,
+                stats=None, budget=None):
+        """
+        Run an iterative backtracking search from the current state that keeps an explicit stack of the cells being
+        tried and a trail of the values placed so they can be undone
+        :param limit: None or Integer: The number of solutions to stop at (None to find all of them)
+        :param rand: Boolean or Random: Should the values be shuffled for each iteration before placing them to add
+        randomness (with the given random.Random if there is one)?
         :param restrict_val: None or Integer: If there is a value that should be restricted, what is it?
         :param restrict_pos: None or Position: If there is a position that should be restricted, what is it?
-        :return: Boolean: Were any changes made to the board?
-        """
-        made_change = False
-        # Iterate through each column:
-        for i in range(len(self._cols)):
-            # Find what values are not already in this column:
-            missing_vals = set(range(1, 10)) - self._cols[i]
-            # Iterate through each value not already in the column:
-            for val in missing_vals:
-                possible_positions = []  # List to store the positions that value could go in
-                # Go through each position in that column:
-                for j in range(9):
-                    pos = Position(j, i)
-                    # If this is the restricted position and value, then skip
-                    if restrict_pos == pos and restrict_val == val:
-                        continue
-                    # If there is no value at this position and the value is valid for this position, add it to the list
-                    # of possible positions for the value
-                    if self.get_val(pos) is None and self.entry_non_conflicting(val, pos):
-                        possible_positions.append(pos)
-                # If there is only one possible position for the missing value, then set the entry at that position
-                # to that value:
-                if len(possible_positions) == 1:
-                    self.set_val(val, possible_positions.pop())
-                    made_change = True
-        return made_change  # Return whether a change was made
-
-    def _check_boxes(self, restrict_val=None, restrict_pos=None):
-        """
-        Check each box to see if there are any cells where only 1 value could fit and add them if so
+        :param mrv: Boolean: Should the search branch on the most constrained cell instead of the next one row-wise?
+        :param undo: Boolean: Should every value placed by the search be removed again before returning?
+        :param stats: None or SolveStats: Counters to add the search's nodes, backtracks, maximum depth, and time to
+        :param budget: None or SolveBudget: The limits that stop the search early, raising BudgetExceededError after
+        the values it placed are undone (even if undo is False, so the hooks see every guess taken back out)
+        :return: Integer: The number of solutions found (at most limit)
+        """
+        if rand:
+            import random  # Only imported when needed since most callers never shuffle
+            shuffle = rand.shuffle if isinstance(rand, random.Random) else random.shuffle
+        # Without stats or a budget, the only cost of counting is checking this flag when a value is placed or a cell
+        # runs out:
+        counting = stats is not None or budget is not None
+        if stats is not None:
+            start = time.perf_counter()
+        nodes = backtracks = max_depth = 0  # Counters for the stats and budget
+        exceeded = budget.check(0) if budget is not None else None  # Why the budget ran out, None while it has not
+        # The functions registered for each event, None (so skipped with a single check) if there are none:
+        assigned_hooks = self._get_hooks(constants.CELL_ASSIGNED_EVENT)
+        removed_hooks = self._get_hooks(constants.VALUE_REMOVED_EVENT)
+        backtrack_hooks = self._get_hooks(constants.BACKTRACK_EVENT)
+        restrict_ind = Board._restrict_index(restrict_pos)
+        stack = []  # Stack of (cell index, iterator of values left to try) for each cell being tried
+        trail = []  # Trail of (val, cell index) for each value currently placed by the search, used to undo them
+        count = 0  # Number of solutions found so far
+        while exceeded is None:
+            # Pick the next cell to fill in:
+            if mrv:
+                ind, candidates = self._find_most_constrained(restrict_val, restrict_ind)
+            else:
+                ind, candidates = self._find_next_empty(stack[-1][0] + 1 if stack else 0, restrict_val, restrict_ind)
+            if ind is None:
+                # If there are no empty cells left, the board is solved:
+                count += 1
+                if limit is not None and count >= limit:
+                    break
+            else:
+                vals = masks.MASK_VALUES[candidates]  # Tuple of values that can be put in this position
+                if rand:
+                    vals = list(vals)
+                    shuffle(vals)  # Shuffle the list of values if necessary to randomize solution
+                stack.append((ind, iter(vals)))
+            # Place the next untried value, backtracking through the stack when a cell runs out of values to try:
+            while stack:
+                ind, vals = stack[-1]
+                # If a value was already tried in this cell, remove it from the board before trying the next one:
+                if len(trail) == len(stack):
+                    val = trail.pop()[0]
+                    self._unplace(val, ind)
+                    if removed_hooks:
+                        Board._call_hooks(removed_hooks, ind, val)
+                val = next(vals, None)
+                if val is not None:
+                    self._place(val, ind)
+                    trail.append((val, ind))
+                    if counting:
+                        nodes += 1
+                        max_depth = max(max_depth, len(stack))
+                        if budget is not None:
+                            exceeded = budget.check(nodes)
+                    if assigned_hooks:
+                        Board._call_hooks(assigned_hooks, ind, val, len(stack))
+                    break
+                # No values left for this cell, so backtrack to the previous one:
+                if backtrack_hooks:
+                    Board._call_hooks(backtrack_hooks, ind, len(stack))
+                stack.pop()
+                if counting:
+                    backtracks += 1
+            else:
+                # Every value of the first cell was tried, so the whole search tree has been explored
+                break
+        if undo or exceeded is not None:
+            # Remove the values placed by the search in the reverse order they were placed:
+            for val, ind in reversed(trail):
+                self._unplace(val, ind)
+                if removed_hooks:
+                    Board._call_hooks(removed_hooks, ind, val)
+        if stats is not None:
+            stats.add_search(nodes, backtracks, max_depth)
+            stats.add_phase_time(SolveStats.SEARCH_PHASE, time.perf_counter() - start)
+        if exceeded is not None:
+            raise BudgetExceededError(exceeded)
+        return count
+
+    def _find_next_empty(self, start, restrict_val=None, restrict_ind=-1):
+        """
+        Find the first empty cell row-wise starting from the given flat index
+        :param start: Integer: The flat index (row * 9 + col) to start looking from
         :param restrict_val: None or Integer: If there is a value that should be restricted, what is it?
-        :param restrict_pos: None or Position: If there is a position that should be restricted, what is it?
-        :return: Boolean: Were any changes made to the board?
-        """
-        made_change = False
-        # Iterate through each box:
-        for i in range(3):
-            for j in range(3):
-                # Find what values are not already in this box:
-                missing_vals = set(range(1, 10)) - self._boxes[i][j]
-                # Iterate through each value not already in the box:
-                for val in missing_vals:
-                    possible_positions = []  # List to store the positions that value could go in
-                    # Go through each position in that box:
-                    for r in range(i * 3, (i + 1) * 3):
-                        for c in range(j * 3, (j + 1) * 3):
-                            pos = Position(r, c)
-                            # If this is the restricted position and value, then skip
-                            if restrict_pos == pos and restrict_val == val:
-                                continue
-                            # If there is no value at this position and the value is valid for this position,
-                            # add it to the list of possible positions for the value
-                            if self.get_val(pos) is None and self.entry_non_conflicting(val, pos):
-                                possible_positions.append(pos)
-                    # If there is only one possible position for the missing value, then set the entry at that position
-                    # to that value:
-                    if len(possible_positions) == 1:
-                        self.set_val(val, possible_positions.pop())
-                        made_change = True
-        return made_change  # Return whether a change was made
+        :param restrict_ind: Integer: The flat index of the restricted position or -1 if there is none
+        :return: Tuple of (Integer or None, Integer): The flat index of the cell (None if the rest of the board is
+        full) and the bitmask of its candidates
+        """
+        for ind in range(start, 81):
+            if not self._cells[ind]:
+                candidates = self._get_candidates(ind)
+                # The restricted value can never be a candidate at the restricted position:
+                if ind == restrict_ind and restrict_val:
+                    candidates &= ~masks.VALUE_BITS[restrict_val]
+                return ind, candidates
+        return None, 0
+
+    def _find_most_constrained(self, restrict_val=None, restrict_ind=-1):
+        """
+        Find the empty cell with the fewest values that could be put in it
+        :param restrict_val: None or Integer: If there is a value that should be restricted, what is it?
+        :param restrict_ind: Integer: The flat index of the restricted position or -1 if there is none
+        :return: Tuple of (Integer or None, Integer): The flat index of the cell (None if the board is full) and the
+        bitmask of its candidates
+        """
+        best_ind = None
+        best_candidates = 0
+        best_count = 10  # More than the maximum number of candidates so the first empty cell is always taken
+        cells = self._cells
+        rows = self._rows
+        cols = self._cols
+        boxes = self._boxes
+        row_of = units.ROW_OF
+        col_of = units.COL_OF
+        box_of = units.BOX_OF
+        counts = masks.MASK_COUNTS
+        # Iterate through each possible position:
+        for ind in range(81):
+            # Only empty cells need to be filled:
+            if cells[ind]:
+                continue
+            candidates = masks.ALL_VALUES & ~(rows[row_of[ind]] | cols[col_of[ind]] | boxes[box_of[ind]])
+            # The restricted value can never be a candidate at the restricted position:
+            if ind == restrict_ind and restrict_val:
+                candidates &= ~masks.VALUE_BITS[restrict_val]
+            count = counts[candidates]
+            if count < best_count:
+                best_ind, best_candidates, best_count = ind, candidates, count
+                # A cell with zero or one candidates cannot be beaten, so stop looking:
+                if count <= 1:
+                    break
+        return best_ind, best_candidates
+
+    def _check_ind_cell(self, ind, restrict_val=None, restrict_ind=-1):
+        """
+        Check a cell to see if there is only one possible value that could fit in it based on what is already in its
+        row, col, and box and add it if so
+        :param ind: Integer: The flat index of the cell to check
+        :param restrict_val: None or Integer: If there is a value that should be restricted, what is it?
+        :param restrict_ind: Integer: The flat index of the restricted position or -1 if there is none
+        :return: Tuple of Integer: The flat index of the cell if a value was placed in it, otherwise empty
+        """
+        # If there is already a value at this position, there is nothing to do:
+        if self._cells[ind]:
+            return ()
+        # Get a mask of the values that are not in the row, col, or box of that position:
+        candidates = self._get_candidates(ind)
+        # If more or less than one value is missing from all of them, this cell cannot be filled in yet:
+        if masks.MASK_COUNTS[candidates] != 1:
+            return ()
+        val = masks.MASK_VALUES[candidates][0]
+        # If this is the restrict_pos and restrict_val, do not put the value in:
+        if ind == restrict_ind and restrict_val == val:
+            return ()
+        # Otherwise, set the value at that position to the only possible one
+        self._place(val, ind)
+        return ind,
+
+    def _check_unit(self, unit, restrict_val=None, restrict_ind=-1):
+        """
+        Check a row, col, or box to see if there are any values that only fit in 1 of its cells and add them if so
+        :param unit: Integer: The unit number to check (0-8 for rows, 9-17 for cols, and 18-26 for boxes)
+        :param restrict_val: None or Integer: If there is a value that should be restricted, what is it?
+        :param restrict_ind: Integer: The flat index of the restricted position or -1 if there is none
+        :return: List of Integer: The flat indices of the cells that values were placed in
+        """
+        placed = []
+        unit_masks = (self._rows, self._cols, self._boxes)[unit // 9]  # Masks for the kind of unit being checked
+        # Iterate through each value not already in the unit:
+        for val in masks.MASK_VALUES[masks.ALL_VALUES & ~unit_masks[unit % 9]]:
+            bit = masks.VALUE_BITS[val]
+            possible_cells = []  # List to store the cells that value could go in
+            # Go through each cell in that unit:
+            for ind in units.UNIT_CELLS[unit]:
+                # If this is the restricted position and value, then skip
+                if ind == restrict_ind and restrict_val == val:
+                    continue
+                # If there is no value at this position and the value is valid for this position, add it to the list
+                # of possible positions for the value
+                if not self._cells[ind] and self._get_candidates(ind) & bit:
+                    possible_cells.append(ind)
+            # If there is only one possible position for the missing value, then set the entry at that position
+            # to that value:
+            if len(possible_cells) == 1:
+                self._place(val, possible_cells[0])
+                placed.append(possible_cells[0])
+        return placed
+
+    def _place(self, val, ind):
+        """
+        Put a value in an empty cell and add it to the row, col, and box masks without checking that it is valid
+        :param val: Integer: The value to put in the cell
+        :param ind: Integer: The flat index of the cell
+        :return: None
+        """
+        bit = masks.VALUE_BITS[val]
+        self._rows[units.ROW_OF[ind]] |= bit
+        self._cols[units.COL_OF[ind]] |= bit
+        self._boxes[units.BOX_OF[ind]] |= bit
+        self._cells[ind] = val
+
+    def _unplace(self, val, ind):
+        """
+        Undo a call to _place, emptying the cell and removing the value from the row, col, and box masks
+        :param val: Integer: The value that is currently in the cell
+        :param ind: Integer: The flat index of the cell
+        :return: None
+        """
+        bit = masks.VALUE_BITS[val]
+        self._rows[units.ROW_OF[ind]] ^= bit
+        self._cols[units.COL_OF[ind]] ^= bit
+        self._boxes[units.BOX_OF[ind]] ^= bit
+        self._cells[ind] = 0
+
+    def _get_candidates(self, ind):
+        """
+        Get the bitmask of values that could be put in the cell at the given flat index
+        :param ind: Integer: The flat index of the cell
+        :return: Integer: A bitmask with bit (val - 1) set for each value not in the cell's row, col, or box
+        """
+        return masks.ALL_VALUES & ~(self._rows[units.ROW_OF[ind]] | self._cols[units.COL_OF[ind]] |
+                                    self._boxes[units.BOX_OF[ind]])
+
+    def _get_hooks(self, event):
+        """
+        Get the functions registered for an event
+        :param event: String: The hook event
+        :return: None or List of Function: The registered functions, None if there are none
+        """
+        return self._hooks.get(event) if self._hooks else None
+
+    @staticmethod
+    def _call_hooks(callbacks, *args):
+        """
+        Call each function registered for an event
+        :param callbacks: List of Function: The registered functions
+        :param args: Any: The arguments of the event
+        :return: None
+        """
+        for callback in callbacks:
+            callback(*args)
+
+    @staticmethod
+    def _restrict_index(restrict_pos):
+        """
+        Get the flat index (row * 9 + col) of the restricted position so it can be compared without making Positions
+        :param restrict_pos: None or Position: The restricted position, if there is one
+        :return: Integer: The flat index of the restricted position or -1 if there is none
+        """
+        if restrict_pos is None:
+            return -1
+        return restrict_pos.get_index()
 
     def get_row(self, pos):
         """
@@ -286,7 +626,7 @@ class Board:
         :param pos: Position: The position of the cell that the row is being found for
         :return: Set of Integer: The set of values for the respective row of the position
         """
-        return self._rows[pos.get_row()]  # Return row set from row index
+        return set(masks.MASK_VALUES[self._rows[pos.get_row()]])  # Build row set from row mask
 
     def get_col(self, pos):
         """
@@ -294,7 +634,7 @@ class Board:
         :param pos: Position: The position of the cell that the column is being found for
         :return: Set of Integer: The set of values for the respective column of the position
         """
-        return self._cols[pos.get_col()]  # Return col set from col index
+        return set(masks.MASK_VALUES[self._cols[pos.get_col()]])  # Build col set from col mask
 
     def get_box(self, pos):
         """
@@ -302,8 +642,17 @@ class Board:
         :param pos: Position: The position of the cell that the box is being found for
         :return: Set of Integer: The set of values for the respective box of the position
         """
-        # Return box set from row and col index and int division by 3:
-        return self._boxes[pos.get_row() // 3][pos.get_col() // 3]
+        # Build box set from the box mask found from the box index of the position:
+        return set(masks.MASK_VALUES[self._boxes[units.BOX_OF[pos.get_index()]]])
+
+    def get_candidates(self, pos):
+        """
+        Get the bitmask of values that could be put at the given position without conflicting with its row, col, or box
+        :param pos: Position: The position of the cell to get the candidates of
+        :return: Integer: A bitmask (see masks.py) with bit (val - 1) set for each value that could go in the cell
+        """
+        # Any value that is not already in the row, col, or box is a candidate:
+        return self._get_candidates(pos.get_index())
 
     def get_val(self, pos):
         """
@@ -311,7 +660,7 @@ class Board:
         :param pos: Position: The position to get the value from
         :return: None or Integer: The value of the entry at the given position
         """
-        return self._matrix[pos.get_row()][pos.get_col()].get_val()  # Return value of entry at given position
+        return self._cells[pos.get_index()] or None  # Return value of cell at given position (None if empty)
 
     def entry_non_conflicting(self, val, pos):
         """
@@ -320,63 +669,107 @@ class Board:
         :param pos: Position: The position to get the row, column, and box from
         :return: Boolean: Does the given value NOT conflict with any other values in the row, col, or box?
         """
-        # Return True if the val is not in the row, col, or box at that position, False if otherwise
-        return (val not in self.get_row(pos)) and (val not in self.get_col(pos)) and (val not in self.get_box(pos))
+        # An empty value can never conflict:
+        if val is None:
+            return True
+        # Return True if the val's bit is not set in the row, col, or box mask at that position, False if otherwise
+        return not masks.VALUE_BITS[val] & ~self.get_candidates(pos)
 
     @staticmethod
-    def generate_board(max_remove=81):
+    def generate_board(max_remove=81, grade=None, symmetry=None, minimal=False, seed=None, stats=None):
         """
-        Generate an unsolved sudoku board with one unique solution
+        Generate an unsolved sudoku board with one unique solution (see generator.PuzzleGenerator)
         :param max_remove: Integer: The maximum amount of numbers to remove from the board
+        :param grade: None or String: The grade the board should have (one of constants.GRADES, see grader.py), or
+        None to only use max_remove as the difficulty. Raises ValueError if the grade cannot be reached.
+        :param symmetry: None or String: The symmetry the empty cells should have (see generator.SYMMETRIES), or None
+        for no symmetry
+        :param minimal: Boolean: Should values be removed until none can be without a second solution, ignoring
+        max_remove? With a symmetry, no orbit of symmetric cells can be removed instead, so the symmetry is kept.
+        :param seed: None or Integer: The seed of the random choices, so the same board can be generated again (None
+        for a different board each time)
+        :param stats: None or SolveStats: Counters to add the nodes, backtracks, and time of the searches that check
+        for a second solution to
         :return: Board: An unsolved sudoku board with one unique solution
         """
-        b = Board.get_solved_board()  # Get a random, fully solved board
-        posns = Position.get_all_positions()  # Get a list of all positions on the board
-        removed = 0  # Counter of how many were removed
-        # Iterate while there are still positions to try to remove and the maximum amount given has not been reached:
-        while posns and removed < max_remove:
-            pos = posns.pop()  # Remove a position
-            valid = True
-            val = b.get_val(pos)  # Get the value at that position
-            b_copy = copy.deepcopy(b)
-            b_copy.set_val(None, pos)  # Make a copy of the board and set the value at that position to None
-            # Attempt to solve the board while not using the previous value at that position
-            try:
-                b_copy.solve(restrict_val=val, restrict_pos=pos)
-                # If the board solves without error with these restrictions, there is more than one unique solution
-                # if this value is removed, so this board is not valid
-                valid = False
-            except ValueError:
-                pass
-            # If the board is valid, set the value to None and increase the counter
-            if valid:
-                b.set_val(None, pos)
-                removed += 1
-        return b  # Return the generated board
+        import generator  # Imported here since the generator itself uses boards
+        puzzle_generator = generator.PuzzleGenerator(symmetry or generator.NO_SYMMETRY, minimal, seed)
+        return puzzle_generator.generate(max_remove, grade, stats)
 
     @staticmethod
-    def get_solved_board():
+    def get_solved_board(rand=True):
         """
         Generate a random, fully solved sudoku board
+        :param rand: Boolean or Random: A random.Random to make the board with, so it can be made again from the same
+        seed (True for a different board each time)
         :return: Board: A solved sudoku board
         """
         b = Board()  # Make an empty board
-        b.solve(rand=True)  # Solve the board with rand=True so it is different each time
+        b.solve(rand=rand)  # Solve the board with rand so it is different each time
         return b  # Return the solved board
 
+    @staticmethod
+    def from_string(s):
+        """
+        Create a board from a string of its 81 values row-wise
+        :param s: String: The values of the board with '0' or '.' for empty cells
+        :return: Board: The board with the given values
+        """
+        if len(s) != 81:
+            raise ValueError("Board string must have exactly 81 characters")
+        b = Board()  # Make an empty board
+        # Put the value of each cell that is not empty straight into the board, checking it the same way set_val does
+        # but without making a Position for each cell:
+        for ind, char in enumerate(s):
+            if char == "0" or char == ".":
+                continue
+            val = ord(char) - 48  # Value of the digit character
+            if not 1 <= val <= 9 or not b._get_candidates(ind) & masks.VALUE_BITS[val]:
+                raise ValueError("Not a valid value (None or 1-9) or Value already exists in column, row, or box")
+            b._place(val, ind)
+        return b  # Return the board
+
+    def to_string(self, blank="0"):
+        """
+        Convert the board to a string of its 81 values row-wise
+        :param blank: String: The character to use for empty cells ('0' or '.')
+        :return: String: The values of the board
+        """
+        # Map each value byte straight to its digit character:
+        s = self._cells.translate(Board._DIGITS).decode()
+        return s if blank == "0" else s.replace("0", blank)
+
+    def __eq__(self, other):
+        """
+        Check if two boards, self and other, have the same values (see canonical.py to check if they are the same
+        puzzle up to symmetry)
+        :param other: Any: The object being compared to self
+        :return: Boolean or NotImplemented: Does every cell have the same value? (NotImplemented if other is not a
+        Board, so Python compares them by identity and they are never equal)
+        """
+        # Boards can be keys next to other types, so anything else is just not equal instead of an error:
+        if not isinstance(other, Board):
+            return NotImplemented
+        return self._cells == other._cells
+
+    def __hash__(self):
+        """
+        Hash the values of the board so it can be used in sets and as a dictionary key (it must not be changed while
+        it is one)
+        :return: Integer: The hash of the values, which is the same for equal boards
+        """
+        return hash(bytes(self._cells))
+
     def __str__(self):
         """
         Convert the board to a string
         :return: String: The board in string form
         """
         s = ""  # Initial empty string
-        # Iterate through each value on the matrix:
-        for i in range(len(self._matrix)):
-            for j in range(len(self._matrix[i])):
-                if self._matrix[i][j].get_val() is None:
-                    val = 0
-                else:
-                    val = str(self._matrix[i][j])
+        # Iterate through each value on the board (empty cells are already 0):
+        for i in range(9):
+            for j in range(9):
+                val = self._cells[i * 9 + j]
                 s += str(val) + " "
                 if j == 2 or j == 5:
                     s += "| "  # Add vertical borders
@@ -0,0 +1,284 @@
+from board import Board
+import itertools
+
+# Canonical forms of sudoku boards:
+# Two boards are the same puzzle up to symmetry if one can be turned into the other with the transformations of
+# transforms.py (relabelling the values, reordering the bands, stacks, and the rows or cols within them, and
+# transposing). The canonical form is the one board of all of those that comes first row-wise, with empty cells
+# before values and the values relabelled 1, 2, 3, ... in the order they first appear, so it is the same for every
+# board that is the same puzzle. It is built one row at a time, keeping only the choices of transposition, col order,
+# and rows that give the smallest rows so far. The structural hash is much faster: it only combines counts that no
+# transformation changes, so the same puzzle always has the same hash, but different puzzles can share one.
+
+_TRANSPOSED = tuple(ind % 9 * 9 + ind // 9 for ind in range(81))  # The cell each cell takes its value from
+
+
+def canonical_state(state):
+    """
+    Get the canonical form of the values of a board
+    :param state: Bytes: The 81 values of the board from Board.snapshot
+    :return: Bytes: The 81 values of the canonical form, which can be given to Board.restore
+    """
+    # A choice is (grid, col order, source bands used, source rows used in the current band, labels, labels used):
+    choices = []
+    best = None
+    for grid in (bytes(state), bytes(state[ind] for ind in _TRANSPOSED)):
+        # Each value is in a row at most once, so the first row relabels to its pattern of empty cells with 1, 2, 3,
+        # ... for the values, and the smallest puts the empty cells first:
+        for row in range(9):
+            values = grid[row * 9:row * 9 + 9]
+            key, col_orders = _first_row_orders(values)
+            if best is None or key < best:
+                best = key
+                choices = []
+            if key == best:
+                for cols in col_orders:
+                    labels = [0] * 10
+                    used = 0
+                    for col in cols:
+                        if values[col]:
+                            used += 1
+                            labels[values[col]] = used
+                    choices.append((grid, cols, (row // 3,), (row,), labels, used))
+    out = _relabel_pattern(best)
+    for out_row in range(1, 9):
+        best = None
+        next_choices = {}
+        for grid, cols, bands, rows, labels, used in choices:
+            if out_row % 3:
+                # Finish the band that was started:
+                sources = [bands[-1] * 3 + k for k in range(3) if bands[-1] * 3 + k not in rows]
+            else:
+                # Start any band that was not used yet:
+                sources = [band * 3 + k for band in range(3) if band not in bands for k in range(3)]
+            for source in sources:
+                new_labels = list(labels)
+                new_used = used
+                values = []
+                for col in cols:
+                    val = grid[source * 9 + col]
+                    if val:
+                        if not new_labels[val]:
+                            new_used += 1
+                            new_labels[val] = new_used
+                        val = new_labels[val]
+                    values.append(val)
+                values = tuple(values)
+                if best is None or values < best:
+                    best = values
+                    next_choices = {}
+                if values == best:
+                    if out_row % 3:
+                        choice = (grid, cols, bands, rows + (source,), new_labels, new_used)
+                    else:
+                        choice = (grid, cols, bands + (source // 3,), (source,), new_labels, new_used)
+                    # Choices that will write the same rows from here on only need to be followed once:
+                    next_choices.setdefault(_get_future(choice), choice)
+        choices = list(next_choices.values())
+        out.extend(best)
+    return bytes(out)
+
+
+def canonical_form(board):
+    """
+    Get the canonical form of a board, which is the same for every board that is the same puzzle up to symmetry
+    :param board: Board: The board (it is not changed)
+    :return: Board: The canonical form
+    """
+    b = Board()
+    b.restore(canonical_state(board.snapshot()))
+    return b
+
+
+def structural_hash(board):
+    """
+    Get a hash of a board that is the same for every board that is the same puzzle up to symmetry. It is much faster
+    than the canonical form, so use it to find the boards that could be the same before comparing canonical forms.
+    :param board: Board: The board (it is not changed)
+    :return: Integer: The hash, which is the same in every process
+    """
+    state = board.snapshot()
+    row_counts = [0] * 9  # Number of values in each row
+    col_counts = [0] * 9  # Number of values in each col
+    box_counts = [0] * 9  # Number of values in each box
+    digits = [[] for _ in range(10)]  # The (band, stack) of each appearance of each value
+    for ind, val in enumerate(state):
+        if val:
+            row, col = ind // 9, ind % 9
+            row_counts[row] += 1
+            col_counts[col] += 1
+            box_counts[row // 3 * 3 + col // 3] += 1
+            digits[val].append((row // 3, col // 3))
+    rows = _line_invariant(row_counts)
+    cols = _line_invariant(col_counts)
+    boxes = [box_counts[band * 3:band * 3 + 3] for band in range(3)]
+    box_rows = tuple(sorted(tuple(sorted(counts)) for counts in boxes))
+    box_cols = tuple(sorted(tuple(sorted(counts)) for counts in zip(*boxes)))
+    # A transposition swaps the rows with the cols, so each pair is sorted:
+    lines = tuple(sorted((rows, cols)))
+    box_lines = tuple(sorted((box_rows, box_cols)))
+    # Relabelling only swaps the values, so they are described by sorted counts of what they do:
+    spreads = tuple(sorted(tuple(sorted((len({band for band, _ in places}), len({stack for _, stack in places}))))
+                           + (len(places),) for places in digits[1:]))
+    cells = tuple(sorted(tuple(sorted((row_counts[ind // 9], col_counts[ind % 9])))
+                         + (box_counts[ind // 27 * 3 + ind % 9 // 3],) for ind in range(81) if state[ind]))
+    return hash((lines, box_lines, spreads, cells))
+
+
+def are_equivalent(first, second):
+    """
+    Check if two boards are the same puzzle up to symmetry
+    :param first: Board: The first board
+    :param second: Board: The second board
+    :return: Boolean: Can one board be turned into the other by the transformations of transforms.py?
+    """
+    if structural_hash(first) != structural_hash(second):
+        return False
+    return canonical_state(first.snapshot()) == canonical_state(second.snapshot())
+
+
+class PuzzleSet:
+    """Represents a set of puzzles where boards that are the same puzzle up to symmetry count as one, like for
+    dropping repeated puzzles. Boards are grouped by their structural hash, and canonical forms are only worked out
+    for boards that share a hash with another one."""
+
+    __slots__ = ('_groups', '_size')
+
+    def __init__(self):
+        """Creates an empty PuzzleSet object"""
+        self._groups = {}  # List of [values, canonical values or None until needed] for each structural hash
+        self._size = 0  # Number of different puzzles in the set
+
+    def add(self, board):
+        """
+        Add a puzzle to the set if it is not already in it
+        :param board: Board: The puzzle (it is not changed)
+        :return: Boolean: Was the puzzle added (False if the same puzzle up to symmetry was already in the set)?
+        """
+        key = structural_hash(board)
+        group = self._groups.get(key)
+        if group is None:
+            self._groups[key] = [[board.snapshot(), None]]
+        else:
+            canonical = self._find(group, board)
+            if canonical is None:
+                return False
+            group.append([board.snapshot(), canonical])
+        self._size += 1
+        return True
+
+    def __contains__(self, board):
+        """
+        Check if a puzzle is in the set
+        :param board: Board: The puzzle (it is not changed)
+        :return: Boolean: Is the same puzzle up to symmetry in the set?
+        """
+        group = self._groups.get(structural_hash(board))
+        return group is not None and self._find(group, board) is None
+
+    def __len__(self):
+        """
+        Get the number of different puzzles in the set
+        :return: Integer: The number of puzzles
+        """
+        return self._size
+
+    @staticmethod
+    def _find(group, board):
+        """
+        Look for a puzzle in the group of puzzles with its structural hash, working out the canonical forms it needs
+        :param group: List of [Bytes, None or Bytes]: The values and canonical values of each puzzle in the group
+        :param board: Board: The puzzle to look for
+        :return: None or Bytes: None if the puzzle is in the group, otherwise its canonical values
+        """
+        canonical = canonical_state(board.snapshot())
+        for entry in group:
+            if entry[1] is None:
+                entry[1] = canonical_state(entry[0])
+            if entry[1] == canonical:
+                return None
+        return canonical
+
+
+def _line_invariant(counts):
+    """
+    Describe the counts of the rows (or cols) in a way that reordering them within the bands (or stacks) and
+    reordering the bands (or stacks) does not change
+    :param counts: List of Integer: The number of values in each row (or col)
+    :return: Tuple of (Tuple of Integer): The sorted counts of each band (or stack), sorted
+    """
+    return tuple(sorted(tuple(sorted(counts[band * 3:band * 3 + 3])) for band in range(3)))
+
+
+def _first_row_orders(values):
+    """
+    Find the smallest first row a row can become, and the col orders that give it
+    :param values: Bytes: The 9 values of the row
+    :return: Tuple of (Tuple of Integer, List of (Tuple of Integer)): The pattern of the smallest row (0 for empty
+    cells, 1 for values) and each col order (the col that goes in each col) that gives it
+    """
+    # In each stack the empty cells go first, and the stacks with more empty cells go first:
+    stacks = []
+    for stack in range(3):
+        empty = [stack * 3 + k for k in range(3) if not values[stack * 3 + k]]
+        full = [stack * 3 + k for k in range(3) if values[stack * 3 + k]]
+        stacks.append((len(full), empty, full))
+    stacks.sort(key=lambda s: s[0])
+    key = tuple(bit for filled, _, _ in stacks for bit in [0] * (3 - filled) + [1] * filled)
+    # Stacks with as many empty cells can be swapped, and so can the empty cells or the values in a stack:
+    stack_orders = [order for order in itertools.permutations(range(3))
+                    if [stacks[i][0] for i in order] == [s[0] for s in stacks]]
+    inner = [[empty + full for empty in itertools.permutations(s[1]) for full in itertools.permutations(s[2])]
+             for s in stacks]
+    orders = []
+    for order in stack_orders:
+        for parts in itertools.product(*(inner[i] for i in order)):
+            orders.append(tuple(col for part in parts for col in part))
+    return key, orders
+
+
+def _relabel_pattern(pattern):
+    """
+    Relabel the pattern of the first row into its values
+    :param pattern: Tuple of Integer: The pattern with 0 for empty cells and 1 for values
+    :return: List of Integer: The row with the values numbered 1, 2, 3, ... from the left
+    """
+    out = []
+    used = 0
+    for bit in pattern:
+        if bit:
+            used += 1
+            out.append(used)
+        else:
+            out.append(0)
+    return out
+
+
+def _get_future(choice):
+    """
+    Describe everything that decides the rows a choice will write from here on, so choices that will write the same
+    rows can be found
+    :param choice: Tuple: The choice (grid, col order, source bands used, source rows used in the current band,
+    labels, labels used)
+    :return: Tuple: The rows left in the current band, the bands left, and the labels used, with each row as its
+    values in the col order (labelled if they have a label, negative otherwise)
+    """
+    grid, cols, bands, rows, labels, used = choice
+    # The rows of a band can go in any order, and so can the bands, so they are sorted:
+    current = tuple(sorted(_get_line(grid, cols, labels, bands[-1] * 3 + k) for k in range(3)
+                           if bands[-1] * 3 + k not in rows))
+    others = tuple(sorted(tuple(sorted(_get_line(grid, cols, labels, band * 3 + k) for k in range(3)))
+                          for band in range(3) if band not in bands))
+    return current, others, used
+
+
+def _get_line(grid, cols, labels, source):
+    """
+    Get the values of a row of a choice in its col order
+    :param grid: Bytes: The 81 values of the board (transposed or not)
+    :param cols: Tuple of Integer: The col that goes in each col
+    :param labels: List of Integer: The label of each value, 0 if it has none yet
+    :param source: Integer: The row of the grid
+    :return: Tuple of Integer: The label of each value, or the negative value if it has no label yet (0 if empty)
+    """
+    return tuple(labels[grid[source * 9 + col]] or -grid[source * 9 + col] for col in cols)
@@ -0,0 +1,133 @@
+import constants
+import json
+import time
+
+
+class ChromeTraceCollector:
+    """Records the hook events of solving boards as a Chrome trace, which can be opened in chrome://tracing or
+    Perfetto to see the search as a flame graph. Each value the search guesses is a slice that lasts until the value
+    is taken back out, so slices are nested by search depth. Singles, backtracks, and finished passes are instant
+    events."""
+
+    def __init__(self):
+        """Creates a ChromeTraceCollector object with no events"""
+        self._events = []  # List of trace event dictionaries in the order they happened
+        self._open = 0  # Number of guessed values whose slices have not been ended yet
+        self._start = time.perf_counter()  # Time that the timestamps of the events are relative to
+
+    def attach(self, board):
+        """
+        Start recording the events of a board
+        :param board: Board: The board to add the hooks to
+        :return: None
+        """
+        for event, callback in self._get_callbacks():
+            board.add_hook(event, callback)
+
+    def detach(self, board):
+        """
+        Stop recording the events of a board
+        :param board: Board: The board to remove the hooks from
+        :return: None
+        """
+        for event, callback in self._get_callbacks():
+            board.remove_hook(event, callback)
+
+    def get_events(self):
+        """
+        Get the recorded events, with the slices of values still on the board ended now
+        :return: List of Dictionary: The trace events
+        """
+        ts = self._timestamp()
+        return self._events + [ChromeTraceCollector._make_event("E", ts) for _ in range(self._open)]
+
+    def write(self, path):
+        """
+        Write the recorded events to a file in the Chrome trace JSON format
+        :param path: String or PathLike: The path of the file to write
+        :return: None
+        """
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.get_events(), "displayTimeUnit": "ms"}, f)
+
+    def _get_callbacks(self):
+        """
+        Get the method that records each hook event
+        :return: Tuple of (String, Function): Each hook event and the method for it
+        """
+        return ((constants.CELL_ASSIGNED_EVENT, self._cell_assigned),
+                (constants.VALUE_REMOVED_EVENT, self._value_removed),
+                (constants.BACKTRACK_EVENT, self._backtrack),
+                (constants.PASS_COMPLETED_EVENT, self._pass_completed))
+
+    def _cell_assigned(self, ind, val, depth):
+        """
+        Record a value being put in a cell
+        :param ind: Integer: The flat index of the cell
+        :param val: Integer: The value
+        :param depth: Integer: The search depth of the guess, 0 if it was not a guess
+        :return: None
+        """
+        name = "r" + str(ind // 9 + 1) + "c" + str(ind % 9 + 1) + "=" + str(val)
+        if depth:
+            # A guess lasts until the search takes it back out:
+            self._events.append(ChromeTraceCollector._make_event("B", self._timestamp(), name, {"depth": depth}))
+            self._open += 1
+        else:
+            self._events.append(ChromeTraceCollector._make_event("i", self._timestamp(), name))
+
+    def _value_removed(self, ind, val):
+        """
+        Record a guessed value being taken back out of a cell, ending its slice
+        :param ind: Integer: The flat index of the cell
+        :param val: Integer: The value
+        :return: None
+        """
+        self._events.append(ChromeTraceCollector._make_event("E", self._timestamp()))
+        self._open -= 1
+
+    def _backtrack(self, ind, depth):
+        """
+        Record the search running out of values for a cell
+        :param ind: Integer: The flat index of the cell
+        :param depth: Integer: The search depth of the cell
+        :return: None
+        """
+        self._events.append(ChromeTraceCollector._make_event("i", self._timestamp(), "backtrack",
+                                                             {"cell": ind, "depth": depth}))
+
+    def _pass_completed(self, naked, hidden):
+        """
+        Record the singles being filled in
+        :param naked: Integer: The number of naked singles placed
+        :param hidden: Integer: The number of hidden singles placed
+        :return: None
+        """
+        self._events.append(ChromeTraceCollector._make_event("i", self._timestamp(), "singles",
+                                                             {"naked": naked, "hidden": hidden}))
+
+    def _timestamp(self):
+        """
+        Get the current time for an event
+        :return: Float: The microseconds since the collector was created
+        """
+        return (time.perf_counter() - self._start) * 1e6
+
+    @staticmethod
+    def _make_event(phase, ts, name=None, args=None):
+        """
+        Make a trace event
+        :param phase: String: The trace event phase ("B" to begin a slice, "E" to end one, "i" for an instant)
+        :param ts: Float: The timestamp in microseconds
+        :param name: None or String: The name shown for the event
+        :param args: None or Dictionary: Extra details shown for the event
+        :return: Dictionary: The trace event
+        """
+        event = {"ph": phase, "ts": ts, "pid": 1, "tid": 1}
+        if name is not None:
+            event["name"] = name
+        if args is not None:
+            event["args"] = args
+        if phase == "i":
+            event["s"] = "t"  # Instant events are drawn on their thread's track
+        return event
@@ -4,12 +4,41 @@
 BOARD_WIDTH = 500
 BOARD_HEIGHT = 500
 
+# GUI solving animation constants:
+ANIMATION_DELAY = 15  # Milliseconds between frames
+ANIMATION_FRAMES = 200  # Most frames to show, so long searches skip ahead several moves per frame
+SOLVE_TIMEOUT = 10  # Seconds the GUI waits for a solution before giving up, since the window freezes while solving
+
 # Tag constants:
 VALUE_TAG = "value"
 BOARD_TAG = "board"
 POINTER_TAG = "pointer"
+ANIMATION_TAG = "animation"
+
+# Solver engine constants:
+BACKTRACKING_ENGINE = "backtracking"
+DLX_ENGINE = "dlx"
+
+# Solver hook event constants (see Board.add_hook), with the arguments each hook is called with:
+CELL_ASSIGNED_EVENT = "cell_assigned"  # (ind, val, depth): a value was put in a cell, depth 0 if it was not a guess
+VALUE_REMOVED_EVENT = "value_removed"  # (ind, val): a value the search put in a cell was taken back out
+BACKTRACK_EVENT = "backtrack"  # (ind, depth): the search ran out of values for a cell and went back to an earlier one
+PASS_COMPLETED_EVENT = "pass_completed"  # (naked, hidden): filling in naked and hidden singles finished
+HOOK_EVENTS = (CELL_ASSIGNED_EVENT, VALUE_REMOVED_EVENT, BACKTRACK_EVENT, PASS_COMPLETED_EVENT)
 
 # Max entries to remove for each difficulty:
 EASY_REMOVE = 40
 MEDIUM_REMOVE = 50
 HARD_REMOVE = 81
+
+# Grades of puzzles by the hardest technique needed to solve them (see grader.py), from easiest to hardest:
+EASY_GRADE = "easy"  # Naked and hidden singles
+MEDIUM_GRADE = "medium"  # Pointing, claiming, and naked or hidden pairs
+HARD_GRADE = "hard"  # Naked or hidden triples, X-wings, and swordfish
+EXPERT_GRADE = "expert"  # Guessing (search)
+GRADES = (EASY_GRADE, MEDIUM_GRADE, HARD_GRADE, EXPERT_GRADE)
+
+# Entries to remove before a puzzle generated for a grade can be returned, so easy puzzles are not nearly full:
+GRADE_MIN_REMOVE = {EASY_GRADE: EASY_REMOVE, MEDIUM_GRADE: MEDIUM_REMOVE, HARD_GRADE: MEDIUM_REMOVE,
+                    EXPERT_GRADE: MEDIUM_REMOVE}
+GRADE_ATTEMPTS = 1000  # Solved boards to try before giving up on reaching a grade (hard puzzles are rare)
@@ -0,0 +1,227 @@
+from board import Board
+import mmap
+import struct
+
+
+class PuzzleCorpus:
+    """Reads puzzles (and optionally their solutions) from a packed binary corpus file through a memory map"""
+
+    # File layout:
+    #   Header (16 bytes): magic b"PYDK", format version (1 byte), flags (1 byte), 2 reserved bytes, and the number of
+    #   records (8 bytes, little-endian)
+    #   Records: fixed-width, so record i starts at HEADER_SIZE + i * record size. Each record is the puzzle packed at
+    #   4 bits per cell (41 bytes, the high nibble of each byte holds the earlier cell), followed by the solution
+    #   packed the same way if the solutions flag is set.
+    MAGIC = b"PYDK"
+    VERSION = 1
+    HEADER_SIZE = 16
+    PACKED_SIZE = 41  # Bytes to hold 81 cells at 4 bits each
+    SOLUTIONS_FLAG = 1  # Flag bit set when each record also holds a solution
+    _HEADER = struct.Struct("<4sBB2xQ")  # Layout of the header
+
+    # Tables to take the high and low nibble out of every byte at once with bytes.translate:
+    _HIGH_NIBBLES = bytes(byte >> 4 for byte in range(256))
+    _LOW_NIBBLES = bytes(byte & 15 for byte in range(256))
+
+    def __init__(self, path):
+        """
+        Open a corpus file for reading
+        :param path: String or PathLike: The path of the corpus file
+        """
+        self._path = path  # Kept so a pickled corpus can map the file again in another process
+        with open(path, "rb") as f:
+            # The memory map stays valid after the file is closed:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < PuzzleCorpus.HEADER_SIZE:
+            raise ValueError("Not a Pydoku corpus file")
+        magic, version, flags, count = PuzzleCorpus._HEADER.unpack_from(self._mmap)
+        if magic != PuzzleCorpus.MAGIC or version != PuzzleCorpus.VERSION:
+            raise ValueError("Not a Pydoku corpus file")
+        self._has_solutions = bool(flags & PuzzleCorpus.SOLUTIONS_FLAG)
+        self._record_size = PuzzleCorpus.PACKED_SIZE * (2 if self._has_solutions else 1)
+        if len(self._mmap) < PuzzleCorpus.HEADER_SIZE + count * self._record_size:
+            raise ValueError("Corpus file is shorter than its header says")
+        # The range of records this object gives access to (slicing makes objects that share the memory map):
+        self._start = 0
+        self._stop = count
+
+    def has_solutions(self):
+        """
+        Check if the corpus holds a solution for each puzzle
+        :return: Boolean: Does each record have a solution?
+        """
+        return self._has_solutions
+
+    def get_puzzle(self, i):
+        """
+        Get a puzzle by its number
+        :param i: Integer: The number of the puzzle (negative numbers count from the end)
+        :return: Board: The puzzle
+        """
+        return PuzzleCorpus._to_board(self.get_cells(i))
+
+    def get_solution(self, i):
+        """
+        Get the solution of a puzzle by its number
+        :param i: Integer: The number of the puzzle (negative numbers count from the end)
+        :return: None or Board: The solution to the puzzle, None if the corpus has no solutions
+        """
+        if not self._has_solutions:
+            return None
+        return PuzzleCorpus._to_board(self.get_cells(i, solution=True))
+
+    def get_cells(self, i, solution=False):
+        """
+        Get the raw values of a puzzle or its solution by its number
+        :param i: Integer: The number of the puzzle (negative numbers count from the end)
+        :param solution: Boolean: Should the values of the solution be returned instead of the puzzle?
+        :return: Bytes: The 81 values row-wise with 0 for empty cells
+        """
+        offset = self._record_offset(i)
+        if solution:
+            offset += PuzzleCorpus.PACKED_SIZE
+        return PuzzleCorpus.unpack(self._mmap[offset:offset + PuzzleCorpus.PACKED_SIZE])
+
+    def close(self):
+        """
+        Close the memory map (this also closes it for any slices of this corpus)
+        :return: None
+        """
+        self._mmap.close()
+
+    def _record_offset(self, i):
+        """
+        Get the position of a record in the file
+        :param i: Integer: The number of the puzzle within this corpus or slice (negative numbers count from the end)
+        :return: Integer: The offset of the start of the record in the file
+        """
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("Puzzle number out of range")
+        return PuzzleCorpus.HEADER_SIZE + (self._start + i) * self._record_size
+
+    @staticmethod
+    def _to_board(cells):
+        """
+        Make a board straight from its values without checking them (corpus files are only written from valid boards)
+        :param cells: Bytes: The 81 values row-wise with 0 for empty cells
+        :return: Board: The board with those values
+        """
+        b = Board()
+        b.restore(cells)
+        return b
+
+    @staticmethod
+    def pack(cells):
+        """
+        Pack the values of a board at 4 bits per cell
+        :param cells: Bytes: The 81 values row-wise with 0 for empty cells
+        :return: Bytes: The 41 packed bytes
+        """
+        high = cells[0::2]  # 41 values that go in the high nibbles
+        low = bytes(cells[1::2]) + b"\x00"  # 40 values that go in the low nibbles, padded to 41
+        return bytes(h << 4 | l for h, l in zip(high, low))
+
+    @staticmethod
+    def unpack(packed):
+        """
+        Unpack the values of a board from 4 bits per cell
+        :param packed: Bytes: The 41 packed bytes
+        :return: Bytes: The 81 values row-wise with 0 for empty cells
+        """
+        cells = bytearray(PuzzleCorpus.PACKED_SIZE * 2)
+        cells[0::2] = packed.translate(PuzzleCorpus._HIGH_NIBBLES)
+        cells[1::2] = packed.translate(PuzzleCorpus._LOW_NIBBLES)
+        return bytes(cells[:81])
+
+    @staticmethod
+    def write(path, puzzles, solutions=None):
+        """
+        Write puzzles (and optionally their solutions) to a corpus file, one record at a time
+        :param path: String or PathLike: The path of the corpus file to write
+        :param puzzles: Iterable of (Board or String): The puzzles to write (strings are 81 characters)
+        :param solutions: None or Iterable of (Board or String): The solution of each puzzle, in the same order
+        :return: Integer: The number of records written
+        """
+        count = 0
+        flags = PuzzleCorpus.SOLUTIONS_FLAG if solutions is not None else 0
+        with open(path, "wb") as f:
+            # Write the header with no records, then fill in the count once all of the records are written:
+            f.write(PuzzleCorpus._HEADER.pack(PuzzleCorpus.MAGIC, PuzzleCorpus.VERSION, flags, 0))
+            boards = zip(puzzles, solutions) if solutions is not None else ((puzzle,) for puzzle in puzzles)
+            for record in boards:
+                for b in record:
+                    if isinstance(b, str):
+                        b = Board.from_string(b)
+                    f.write(PuzzleCorpus.pack(b.snapshot()))
+                count += 1
+            f.seek(0)
+            f.write(PuzzleCorpus._HEADER.pack(PuzzleCorpus.MAGIC, PuzzleCorpus.VERSION, flags, count))
+        return count
+
+    def __len__(self):
+        """
+        Get the number of puzzles in the corpus (or slice)
+        :return: Integer: The number of puzzles
+        """
+        return self._stop - self._start
+
+    def __getitem__(self, key):
+        """
+        Get a puzzle by its number, or a slice of the corpus that shares the same memory map (for splitting the
+        corpus between workers, which can be sent to a process since it is pickled as its path and range)
+        :param key: Integer or Slice: The number of the puzzle or a slice with a step of 1
+        :return: Board or PuzzleCorpus: The puzzle or the slice of the corpus
+        """
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                raise ValueError("Corpus slices must have a step of 1")
+            view = PuzzleCorpus.__new__(PuzzleCorpus)
+            view.__dict__.update(self.__dict__)
+            view._start = self._start + start
+            view._stop = self._start + max(start, stop)
+            return view
+        return self.get_puzzle(key)
+
+    def __reduce__(self):
+        """
+        Pickle the corpus (or slice) as its path and range of records, since a memory map cannot be pickled, so it is
+        mapped again when it is unpickled
+        :return: Tuple of (Function, Tuple): The function that opens the corpus again and its arguments
+        """
+        return _open_range, (self._path, self._start, self._stop)
+
+    def __iter__(self):
+        """
+        Iterate through the puzzles in order
+        :return: Generator of Board: Each puzzle in the corpus (or slice)
+        """
+        for i in range(len(self)):
+            yield self.get_puzzle(i)
+
+    def __enter__(self):
+        """
+        Use the corpus as a context manager that closes it at the end
+        :return: PuzzleCorpus: This corpus
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Close the corpus at the end of a with block
+        :return: None
+        """
+        self.close()
+
+
+def _open_range(path, start, stop):
+    """
+    Open a range of the records of a corpus file, for unpickling a corpus
+    :param path: String or PathLike: The path of the corpus file
+    :param start: Integer: The number of the first record in the file
+    :param stop: Integer: The number of the record after the last one
+    :return: PuzzleCorpus: The corpus or slice
+    """
+    return PuzzleCorpus(path)[start:stop]
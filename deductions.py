@@ -0,0 +1,323 @@
+import itertools
+import masks
+import units
+
+# Human-style deduction techniques that work on the candidates (pencil marks) of each empty cell:
+# Naked and hidden singles place values. Every other technique only removes candidates (eliminations), which can
+# uncover new singles. The pipeline always fills in every single before it tries the next technique, and after any
+# technique removes a candidate it goes back to the singles, so the cheap techniques are used as much as possible.
+
+POINTING = "pointing"  # A value in a box that can only go in one row or col of it is removed from the rest of that line
+CLAIMING = "claiming"  # A value in a row or col that can only go in one box is removed from the rest of that box
+NAKED_PAIRS = "naked_pairs"  # 2 cells of a unit with the same 2 candidates remove them from the rest of the unit
+HIDDEN_PAIRS = "hidden_pairs"  # 2 values that only fit in the same 2 cells of a unit remove the other candidates there
+NAKED_TRIPLES = "naked_triples"  # Like naked pairs with 3 cells that have only 3 candidates between them
+HIDDEN_TRIPLES = "hidden_triples"  # Like hidden pairs with 3 values that only fit in the same 3 cells
+X_WING = "x_wing"  # A value that fits in the same 2 cols of 2 rows is removed from the rest of those cols (or swapped)
+SWORDFISH = "swordfish"  # Like the X-wing with 3 rows and 3 cols
+
+# Every technique in the order they are tried (cheapest first):
+TECHNIQUES = (POINTING, CLAIMING, NAKED_PAIRS, HIDDEN_PAIRS, NAKED_TRIPLES, HIDDEN_TRIPLES, X_WING, SWORDFISH)
+
+# Each place a box meets a row or col, as (cells in both, other cells of the box, other cells of the line):
+_INTERSECTIONS = tuple((tuple(sorted(set(units.BOX_CELLS[box]) & set(line))),
+                        tuple(sorted(set(units.BOX_CELLS[box]) - set(line))),
+                        tuple(sorted(set(line) - set(units.BOX_CELLS[box]))))
+                       for box in range(9) for line in units.ROW_CELLS + units.COL_CELLS
+                       if set(units.BOX_CELLS[box]) & set(line))
+
+
+class DeductionPipeline:
+    """Fills in the values of a board that can be found with deduction techniques instead of searching. Each technique
+    can be turned on or off, and the eliminations each one makes are added to the SolveStats given to run."""
+
+    def __init__(self, techniques=TECHNIQUES):
+        """
+        Create a DeductionPipeline object
+        :param techniques: Iterable of String: The techniques to use besides naked and hidden singles (see TECHNIQUES),
+        which are always tried in the cheapest-first order of TECHNIQUES
+        """
+        techniques = set(techniques)
+        unknown = techniques - set(TECHNIQUES)
+        if unknown:
+            raise ValueError("Unknown deduction technique: " + ", ".join(sorted(unknown)))
+        self._techniques = tuple(technique for technique in TECHNIQUES if technique in techniques)
+
+    def get_techniques(self):
+        """
+        Get the techniques used besides naked and hidden singles
+        :return: Tuple of String: The techniques in the order they are tried
+        """
+        return self._techniques
+
+    def run(self, cells, restrict_val=None, restrict_ind=-1, stats=None):
+        """
+        Find every value that the techniques can deduce
+        :param cells: List of Integer: The 81 values of the board row-wise with 0 for empty cells
+        :param restrict_val: None or Integer: If there is a value that should be restricted, what is it?
+        :param restrict_ind: Integer: The flat index of the restricted position or -1 if there is none
+        :param stats: None or SolveStats: Counters to add the singles placed and the eliminations of each technique to
+        :return: List of (Integer, Integer): The flat index and value of each deduced cell in the order they were
+        found. It stops early if it finds the board has no solution, which the search then finds quickly.
+        """
+        cells = list(cells)
+        cands = DeductionPipeline._get_candidates(cells)
+        if restrict_val and restrict_ind >= 0:
+            cands[restrict_ind] &= ~masks.VALUE_BITS[restrict_val]
+        placements = []
+        naked = hidden = 0
+        eliminations = dict.fromkeys(self._techniques, 0)
+        while True:
+            # Fill in every single there is before trying anything slower:
+            singles = DeductionPipeline._place_singles(cells, cands, placements)
+            if singles is None:
+                break  # A cell or unit has nowhere left for a value, so there is no solution
+            naked += singles[0]
+            hidden += singles[1]
+            # Use the first technique that removes any candidates, then look for singles again:
+            for technique in self._techniques:
+                removed = _TECHNIQUE_FUNCTIONS[technique](cands)
+                if removed:
+                    eliminations[technique] += removed
+                    break
+            else:
+                break  # No technique can make any progress
+        if stats is not None:
+            stats.add_singles(naked, hidden)
+            for technique, removed in eliminations.items():
+                stats.add_eliminations(technique, removed)
+        return placements
+
+    @staticmethod
+    def _get_candidates(cells):
+        """
+        Get the candidates of each cell from the values on the board
+        :param cells: List of Integer: The 81 values of the board row-wise with 0 for empty cells
+        :return: List of Integer: The bitmask of candidates of each cell, 0 for cells that have a value
+        """
+        unit_masks = [0] * 27
+        for ind, val in enumerate(cells):
+            for unit in units.UNITS_OF[ind]:
+                unit_masks[unit] |= masks.VALUE_BITS[val]
+        return [0 if cells[ind] else masks.ALL_VALUES & ~(unit_masks[row] | unit_masks[col] | unit_masks[box])
+                for ind, (row, col, box) in enumerate(units.UNITS_OF)]
+
+    @staticmethod
+    def _place_singles(cells, cands, placements):
+        """
+        Place naked and hidden singles until there are none left
+        :param cells: List of Integer: The values of the board, which are filled in
+        :param cands: List of Integer: The candidates of each cell, which are updated for the placed values
+        :param placements: List of (Integer, Integer): The list to add each placed (flat index, value) to
+        :return: None or Tuple of (Integer, Integer): The number of naked and hidden singles placed, None if the board
+        was found to have no solution
+        """
+        naked = hidden = 0
+        progress = True
+        while progress:
+            progress = False
+            # Naked singles: cells with only one candidate left
+            for ind in range(81):
+                if cells[ind]:
+                    continue
+                if not cands[ind]:
+                    return None  # Nothing fits in this cell
+                if masks.MASK_COUNTS[cands[ind]] == 1:
+                    DeductionPipeline._place(cells, cands, placements, ind, masks.MASK_VALUES[cands[ind]][0])
+                    naked += 1
+                    progress = True
+            # Hidden singles: values that only fit in one cell of a unit
+            for unit_cells in units.UNIT_CELLS:
+                seen = 0  # Values already in the unit or still a candidate of one of its cells
+                once = 0  # Values that are a candidate of exactly one cell so far
+                for ind in unit_cells:
+                    seen |= masks.VALUE_BITS[cells[ind]]
+                    once = (once & ~cands[ind]) | (cands[ind] & ~seen)
+                    seen |= cands[ind]
+                if seen != masks.ALL_VALUES:
+                    return None  # A value has nowhere to go in this unit
+                for val in masks.MASK_VALUES[once]:
+                    bit = masks.VALUE_BITS[val]
+                    for ind in unit_cells:
+                        # The cell may have been used by another value of the unit, which removed this candidate:
+                        if cands[ind] & bit:
+                            if masks.MASK_COUNTS[cands[ind]] == 1:
+                                naked += 1
+                            else:
+                                hidden += 1
+                            DeductionPipeline._place(cells, cands, placements, ind, val)
+                            progress = True
+                            break
+        return naked, hidden
+
+    @staticmethod
+    def _place(cells, cands, placements, ind, val):
+        """
+        Put a value in a cell and remove it from the candidates of the cell's peers
+        :param cells: List of Integer: The values of the board
+        :param cands: List of Integer: The candidates of each cell
+        :param placements: List of (Integer, Integer): The list to add the placement to
+        :param ind: Integer: The flat index of the cell
+        :param val: Integer: The value to put in the cell
+        :return: None
+        """
+        cells[ind] = val
+        cands[ind] = 0
+        clear = ~masks.VALUE_BITS[val]
+        for peer in units.PEERS[ind]:
+            cands[peer] &= clear
+        placements.append((ind, val))
+
+
+def _eliminate(cands, cells, vals):
+    """
+    Remove values from the candidates of cells
+    :param cands: List of Integer: The candidates of each cell
+    :param cells: Iterable of Integer: The flat indices of the cells
+    :param vals: Integer: The bitmask of values to remove
+    :return: Integer: The number of candidates removed
+    """
+    removed = 0
+    for ind in cells:
+        if cands[ind] & vals:
+            removed += masks.MASK_COUNTS[cands[ind] & vals]
+            cands[ind] &= ~vals
+    return removed
+
+
+def _union(cands, cells):
+    """
+    Get every candidate of some cells
+    :param cands: List of Integer: The candidates of each cell
+    :param cells: Iterable of Integer: The flat indices of the cells
+    :return: Integer: The bitmask of values that are a candidate of any of the cells
+    """
+    mask = 0
+    for ind in cells:
+        mask |= cands[ind]
+    return mask
+
+
+def _pointing(cands):
+    """
+    Remove the candidates that pointing pairs and triples rule out
+    :param cands: List of Integer: The candidates of each cell
+    :return: Integer: The number of candidates removed
+    """
+    removed = 0
+    for common, box_rest, line_rest in _INTERSECTIONS:
+        # Values that can only go where the box meets the line cannot go anywhere else on the line:
+        vals = _union(cands, common) & ~_union(cands, box_rest)
+        if vals:
+            removed += _eliminate(cands, line_rest, vals)
+    return removed
+
+
+def _claiming(cands):
+    """
+    Remove the candidates that claiming (box/line reduction) rules out
+    :param cands: List of Integer: The candidates of each cell
+    :return: Integer: The number of candidates removed
+    """
+    removed = 0
+    for common, box_rest, line_rest in _INTERSECTIONS:
+        # Values that can only go where the line meets the box cannot go anywhere else in the box:
+        vals = _union(cands, common) & ~_union(cands, line_rest)
+        if vals:
+            removed += _eliminate(cands, box_rest, vals)
+    return removed
+
+
+def _naked_subsets(cands, size):
+    """
+    Remove the candidates that naked subsets rule out
+    :param cands: List of Integer: The candidates of each cell
+    :param size: Integer: The number of cells in each subset (2 for pairs, 3 for triples)
+    :return: Integer: The number of candidates removed
+    """
+    removed = 0
+    for unit_cells in units.UNIT_CELLS:
+        # Only cells with 2 to size candidates can be part of a naked subset:
+        options = [ind for ind in unit_cells if 2 <= masks.MASK_COUNTS[cands[ind]] <= size]
+        for subset in itertools.combinations(options, size):
+            vals = _union(cands, subset)
+            # If size cells only have size values between them, those values must go in those cells:
+            if masks.MASK_COUNTS[vals] == size:
+                removed += _eliminate(cands, (ind for ind in unit_cells if ind not in subset), vals)
+    return removed
+
+
+def _hidden_subsets(cands, size):
+    """
+    Remove the candidates that hidden subsets rule out
+    :param cands: List of Integer: The candidates of each cell
+    :param size: Integer: The number of values in each subset (2 for pairs, 3 for triples)
+    :return: Integer: The number of candidates removed
+    """
+    removed = 0
+    for unit_cells in units.UNIT_CELLS:
+        # Bitmask of the positions in the unit where each value fits:
+        spots = {}
+        for pos, ind in enumerate(unit_cells):
+            for val in masks.MASK_VALUES[cands[ind]]:
+                spots[val] = spots.get(val, 0) | 1 << pos
+        options = [val for val, mask in spots.items() if 2 <= masks.MASK_COUNTS[mask] <= size]
+        for subset in itertools.combinations(options, size):
+            where = 0
+            for val in subset:
+                where |= spots[val]
+            # If size values only fit in size cells, those cells cannot hold anything else:
+            if masks.MASK_COUNTS[where] == size:
+                keep = 0
+                for val in subset:
+                    keep |= masks.VALUE_BITS[val]
+                # (MASK_VALUES gives each position in where plus 1)
+                removed += _eliminate(cands, (unit_cells[pos - 1] for pos in masks.MASK_VALUES[where]),
+                                      masks.ALL_VALUES & ~keep)
+    return removed
+
+
+def _fish(cands, size):
+    """
+    Remove the candidates that X-wings (size 2) and swordfish (size 3) rule out
+    :param cands: List of Integer: The candidates of each cell
+    :param size: Integer: The number of rows (or cols) in the fish
+    :return: Integer: The number of candidates removed
+    """
+    removed = 0
+    for bit in masks.VALUE_BITS[1:]:
+        for base, cover in ((units.ROW_CELLS, units.COL_CELLS), (units.COL_CELLS, units.ROW_CELLS)):
+            # Bitmask of the cover lines where the value fits in each base line:
+            spots = []
+            for line, line_cells in enumerate(base):
+                where = 0
+                for pos, ind in enumerate(line_cells):
+                    if cands[ind] & bit:
+                        where |= 1 << pos
+                if 2 <= masks.MASK_COUNTS[where] <= size:
+                    spots.append((line, where))
+            for subset in itertools.combinations(spots, size):
+                where = 0
+                for line, mask in subset:
+                    where |= mask
+                # If the value fits in only size cover lines of size base lines, it must go in those cover lines
+                # within those base lines, so it cannot go anywhere else in the cover lines:
+                if masks.MASK_COUNTS[where] == size:
+                    lines = {line for line, mask in subset}
+                    for pos in masks.MASK_VALUES[where]:  # (MASK_VALUES gives each cover line in where plus 1)
+                        removed += _eliminate(cands, (ind for line, ind in enumerate(cover[pos - 1])
+                                                      if line not in lines), bit)
+    return removed
+
+
+# The function for each technique, taking the candidates and returning the number of candidates it removed:
+_TECHNIQUE_FUNCTIONS = {
+    POINTING: _pointing,
+    CLAIMING: _claiming,
+    NAKED_PAIRS: lambda cands: _naked_subsets(cands, 2),
+    HIDDEN_PAIRS: lambda cands: _hidden_subsets(cands, 2),
+    NAKED_TRIPLES: lambda cands: _naked_subsets(cands, 3),
+    HIDDEN_TRIPLES: lambda cands: _hidden_subsets(cands, 3),
+    X_WING: lambda cands: _fish(cands, 2),
+    SWORDFISH: lambda cands: _fish(cands, 3),
+}
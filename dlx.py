@@ -0,0 +1,253 @@
+from solve_budget import BudgetExceededError
+from solve_stats import SolveStats
+import time
+import units
+
+
+class DLXSolver:
+    """Solves a sudoku board as an exact cover problem with Knuth's Algorithm X using dancing links"""
+
+    # The exact cover matrix has 729 rows (1 for each value in each cell) and 324 columns (constraints):
+    #   0-80: each cell has a value, 81-161: each row has each value, 162-242: each col has each value,
+    #   243-323: each box has each value
+    # Nodes are stored in parallel lists where index 0 is the root header, 1-324 are the column headers and the
+    # remaining indices are the 4 nodes of each matrix row. Matrix row (option) o = cell * 9 + (val - 1).
+    _NUM_COLUMNS = 324
+    _base = None  # Cached lists for the full matrix that every solver copies from (built on first use)
+
+    def __init__(self, cells, restrict_val=None, restrict_ind=-1):
+        """
+        Create a DLXSolver for the given board values
+        :param cells: List of Integer: The 81 values of the board row-wise with 0 for empty cells
+        :param restrict_val: None or Integer: If there is a value that should be restricted, what is it?
+        :param restrict_ind: Integer: The flat index (row * 9 + col) of the restricted position or -1 if there is none
+        """
+        self._cells = list(cells)  # Values of the board row-wise with 0 for empty cells
+        self._restrict_val = restrict_val
+        self._restrict_ind = restrict_ind
+
+    def solve(self, rand=False, stats=None, budget=None):
+        """
+        Find a solution to the board
+        :param rand: Boolean or Random: Should the options be shuffled before trying them to add randomness (with the
+        given random.Random if there is one)?
+        :param stats: None or SolveStats: Counters to add the search's nodes, backtracks, and time to
+        :param budget: None or SolveBudget: The limits that stop the search early by raising BudgetExceededError
+        :return: None or List of Integer: The 81 values of the solved board row-wise, None if there is no solution
+        """
+        solutions = self._search(1, rand, True, stats, budget)
+        return solutions[0] if solutions else None
+
+    def count_solutions(self, limit=None, stats=None, budget=None):
+        """
+        Count the solutions to the board, stopping early once the limit is reached
+        :param limit: None or Integer: The number of solutions to stop counting at (None to count all of them)
+        :param stats: None or SolveStats: Counters to add the search's nodes, backtracks, and time to
+        :param budget: None or SolveBudget: The limits that stop the search early by raising BudgetExceededError
+        :return: Integer: The number of solutions found (at most limit)
+        """
+        return self._search(limit, False, False, stats, budget)
+
+    def _search(self, limit, rand, record, stats=None, budget=None):
+        """
+        Run Algorithm X on a fresh copy of the matrix with the board's values already chosen
+        :param limit: None or Integer: The number of solutions to stop at (None to find all of them)
+        :param rand: Boolean or Random: Should the options in each column be shuffled before trying them (with the
+        given random.Random if there is one)?
+        :param record: Boolean: Should the solutions be returned instead of just counted?
+        :param stats: None or SolveStats: Counters to add the search's nodes (options tried), backtracks, maximum
+        depth, and time to
+        :param budget: None or SolveBudget: The limits that stop the search early by raising BudgetExceededError
+        :return: List of (List of Integer) or Integer: The solutions found if record is True, otherwise the number
+        of solutions found
+        """
+        if rand:
+            import random  # Only imported when needed since most callers never shuffle
+            shuffle = rand.shuffle if isinstance(rand, random.Random) else random.shuffle
+        counting = stats is not None or budget is not None  # Only count when the stats or a budget needs it
+        if stats is not None:
+            start = time.perf_counter()
+        nodes = backtracks = max_depth = 0  # Counters for the stats and budget
+        exceeded = budget.check(0) if budget is not None else None  # Why the budget ran out, None while it has not
+        left, right, up, down, col_of, option_of, sizes = DLXSolver._get_base()
+        # Copy the lists that get changed by covering so the cached base is never modified:
+        left = left[:]
+        right = right[:]
+        up = up[:]
+        down = down[:]
+        sizes = sizes[:]
+
+        def cover(c):
+            # Remove column c from the header list and every row that uses it from the other columns:
+            right[left[c]] = right[c]
+            left[right[c]] = left[c]
+            i = down[c]
+            while i != c:
+                j = right[i]
+                while j != i:
+                    down[up[j]] = down[j]
+                    up[down[j]] = up[j]
+                    sizes[col_of[j]] -= 1
+                    j = right[j]
+                i = down[i]
+
+        def uncover(c):
+            # Undo cover(c) in exactly the reverse order:
+            i = up[c]
+            while i != c:
+                j = left[i]
+                while j != i:
+                    sizes[col_of[j]] += 1
+                    down[up[j]] = j
+                    up[down[j]] = j
+                    j = left[j]
+                i = up[i]
+            right[left[c]] = c
+            left[right[c]] = c
+
+        # Take the restricted option out of the matrix entirely so it can never be chosen:
+        if self._restrict_val and self._restrict_ind >= 0:
+            first = DLXSolver._first_node(self._restrict_ind * 9 + self._restrict_val - 1)
+            for j in range(first, first + 4):
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                sizes[col_of[j]] -= 1
+        # Choose the option for each value already on the board:
+        for ind, val in enumerate(self._cells):
+            if val:
+                first = DLXSolver._first_node(ind * 9 + val - 1)
+                # If one of its constraints is already covered, two values on the board conflict:
+                if any(left[right[col_of[j]]] != col_of[j] for j in range(first, first + 4)):
+                    if stats is not None:
+                        stats.add_phase_time(SolveStats.DLX_PHASE, time.perf_counter() - start)
+                    return [] if record else 0
+                for j in range(first, first + 4):
+                    cover(col_of[j])
+
+        solutions = []
+        count = 0
+        stack = []  # Stack of [column, list of row nodes in that column, index of the row being tried]
+        while exceeded is None:
+            if right[0] == 0:
+                # Every constraint is covered, so the chosen options make a solution:
+                count += 1
+                if record:
+                    solution = list(self._cells)
+                    for c, rows, k in stack:
+                        option = option_of[rows[k]]
+                        solution[option // 9] = option % 9 + 1
+                    solutions.append(solution)
+                if limit is not None and count >= limit:
+                    break
+            else:
+                # Choose the uncovered column with the fewest rows:
+                c = right[0]
+                best = c
+                best_size = sizes[c]
+                while c != 0 and best_size > 1:
+                    if sizes[c] < best_size:
+                        best = c
+                        best_size = sizes[c]
+                    c = right[c]
+                if best_size > 0:
+                    cover(best)
+                    rows = []
+                    i = down[best]
+                    while i != best:
+                        rows.append(i)
+                        i = down[i]
+                    if rand:
+                        shuffle(rows)
+                    # Choose the first row and cover the rest of its columns:
+                    stack.append([best, rows, 0])
+                    if counting:
+                        nodes += 1
+                        max_depth = max(max_depth, len(stack))
+                        if budget is not None:
+                            exceeded = budget.check(nodes)
+                    j = right[rows[0]]
+                    while j != rows[0]:
+                        cover(col_of[j])
+                        j = right[j]
+                    continue
+            # Backtrack to the most recent column that still has rows left to try:
+            while stack:
+                frame = stack[-1]
+                c, rows, k = frame
+                # Uncover the columns of the row that was being tried:
+                j = left[rows[k]]
+                while j != rows[k]:
+                    uncover(col_of[j])
+                    j = left[j]
+                k += 1
+                if k < len(rows):
+                    frame[2] = k
+                    if counting:
+                        nodes += 1
+                        if budget is not None:
+                            exceeded = budget.check(nodes)
+                    j = right[rows[k]]
+                    while j != rows[k]:
+                        cover(col_of[j])
+                        j = right[j]
+                    break
+                uncover(c)
+                stack.pop()
+                if counting:
+                    backtracks += 1
+            else:
+                break  # Every option has been tried
+        if stats is not None:
+            stats.add_search(nodes, backtracks, max_depth)
+            stats.add_phase_time(SolveStats.DLX_PHASE, time.perf_counter() - start)
+        if exceeded is not None:
+            raise BudgetExceededError(exceeded)
+        return solutions if record else count
+
+    @staticmethod
+    def _first_node(option):
+        """
+        Get the index of the first node of the given option (matrix row)
+        :param option: Integer: The option number (cell * 9 + (val - 1))
+        :return: Integer: The index of the option's first node
+        """
+        return DLXSolver._NUM_COLUMNS + 1 + option * 4
+
+    @staticmethod
+    def _get_base():
+        """
+        Get the linked lists of the full sudoku exact cover matrix, building them the first time they are needed
+        :return: Tuple of Lists: The left, right, up, down, column, option, and column size lists
+        """
+        if DLXSolver._base is None:
+            num_cols = DLXSolver._NUM_COLUMNS
+            # The headers start as a circular list linked left/right, with each column empty (linked to itself):
+            left = [num_cols] + list(range(num_cols))
+            right = list(range(1, num_cols + 1)) + [0]
+            up = list(range(num_cols + 1))
+            down = list(range(num_cols + 1))
+            col_of = list(range(num_cols + 1))
+            option_of = [-1] * (num_cols + 1)
+            sizes = [0] * (num_cols + 1)
+            for cell in range(81):
+                row = units.ROW_OF[cell]
+                col = units.COL_OF[cell]
+                box = units.BOX_OF[cell]
+                for val in range(9):
+                    option = cell * 9 + val
+                    first = len(col_of)
+                    for k, c in enumerate((1 + cell, 82 + row * 9 + val, 163 + col * 9 + val, 244 + box * 9 + val)):
+                        node = first + k
+                        # Link the node left/right in a circle with the other nodes of the option:
+                        left.append(first + (k - 1) % 4)
+                        right.append(first + (k + 1) % 4)
+                        # Link the node to the bottom of its column:
+                        up.append(up[c])
+                        down.append(c)
+                        down[up[c]] = node
+                        up[c] = node
+                        col_of.append(c)
+                        option_of.append(option)
+                        sizes[c] += 1
+            DLXSolver._base = (left, right, up, down, col_of, option_of, sizes)
+        return DLXSolver._base
@@ -1,6 +1,8 @@
 class Entry:
     """Represents and holds the value of a single cell on a sudoku board"""
 
+    __slots__ = ('_val',)  # Fixed attribute so each Entry stays small in memory
+
     def __init__(self, val=None):
         """
         Create an Entry object
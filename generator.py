@@ -0,0 +1,267 @@
+from board import Board
+from dlx import DLXSolver
+import constants
+import grader
+import masks
+import random
+import units
+
+# Generating puzzles by removing values from a solved board:
+# The cells are removed in orbits, the groups of cells a symmetry maps onto each other, so the empty cells of the
+# puzzle keep the symmetry. The orbit whose cells would have the fewest candidates is tried first, since those values
+# are the most likely to still be forced by the values left. A removal whose values are all still forced as naked or
+# hidden singles keeps the puzzle unique (and its grade) without any search, and for the others only the removed cells
+# are checked, by looking for a solution with a different value in each of them. For a grade, the puzzle is graded
+# again after each removal that could change it, and the first puzzle with the grade is kept.
+
+NO_SYMMETRY = "none"  # Any cell can be removed on its own
+ROTATIONAL_SYMMETRY = "rotational"  # Each cell is removed with the cell across the center (a half turn)
+QUARTER_SYMMETRY = "quarter"  # Each cell is removed with the 3 cells it is turned onto by quarter turns
+MIRROR_SYMMETRY = "mirror"  # Each cell is removed with the cell across the middle column
+DIAGONAL_SYMMETRY = "diagonal"  # Each cell is removed with the cell across the main diagonal
+
+SYMMETRIES = (NO_SYMMETRY, ROTATIONAL_SYMMETRY, QUARTER_SYMMETRY, MIRROR_SYMMETRY, DIAGONAL_SYMMETRY)
+
+
+def _make_orbits(image):
+    """
+    Group the cells into the orbits of a symmetry
+    :param image: Function: Takes the flat index of a cell and returns the flat index of the cell it is mapped onto
+    :return: Tuple of (Tuple of Integer): The cells of each orbit
+    """
+    orbits = []
+    seen = set()
+    for cell in range(81):
+        if cell not in seen:
+            orbit = [cell]
+            other = image(cell)
+            while other != cell:
+                orbit.append(other)
+                other = image(other)
+            seen.update(orbit)
+            orbits.append(tuple(orbit))
+    return tuple(orbits)
+
+
+# The orbits of each symmetry:
+_ORBITS = {
+    NO_SYMMETRY: tuple((cell,) for cell in range(81)),
+    ROTATIONAL_SYMMETRY: _make_orbits(lambda cell: 80 - cell),
+    QUARTER_SYMMETRY: _make_orbits(lambda cell: cell % 9 * 9 + 8 - cell // 9),
+    MIRROR_SYMMETRY: _make_orbits(lambda cell: cell - cell % 9 + 8 - cell % 9),
+    DIAGONAL_SYMMETRY: _make_orbits(lambda cell: cell % 9 * 9 + cell // 9),
+}
+
+
+class PuzzleGenerator:
+    """Generates puzzles with one solution, optionally with symmetric empty cells, minimal (no value, or no orbit of
+    values with a symmetry, can be removed without a second solution), or of a given grade. Two generators made with
+    the same seed generate the same puzzles."""
+
+    __slots__ = ('_symmetry', '_minimal', '_random')
+
+    def __init__(self, symmetry=NO_SYMMETRY, minimal=False, seed=None):
+        """
+        Create a PuzzleGenerator object
+        :param symmetry: String: The symmetry the empty cells should have (see SYMMETRIES)
+        :param minimal: Boolean: Should values be removed until none can be without a second solution, ignoring
+        max_remove? With a symmetry, each orbit is removed whole, so no orbit can be removed and it is kept.
+        :param seed: None or Integer: The seed of the random choices (None for different puzzles each run)
+        """
+        if symmetry not in _ORBITS:
+            raise ValueError("Unknown symmetry: " + str(symmetry))
+        self._symmetry = symmetry
+        self._minimal = minimal
+        self._random = random.Random(seed)  # Used for every random choice so the puzzles follow from the seed
+
+    def get_symmetry(self):
+        """
+        Get the symmetry of the empty cells
+        :return: String: One of SYMMETRIES
+        """
+        return self._symmetry
+
+    def is_minimal(self):
+        """
+        Check if the generator makes minimal puzzles
+        :return: Boolean: Are values (or orbits with a symmetry) removed until none can be?
+        """
+        return self._minimal
+
+    def generate(self, max_remove=81, grade=None, stats=None):
+        """
+        Generate a puzzle with one solution
+        :param max_remove: Integer: The maximum amount of numbers to remove from the board
+        :param grade: None or String: The grade the puzzle should have (one of constants.GRADES). The puzzle is graded
+        after each removal once at least constants.GRADE_MIN_REMOVE values were removed, and the first one with the
+        grade is kept (if it should be minimal, only the minimal puzzle is graded). A new solved board is tried each
+        time the removals run out without reaching the grade.
+        :param stats: None or SolveStats: Counters to add the nodes, backtracks, and time of the uniqueness checks to
+        :return: Board: The puzzle
+        """
+        if grade is None:
+            return self._remove(max_remove, None, 0, stats)
+        target = grader.get_grade_rank(grade)  # Make sure the grade is known before starting
+        min_remove = min(constants.GRADE_MIN_REMOVE[grade], max_remove)
+        for _ in range(constants.GRADE_ATTEMPTS):
+            b = self._remove(max_remove, target, min_remove, stats)
+            if b is not None:
+                return b
+        raise ValueError("Could not generate a board with grade: " + grade)
+
+    def _remove(self, max_remove, target, min_remove, stats):
+        """
+        Remove values from a new solved board for as long as it keeps one solution
+        :param max_remove: Integer: The maximum amount of numbers to remove from the board
+        :param target: None or Integer: The rank of the grade the board should have (None for any grade)
+        :param min_remove: Integer: The amount of numbers to remove before the grade is checked
+        :param stats: None or SolveStats: Counters to add the uniqueness checks to
+        :return: None or Board: The puzzle, None if it never had the grade
+        """
+        b = Board.get_solved_board(self._random)  # Get a solved board that follows from the seed
+        solution = b.snapshot()
+        cells = bytearray(solution)  # The values left on the board, with 0 for removed ones
+        used = [masks.ALL_VALUES] * 27  # Mask of the values left in each unit (see units.UNIT_CELLS)
+        limit = 81 if self._minimal else max_remove
+        removed = 0  # Counter of how many were removed
+        rank = 0  # The rank of the grade of the board, None if it has to be worked out again (a solved board is easy)
+        pending = list(_ORBITS[self._symmetry])
+        self._random.shuffle(pending)  # Shuffle so ties between orbits are broken at random
+        while pending and removed < limit:
+            # Try the most promising orbit next, moving the last one into its place:
+            k = min(range(len(pending)), key=lambda i: _count_candidates(cells, used, pending[i]))
+            orbit = pending[k]
+            pending[k] = pending[-1]
+            pending.pop()
+            if removed + len(orbit) > limit:
+                continue
+            for ind in orbit:
+                _set_cell(cells, used, ind, 0)
+            changed = self._check(cells, used, orbit, solution, stats)
+            # If there is still only one solution, keep the orbit removed:
+            if changed is not None:
+                removed += len(orbit)
+                if changed:
+                    rank = None
+                # Removals go on past the grade, since later ones can still change it, until a board has it:
+                if target is not None and not self._minimal and removed >= min_remove:
+                    if rank is None:
+                        rank = _get_rank(b, cells)
+                    if rank == target:
+                        break
+            # Otherwise, put the values back:
+            else:
+                for ind in orbit:
+                    _set_cell(cells, used, ind, solution[ind])
+        if target is not None:
+            if rank is None:
+                rank = _get_rank(b, cells)  # Only a minimal board gets here without being graded
+            if removed < min_remove or rank != target:
+                return None
+        b.restore(bytes(cells))
+        return b
+
+    @staticmethod
+    def _check(cells, used, orbit, solution, stats):
+        """
+        Check if a board still has one solution after an orbit was removed
+        :param cells: Bytearray: The values left, with the orbit removed (left the same once this returns)
+        :param used: List of Integer: The mask of the values left in each unit (left the same once this returns)
+        :param orbit: Tuple of Integer: The flat indexes of the removed cells
+        :param solution: Bytes: The values of the solved board
+        :param stats: None or SolveStats: Counters to add the searches for another solution to
+        :return: None or Boolean: None if the board has another solution, otherwise could its grade have changed
+        (False if every removed value is still forced as a single)?
+        """
+        # Put back the values that are still forced by the values left, since only the others could change:
+        forced = []
+        unsure = list(orbit)
+        placed = True
+        while unsure and placed:
+            placed = False
+            for ind in unsure:
+                if _is_forced(cells, used, ind, solution[ind]):
+                    _set_cell(cells, used, ind, solution[ind])
+                    forced.append(ind)
+                    unsure.remove(ind)
+                    placed = True
+                    break
+        # Singles lead back to the board from before, so its grade is unchanged. Otherwise, any other solution has a
+        # different value in one of the unsure cells, so look for one in each:
+        changed = bool(unsure)
+        for ind in unsure:
+            if DLXSolver(cells, solution[ind], ind).solve(False, stats) is not None:
+                changed = None
+                break
+        for ind in forced:
+            _set_cell(cells, used, ind, 0)
+        return changed
+
+
+def _get_rank(b, cells):
+    """
+    Grade the values left
+    :param b: Board: A board to grade with (its values are replaced)
+    :param cells: Bytearray: The values left
+    :return: Integer: The rank of the grade (see grader.Grade.get_rank)
+    """
+    b.restore(bytes(cells))
+    return grader.grade_board(b).get_rank()
+
+
+def _set_cell(cells, used, ind, val):
+    """
+    Put a value in a cell or empty it, keeping the unit masks up to date
+    :param cells: Bytearray: The values left
+    :param used: List of Integer: The mask of the values left in each unit
+    :param ind: Integer: The flat index of the cell
+    :param val: Integer: The value to put in, or 0 to empty the cell
+    :return: None
+    """
+    bit = masks.VALUE_BITS[val or cells[ind]]
+    for unit in units.UNITS_OF[ind]:
+        used[unit] ^= bit
+    cells[ind] = val
+
+
+def _get_candidates(used, ind):
+    """
+    Get the values that could go in a cell, ignoring the cell's own value
+    :param used: List of Integer: The mask of the values left in each unit
+    :param ind: Integer: The flat index of the cell
+    :return: Integer: A bitmask of the values missing from the cell's row, col, and box
+    """
+    row, col, box = units.UNITS_OF[ind]
+    return masks.ALL_VALUES & ~(used[row] | used[col] | used[box])
+
+
+def _count_candidates(cells, used, orbit):
+    """
+    Count the candidates the cells of an orbit would have if they were removed
+    :param cells: Bytearray: The values left
+    :param used: List of Integer: The mask of the values left in each unit
+    :param orbit: Tuple of Integer: The flat indexes of the cells
+    :return: Integer: The total number of candidates (lower means the values are more likely forced)
+    """
+    return sum(masks.MASK_COUNTS[_get_candidates(used, ind) | masks.VALUE_BITS[cells[ind]]] for ind in orbit)
+
+
+def _is_forced(cells, used, ind, val):
+    """
+    Check if the value of an empty cell is forced by the values left, as a naked or hidden single
+    :param cells: Bytearray: The values left
+    :param used: List of Integer: The mask of the values left in each unit
+    :param ind: Integer: The flat index of the empty cell
+    :param val: Integer: The value of the cell in the solution
+    :return: Boolean: Is the value the only candidate of the cell, or the only place for it in a unit?
+    """
+    bit = masks.VALUE_BITS[val]
+    if _get_candidates(used, ind) == bit:
+        return True
+    for unit in units.UNITS_OF[ind]:
+        for other in units.UNIT_CELLS[unit]:
+            if other != ind and not cells[other] and _get_candidates(used, other) & bit:
+                break
+        else:
+            return True
+    return False
@@ -0,0 +1,127 @@
+from board import Board
+from deductions import DeductionPipeline
+from solve_stats import SolveStats
+import constants
+import deductions
+import math
+
+# Grading puzzles by how a person would solve them:
+# The deduction pipeline is run with every technique, and the hardest technique that removed any candidates decides
+# the grade, since the pipeline only moves on to a harder technique once the easier ones are stuck. If the techniques
+# cannot finish the board, it needs guessing, and the search nodes needed to finish it tell how much.
+
+# The grade that each technique makes a puzzle:
+_TECHNIQUE_GRADES = {
+    deductions.POINTING: constants.MEDIUM_GRADE,
+    deductions.CLAIMING: constants.MEDIUM_GRADE,
+    deductions.NAKED_PAIRS: constants.MEDIUM_GRADE,
+    deductions.HIDDEN_PAIRS: constants.MEDIUM_GRADE,
+    deductions.NAKED_TRIPLES: constants.HARD_GRADE,
+    deductions.HIDDEN_TRIPLES: constants.HARD_GRADE,
+    deductions.X_WING: constants.HARD_GRADE,
+    deductions.SWORDFISH: constants.HARD_GRADE,
+}
+
+_PIPELINE = DeductionPipeline()  # Pipeline with every technique, shared since it keeps no state between runs
+
+
+class Grade:
+    """Represents how hard a puzzle is to solve"""
+
+    __slots__ = ('_level', '_hardest', '_nodes', '_solutions')
+
+    def __init__(self, level, hardest, nodes, solutions):
+        """
+        Create a Grade object
+        :param level: String: The grade (one of constants.GRADES)
+        :param hardest: None or String: The hardest deduction technique needed (None if singles were enough)
+        :param nodes: Integer: The search nodes needed after the techniques got stuck (0 if no search was needed)
+        :param solutions: Integer: The number of solutions found (stopping at 2)
+        """
+        self._level = level
+        self._hardest = hardest
+        self._nodes = nodes
+        self._solutions = solutions
+
+    def get_level(self):
+        """
+        Get the grade of the puzzle
+        :return: String: One of constants.GRADES
+        """
+        return self._level
+
+    def get_hardest_technique(self):
+        """
+        Get the hardest deduction technique the puzzle needed
+        :return: None or String: The technique (see deductions.TECHNIQUES), None if singles were enough
+        """
+        return self._hardest
+
+    def get_nodes(self):
+        """
+        Get the amount of search the puzzle needed after the techniques got stuck
+        :return: Integer: The search nodes, 0 if the techniques solved it
+        """
+        return self._nodes
+
+    def is_unique(self):
+        """
+        Check if the puzzle has exactly one solution
+        :return: Boolean: Was exactly one solution found?
+        """
+        return self._solutions == 1
+
+    def get_score(self):
+        """
+        Get a number that orders puzzles from easiest to hardest, even within a grade
+        :return: Float: 0 for singles, 1-8 for the hardest technique needed, and above 9 (growing with the log of the
+        nodes) if search was needed
+        """
+        score = deductions.TECHNIQUES.index(self._hardest) + 1 if self._hardest else 0
+        if self._level == constants.EXPERT_GRADE:
+            score = len(deductions.TECHNIQUES) + 1 + math.log2(self._nodes + 1)
+        return score
+
+    def get_rank(self):
+        """
+        Get the position of the grade in constants.GRADES so grades can be compared
+        :return: Integer: 0 for easy up to 3 for expert
+        """
+        return constants.GRADES.index(self._level)
+
+
+def grade_board(board):
+    """
+    Grade a puzzle by the hardest technique and the amount of search needed to solve it
+    :param board: Board: The puzzle to grade (it is not changed)
+    :return: Grade: The grade of the puzzle
+    """
+    cells = list(board.snapshot())
+    stats = SolveStats()
+    for ind, val in _PIPELINE.run(cells, stats=stats):
+        cells[ind] = val
+    hardest = None
+    for technique in deductions.TECHNIQUES:
+        if stats.get_eliminations(technique):
+            hardest = technique
+    level = _TECHNIQUE_GRADES[hardest] if hardest else constants.EASY_GRADE
+    if all(cells):
+        # The techniques only place values that are forced, so a board they finish has one solution:
+        return Grade(level, hardest, 0, 1)
+    # Finish with the search, counting the nodes it needs and checking for a second solution:
+    b = Board()
+    b.restore(bytes(cells))
+    search_stats = SolveStats()
+    solutions = b.count_solutions(2, stats=search_stats)
+    return Grade(constants.EXPERT_GRADE, hardest, search_stats.get_nodes(), solutions)
+
+
+def get_grade_rank(level):
+    """
+    Get the position of a grade in constants.GRADES so grades can be compared
+    :param level: String: The grade
+    :return: Integer: 0 for easy up to 3 for expert
+    """
+    if level not in constants.GRADES:
+        raise ValueError("Unknown grade: " + str(level))
+    return constants.GRADES.index(level)
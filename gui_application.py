@@ -4,6 +4,8 @@ import constants
 from gui_board import GUIBoard
 from board import Board
 from gui_state import GUIState
+from puzzle_reservoir import PuzzleReservoir
+from solve_budget import BudgetExceededError
 
 
 class GUIApplication:
@@ -13,6 +15,7 @@ class GUIApplication:
         """Initialize a GUIApplication object with Tkinter attributes"""
         self._gs = None  # To store a GUIState
         self._gui_board = None  # To store a GUIBoard
+        self._reservoir = None  # To store the PuzzleReservoir that generates boards in the background
         # To store tkinter Buttons:
         self._solve_button = None
         self._generate_easy_button = None
@@ -26,6 +29,11 @@ class GUIApplication:
         Run the GUI application
         :return: None
         """
+        # Start generating boards for each difficulty in the background before the window is created, so the
+        # worker processes do not inherit it:
+        self._reservoir = PuzzleReservoir()
+        self._reservoir.start()
+
         # Create top window and title it:
         top = tk.Tk()
         top.wm_title("Pydoku!")
@@ -54,7 +62,7 @@ class GUIApplication:
         top.bind('<Key>', self._key_handler)
 
         # Initial GUIBoard creation:
-        self._gui_board = GUIBoard(top, Board(), None, bg="white",
+        self._gui_board = GUIBoard(top, Board(), None, self._reservoir, bg="white",
                                    height=constants.BOARD_HEIGHT, width=constants.BOARD_WIDTH)
         self._gui_board.render_empty_board()
 
@@ -62,8 +70,11 @@ class GUIApplication:
         self._solve_button.pack()
         self._pack_generate_buttons()
 
-        # Start the Tkinter loop:
-        top.mainloop()
+        # Start the Tkinter loop and stop the background generation once the window is closed:
+        try:
+            top.mainloop()
+        finally:
+            self._reservoir.shutdown()
 
     def _generate_command(self, max_remove=81):
         """
@@ -111,19 +122,23 @@ class GUIApplication:
         """
         # Try to solve the board:
         try:
-            # Attempt to solve board:
-            self._gui_board.solve_board()
+            # Attempt to solve board, showing the values the solver tries:
+            self._gui_board.solve_board(animate=True)
             # Set gs to display state:
             self._gs = GUIState.DISPLAY_BOARD
             # Hide unnecessary button:
             self._generate_solution_button.pack_forget()
-            # Remove the pointer and render the values:
+            # Remove the pointer and render the values (the animation renders them once it is done):
             self._gui_board.remove_pointer()
-            self._gui_board.render_values()
+            if not self._gui_board.is_animating():
+                self._gui_board.render_values()
         # If the board is unsolvable:
         except ValueError:
             # Display message box showing the error and tell user to retry:
             messagebox.showerror("ERROR", "Given board is not solvable.\nCheck board and try again.")
+        # If the board took too long to solve (it is put back the way it was):
+        except BudgetExceededError:
+            messagebox.showerror("ERROR", "Given board took too long to solve.\nCheck board and try again.")
 
     def _main_menu_command(self):
         """
@@ -136,8 +151,9 @@ class GUIApplication:
         self._gui_board.pack_forget()
         self._main_menu_button.pack_forget()
         self._generate_solution_button.pack_forget()
-        # Remove the pointer:
+        # Remove the pointer and stop the solving animation:
         self._gui_board.remove_pointer()
+        self._gui_board.stop_animation()
         # Pack necessary buttons to window:
         self._solve_button.pack()
         self._pack_generate_buttons()
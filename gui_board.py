@@ -7,17 +7,20 @@ from board import Board
 class GUIBoard(tk.Canvas):
     """Represents a tkinter canvas with specialized methods to draw a board"""
 
-    def __init__(self, master, board, pointer, **kwargs):
+    def __init__(self, master, board, pointer, reservoir=None, **kwargs):
         """
         Initialize a GUIBoard object
         :param master: Tk: The window to put the Canvas on
         :param board: Board: A board object to represent the current board to be drawn
         :param pointer: Position or None: Point on the board to be highlighted yellow to enter numbers
+        :param reservoir: PuzzleReservoir or None: Reservoir to take generated boards from instead of generating them
         :param kwargs: Additional tk.Canvas arguments
         """
         super().__init__(master, **kwargs)  # Call the tk.Canvas constructor with its necessary arguments
         self._board = board  # Set the board
         self._pointer = pointer  # Set the pointer
+        self._reservoir = reservoir  # Set the reservoir
+        self._animation = None  # Id of the scheduled next frame of the solving animation, None if not animating
 
     def render_empty_board(self):
         """
@@ -83,21 +86,92 @@ class GUIBoard(tk.Canvas):
         :param max_remove: Integer: The maximum amount of numbers to remove from the board
         :return: None
         """
-        self._board = Board.generate_board(max_remove=max_remove)  # Set the board attribute to the generated board
+        self.stop_animation()
+        # Set the board attribute to a generated board, taking a ready one from the reservoir if there is one:
+        if self._reservoir:
+            self._board = self._reservoir.get(max_remove)
+        else:
+            self._board = Board.generate_board(max_remove=max_remove)
 
-    def solve_board(self):
+    def solve_board(self, animate=False):
         """
         Attempt to solve the board associated with the board attribute
+        :param animate: Boolean: Should the values the solver tries be shown one after another once it is done?
         :return: None
         """
-        # Solve the board stored in the board attribute and revert if it can't be solved:
-        self._board.solve(revert_if_unsolvable=True)
+        moves = []  # List of (flat index, value) for each change the solver made, with 0 for a removed value
+        if animate:
+            # Record the changes through the solver hooks, which cost nothing when they are not registered:
+            def assigned(ind, val, depth):
+                moves.append((ind, val))
+
+            def removed(ind, val):
+                moves.append((ind, 0))
+            start = self._board.snapshot()
+            self._board.add_hook(constants.CELL_ASSIGNED_EVENT, assigned)
+            self._board.add_hook(constants.VALUE_REMOVED_EVENT, removed)
+        try:
+            # Solve the board stored in the board attribute and revert if it can't be solved in time:
+            self._board.solve(revert_if_unsolvable=True, timeout=constants.SOLVE_TIMEOUT)
+        finally:
+            if animate:
+                self._board.remove_hook(constants.CELL_ASSIGNED_EVENT, assigned)
+                self._board.remove_hook(constants.VALUE_REMOVED_EVENT, removed)
+        if moves:
+            self._play_moves(start, bytearray(start), moves)
+
+    def is_animating(self):
+        """
+        Check if the solving animation is playing
+        :return: Boolean: Is there another frame of the animation to draw?
+        """
+        return self._animation is not None
+
+    def stop_animation(self):
+        """
+        Stop the solving animation if it is playing and remove what it drew
+        :return: None
+        """
+        if self._animation is not None:
+            self.after_cancel(self._animation)
+            self._animation = None
+        self.delete(constants.ANIMATION_TAG)
+
+    def _play_moves(self, given, cells, moves, first=0):
+        """
+        Draw the next frame of the solving animation and schedule the one after it
+        :param given: Bytes: The values on the board before it was solved, row-wise with 0 for empty cells
+        :param cells: Bytearray: The values shown so far, row-wise with 0 for empty cells
+        :param moves: List of (Integer, Integer): The flat index and value (0 if removed) of each change
+        :param first: Integer: The index of the first move of this frame
+        :return: None
+        """
+        step = max(1, len(moves) // constants.ANIMATION_FRAMES)  # Moves applied each frame
+        for ind, val in moves[first:first + step]:
+            cells[ind] = val
+        self._animation = None
+        if first + step >= len(moves):
+            # Done, so show the solved board the usual way:
+            self.delete(constants.ANIMATION_TAG)
+            self.render_values()
+            return
+        # Draw the values shown so far in the same places as render_values, with the solver's values in blue:
+        self.delete(constants.VALUE_TAG)
+        self.delete(constants.ANIMATION_TAG)
+        for ind, val in enumerate(cells):
+            if val:
+                x = constants.BOARD_WIDTH // 18 + ind % 9 * (constants.BOARD_WIDTH // 9)
+                y = constants.BOARD_HEIGHT // 18 + ind // 9 * (constants.BOARD_HEIGHT // 9)
+                self.create_text(x, y, text=str(val), fill="black" if given[ind] else "blue", font="Arial 35",
+                                 tag=constants.ANIMATION_TAG)
+        self._animation = self.after(constants.ANIMATION_DELAY, self._play_moves, given, cells, moves, first + step)
 
     def reset_board(self):
         """
         Reset the board associated with the board attribute to have no values
         :return: None
         """
+        self.stop_animation()
         self._board = Board()  # Set board to new Board object
 
     def set_pointer_val(self, val):
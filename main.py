@@ -2,5 +2,6 @@ from gui_application import GUIApplication
 # Run this module to run the application
 
 
-gui_app = GUIApplication()  # Create a new GUIApplication
-gui_app.run()  # Run the GUIApplication
+if __name__ == "__main__":
+    gui_app = GUIApplication()  # Create a new GUIApplication
+    gui_app.run()  # Run the GUIApplication
@@ -0,0 +1,17 @@
+# Bitmask helpers shared by the board and the solvers:
+# A set of sudoku values is stored as a 9-bit integer where bit (val - 1) is set if val is in the set
+
+ALL_VALUES = 0x1FF  # Mask with every value from 1 to 9 set
+
+# VALUE_BITS[val] is the bit that represents val (index 0 is unused and stays 0 so empty cells add nothing):
+VALUE_BITS = [0] + [1 << (val - 1) for val in range(1, 10)]
+
+# MASK_VALUES[mask] is a tuple of the values in the mask, in increasing order. Each mask's tuple is built from the
+# tuple of the mask without its lowest bit, which is always built first, by putting the lowest value at the front:
+MASK_VALUES = [()]
+for _mask in range(1, ALL_VALUES + 1):
+    MASK_VALUES.append(((_mask & -_mask).bit_length(),) + MASK_VALUES[_mask & (_mask - 1)])
+del _mask
+
+# MASK_COUNTS[mask] is the number of values in the mask:
+MASK_COUNTS = [len(vals) for vals in MASK_VALUES]
@@ -1,9 +1,8 @@
-import random
-
-
 class Position:
     """Represents the position of a cell on a sudoku board"""
 
+    __slots__ = ('_row', '_col')  # Fixed attributes so the many Position objects made stay small and fast
+
     def __init__(self, row, col):
         """
         Initialize a position object for position (row, col)
@@ -28,6 +27,13 @@ class Position:
         """
         return self._col  # Return the column value
 
+    def get_index(self):
+        """
+        Get the flat index of the position on the board
+        :return: Integer: The index of the cell when the board is numbered row-wise from 0 to 80 (row * 9 + col)
+        """
+        return self._row * 9 + self._col  # Return the flat index
+
     def set_row(self, val):
         """
         Set the value of the row index
@@ -114,25 +120,31 @@ class Position:
         for i in range(9):
             for j in range(9):
                 posns.append(Position(i, j))
-        # Shuffle to randomize and return list:
+        # Shuffle to randomize and return list (random is only imported here since nothing else needs it):
+        import random
         random.shuffle(posns)
         return posns
 
     def __eq__(self, other):
         """
         Check if two positions, self and other, are equal to each other
-        :param other: Position or None: The position being compared to self
-        :return: Boolean: Do the two positions have the same row and col value? (if other is None return False)
+        :param other: Any: The object being compared to self
+        :return: Boolean or NotImplemented: Do the two positions have the same row and col value? (NotImplemented if
+        other is not a Position, so Python compares them by identity and they are never equal)
         """
-        # If being compared to None, they cannot be equal
-        if other is None:
-            return False
-        # If Position being compared to something that isn't a Position (other than None), raise error
+        # Positions can be keys next to other types, so anything else is just not equal instead of an error:
         if not isinstance(other, Position):
-            raise TypeError("Position can only compared to another Position")
+            return NotImplemented
         # Check and return if row and col values are both equal to each other
         return self._row == other._row and self._col == other._col
 
+    def __hash__(self):
+        """
+        Hash the position so it can be used in sets and as a dictionary key (it must not be moved while it is one)
+        :return: Integer: The flat index of the position, which is the same for equal positions
+        """
+        return self._row * 9 + self._col
+
     def __str__(self):
         """
         Convert the position to a string
@@ -0,0 +1,66 @@
+from board import Board
+from contextlib import nullcontext
+import os
+
+
+# Reading and writing puzzle files in the common one-puzzle-per-line format:
+# Each line starts with the 81 values of a board row-wise with '0' or '.' for empty cells. Anything after the first
+# 81 characters of a line (like a solution or a rating) is ignored, as are blank lines and lines starting with '#'.
+# A shorter line is passed on as it is, so it fails on its own when it is made into a board (like a line with a bad
+# digit) instead of ending the stream.
+# Files are read and written one line at a time, so files of any size can be streamed in constant memory.
+
+
+def read_puzzle_strings(source):
+    """
+    Read the puzzles from a puzzle file one at a time as strings
+    :param source: String, PathLike, or file object: The path of the file or an open text file to read from
+    :return: Generator of String: The first 81 characters of each puzzle in the file, in order (or the whole line if
+    it is shorter, which Board.from_string rejects)
+    """
+    with _open(source, "r") as f:
+        for line in f:
+            line = line.strip()
+            # Skip blank lines and comments:
+            if not line or line[0] == "#":
+                continue
+            yield line[:81]
+
+
+def read_puzzles(source):
+    """
+    Read the puzzles from a puzzle file one at a time as boards
+    :param source: String, PathLike, or file object: The path of the file or an open text file to read from
+    :return: Generator of Board: The board for each puzzle in the file, in order (raises ValueError at the first
+    line that is not a valid board, so use read_puzzle_strings to carry on past them)
+    """
+    for puzzle in read_puzzle_strings(source):
+        yield Board.from_string(puzzle)
+
+
+def write_puzzles(dest, puzzles, blank="0"):
+    """
+    Write puzzles to a puzzle file one line at a time
+    :param dest: String, PathLike, or file object: The path of the file or an open text file to write to
+    :param puzzles: Iterable of (Board or String): The boards (or 81 character strings) to write
+    :param blank: String: The character to use for empty cells of boards ('0' or '.')
+    :return: Integer: The number of puzzles written
+    """
+    count = 0
+    with _open(dest, "w") as f:
+        for puzzle in puzzles:
+            f.write((puzzle if isinstance(puzzle, str) else puzzle.to_string(blank)) + "\n")
+            count += 1
+    return count
+
+
+def _open(file, mode):
+    """
+    Open a file from its path, or wrap an already open file so that it is not closed after being used
+    :param file: String, PathLike, or file object: The path of the file or an open text file
+    :param mode: String: The mode to open a path with ('r' or 'w')
+    :return: Context manager giving the file object
+    """
+    if isinstance(file, (str, os.PathLike)):
+        return open(file, mode)
+    return nullcontext(file)
@@ -0,0 +1,144 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import deque
+from board import Board
+import constants
+import logging
+import threading
+
+_LOGGER = logging.getLogger(__name__)
+MAX_RESTARTS = 3  # Times the pool is started again after a worker process dies before generating in get instead
+
+
+class PuzzleReservoir:
+    """Keeps a reservoir of generated puzzles for each difficulty that worker processes refill in the background"""
+
+    def __init__(self, high_water=4, workers=None,
+                 difficulties=(constants.EASY_REMOVE, constants.MEDIUM_REMOVE, constants.HARD_REMOVE)):
+        """
+        Create a PuzzleReservoir object (call start to begin generating puzzles)
+        :param high_water: Integer: The number of puzzles to keep ready (or being generated) for each difficulty
+        :param workers: None or Integer: The number of worker processes (None for one per CPU)
+        :param difficulties: Tuple of Integer: The max_remove values of the difficulties to keep puzzles for
+        """
+        self._high_water = high_water
+        self._workers = workers
+        self._puzzles = {d: deque() for d in difficulties}  # Ready puzzles (as 81 characters) for each difficulty
+        self._pending = {d: 0 for d in difficulties}  # Number of puzzles being generated for each difficulty
+        # Lock for the puzzles and pending counts, which worker callbacks also change (reentrant since a callback runs
+        # right away in the submitting thread if its job is already done):
+        self._lock = threading.RLock()
+        self._executor = None  # The pool of worker processes while the reservoir is running
+        self._restarts = 0  # Number of times the pool was started again after a worker process died
+
+    def start(self):
+        """
+        Start the worker processes and begin filling the reservoir for each difficulty
+        :return: None
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers)
+            for max_remove in self._puzzles:
+                self._refill(max_remove)
+
+    def shutdown(self):
+        """
+        Stop the worker processes, dropping any puzzles that are still being generated
+        :return: None
+        """
+        if self._executor is not None:
+            executor = self._executor
+            self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get(self, max_remove=constants.HARD_REMOVE):
+        """
+        Get a generated puzzle, taking a ready one from the reservoir if there is one, or generating one right away if
+        the reservoir for that difficulty is empty
+        :param max_remove: Integer: The maximum amount of numbers removed from the board (the difficulty)
+        :return: Board: An unsolved sudoku board with one unique solution
+        """
+        puzzle = None
+        with self._lock:
+            if self._puzzles.get(max_remove):
+                puzzle = self._puzzles[max_remove].popleft()
+        # Start generating a replacement in the background:
+        if max_remove in self._puzzles:
+            self._refill(max_remove)
+        if puzzle is None:
+            return Board.generate_board(max_remove)
+        return Board.from_string(puzzle)
+
+    def size(self, max_remove):
+        """
+        Get the number of ready puzzles in the reservoir for a difficulty
+        :param max_remove: Integer: The maximum amount of numbers removed from the board (the difficulty)
+        :return: Integer: The number of puzzles that can be taken without generating one
+        """
+        with self._lock:
+            return len(self._puzzles.get(max_remove, ()))
+
+    def _refill(self, max_remove):
+        """
+        Send generation jobs to the workers until the ready and pending puzzles for a difficulty reach the high-water
+        mark
+        :param max_remove: Integer: The maximum amount of numbers removed from the board (the difficulty)
+        :return: None
+        """
+        with self._lock:
+            if self._executor is None:
+                return
+            while len(self._puzzles[max_remove]) + self._pending[max_remove] < self._high_water:
+                try:
+                    future = self._executor.submit(_generate_puzzle, max_remove)
+                except BrokenProcessPool:
+                    if not self._restart():
+                        return
+                    continue
+                self._pending[max_remove] += 1
+                future.add_done_callback(lambda f, d=max_remove: self._add(d, f))
+
+    def _restart(self):
+        """
+        Replace the pool after a worker process died, which breaks it (the jobs that were in it are dropped). After
+        MAX_RESTARTS, the reservoir stops and get generates each puzzle in the calling process instead.
+        :return: Boolean: Was a new pool started?
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._restarts += 1
+        if self._restarts > MAX_RESTARTS:
+            _LOGGER.warning("Puzzle worker processes keep dying, so puzzles are generated when they are needed")
+            self._executor = None
+            return False
+        _LOGGER.warning("A puzzle worker process died, so the pool was started again")
+        self._executor = ProcessPoolExecutor(max_workers=self._workers)
+        return True
+
+    def _add(self, max_remove, future):
+        """
+        Add a finished puzzle to the reservoir (called when a worker finishes a generation job)
+        :param max_remove: Integer: The maximum amount of numbers removed from the board (the difficulty)
+        :param future: Future: The finished generation job
+        :return: None
+        """
+        broken = False  # Did the job fail because a worker process died?
+        with self._lock:
+            self._pending[max_remove] -= 1
+            if not future.cancelled():
+                if future.exception() is None:
+                    self._puzzles[max_remove].append(future.result())
+                else:
+                    broken = isinstance(future.exception(), BrokenProcessPool)
+        if broken:
+            # Refill right away so the difficulty is not left empty until the next get. It is done in another thread
+            # since this can run in the thread of the broken pool, which starting the pool again shuts down:
+            threading.Thread(target=self._refill, args=(max_remove,), daemon=True).start()
+
+
+def _generate_puzzle(max_remove):
+    """
+    Generate a puzzle in a worker process
+    :param max_remove: Integer: The maximum amount of numbers to remove from the board
+    :return: String: The generated puzzle as 81 characters
+    """
+    return Board.generate_board(max_remove).to_string()
@@ -0,0 +1,326 @@
+import argparse
+import constants
+import sys
+# Run this module (python -m pydoku) to use the command line interface, which works without a display:
+#   solve:    solve the puzzles read from files or stdin and write each solution on its own line
+#   count:    write the number of solutions (up to --limit) of each puzzle
+#   grade:    write the grade (see grader.py) and difficulty score of each puzzle
+#   generate: write newly generated puzzles
+#   variants: write transformed copies of the puzzles read, which keep their one solution (see transforms.py)
+#   canonical: write the canonical form of each puzzle, or drop puzzles that repeat one up to symmetry (see
+#              canonical.py)
+#   bench:    solve the puzzles and report how long it took, or run the benchmark suite (see benchmark.py)
+# Puzzles are read and written one per line as 81 characters with '0' or '.' for empty cells (see puzzle_io.py).
+# Only the modules a command needs are imported, and tkinter never is.
+
+# Names of the difficulties that can be given to generate and their max entries to remove:
+DIFFICULTIES = {"easy": constants.EASY_REMOVE, "medium": constants.MEDIUM_REMOVE, "hard": constants.HARD_REMOVE}
+
+
+def main(argv=None):
+    """
+    Run the command line interface
+    :param argv: None or List of String: The arguments to parse (None to use sys.argv)
+    :return: Integer: The exit status (0 if every puzzle was handled, 1 if any failed, 2 if the input could not be
+    read)
+    """
+    args = _make_parser().parse_args(argv)
+    try:
+        return args.command(args)
+    except BrokenPipeError:
+        # The reader of stdout went away (like when piping into head), so stop quietly:
+        sys.stdout = None
+        return 1
+    except (OSError, ValueError) as e:
+        # A file could not be read, or an argument is not valid:
+        sys.stderr.write("pydoku: " + str(e) + "\n")
+        return 2
+
+
+def _make_parser():
+    """
+    Make the parser for the command line arguments
+    :return: ArgumentParser: The parser with a subcommand for each command
+    """
+    parser = argparse.ArgumentParser(prog="pydoku", description="Solve, count, generate, and benchmark sudoku puzzles")
+    subparsers = parser.add_subparsers(required=True, metavar="command")
+
+    solve_parser = subparsers.add_parser("solve", help="solve puzzles")
+    _add_input_args(solve_parser)
+    solve_parser.add_argument("--blank", default="0", choices=("0", "."), help="character for empty cells")
+    solve_parser.add_argument("--max-nodes", type=int, help="give up on a puzzle after trying this many values")
+    solve_parser.add_argument("--timeout", type=float, help="give up on a puzzle after this many seconds")
+    solve_parser.set_defaults(command=_solve_command)
+
+    count_parser = subparsers.add_parser("count", help="count the solutions of puzzles")
+    _add_input_args(count_parser)
+    count_parser.add_argument("--limit", type=int, default=2, help="number of solutions to stop counting at")
+    count_parser.set_defaults(command=_count_command)
+
+    grade_parser = subparsers.add_parser("grade", help="grade puzzles by the hardest technique they need")
+    grade_parser.add_argument("files", nargs="*", help="puzzle files to read ('-' or none for stdin)")
+    grade_parser.set_defaults(command=_grade_command)
+
+    generate_parser = subparsers.add_parser("generate", help="generate puzzles with one solution")
+    generate_parser.add_argument("-n", "--count", type=int, default=1, help="number of puzzles to generate")
+    generate_parser.add_argument("--difficulty", default="hard", choices=tuple(DIFFICULTIES),
+                                 help="difficulty of the puzzles")
+    generate_parser.add_argument("--max-remove", type=int, help="maximum values to remove (overrides --difficulty)")
+    generate_parser.add_argument("--grade", choices=constants.GRADES,
+                                 help="grade of the puzzles instead of --difficulty (fails if it cannot be reached "
+                                      "within --max-remove)")
+    generate_parser.add_argument("--symmetry", default="none",
+                                 choices=("none", "rotational", "quarter", "mirror", "diagonal"),
+                                 help="symmetry of the empty cells")
+    generate_parser.add_argument("--minimal", action="store_true",
+                                 help="remove values until none can be without a second solution")
+    generate_parser.add_argument("--seed", type=int,
+                                 help="seed of the first puzzle, to generate the same puzzles again")
+    generate_parser.add_argument("--blank", default="0", choices=("0", "."), help="character for empty cells")
+    _add_worker_args(generate_parser, chunksize=4)
+    generate_parser.set_defaults(command=_generate_command)
+
+    variants_parser = subparsers.add_parser("variants", help="write transformed copies of puzzles with one solution")
+    variants_parser.add_argument("files", nargs="*", help="puzzle files to read ('-' or none for stdin)")
+    variants_parser.add_argument("-n", "--count", type=int, default=1, help="number of variants of each puzzle")
+    variants_parser.add_argument("--seed", type=int,
+                                 help="seed of the first puzzle's variants, to write the same variants again")
+    variants_parser.add_argument("--blank", default="0", choices=("0", "."), help="character for empty cells")
+    variants_parser.set_defaults(command=_variants_command)
+
+    canonical_parser = subparsers.add_parser("canonical", help="write the canonical form of puzzles")
+    canonical_parser.add_argument("files", nargs="*", help="puzzle files to read ('-' or none for stdin)")
+    canonical_parser.add_argument("--unique", action="store_true",
+                                  help="write each puzzle as read, skipping any that repeat an earlier one up to "
+                                       "symmetry")
+    canonical_parser.add_argument("--blank", default="0", choices=("0", "."), help="character for empty cells")
+    canonical_parser.set_defaults(command=_canonical_command)
+
+    bench_parser = subparsers.add_parser("bench", help="time solving puzzles")
+    _add_input_args(bench_parser)
+    bench_parser.add_argument("--suite", action="store_true",
+                              help="run the benchmark suite on the embedded puzzles instead of reading any")
+    bench_parser.add_argument("--repeat", type=int, default=3, help="times to go through each puzzle in the suite")
+    bench_parser.add_argument("--output", help="file to save the suite results to as JSON")
+    bench_parser.add_argument("--compare", help="file of earlier suite results to check for regressions against")
+    bench_parser.add_argument("--tolerance", type=float, default=0.1,
+                              help="fraction a metric can get worse by before it is a regression")
+    bench_parser.set_defaults(command=_bench_command)
+    return parser
+
+
+def _add_input_args(parser):
+    """
+    Add the arguments for commands that read puzzles
+    :param parser: ArgumentParser: The parser of the command
+    :return: None
+    """
+    parser.add_argument("files", nargs="*", help="puzzle files to read ('-' or none for stdin)")
+    parser.add_argument("--engine", default=constants.BACKTRACKING_ENGINE,
+                        choices=(constants.BACKTRACKING_ENGINE, constants.DLX_ENGINE), help="solver engine")
+    _add_worker_args(parser, chunksize=64)
+
+
+def _add_worker_args(parser, chunksize):
+    """
+    Add the arguments for commands that can use worker processes
+    :param parser: ArgumentParser: The parser of the command
+    :param chunksize: Integer: The default number of puzzles sent to a worker at a time
+    :return: None
+    """
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of worker processes (0 for one per CPU, 1 to not start any)")
+    parser.add_argument("--chunksize", type=int, default=chunksize, help="puzzles sent to a worker at a time")
+
+
+def _read_inputs(files):
+    """
+    Read the puzzles from each file in order, or from stdin if there are no files
+    :param files: List of String: The paths of the files ('-' for stdin)
+    :return: Generator of String: Each puzzle as 81 characters
+    """
+    import puzzle_io
+    for path in files or ["-"]:
+        yield from puzzle_io.read_puzzle_strings(sys.stdin if path == "-" else path)
+
+
+def _report_error(num, error):
+    """
+    Write the error for a puzzle that could not be handled to stderr
+    :param num: Integer: The number of the puzzle in the input (from 1)
+    :param error: String: The error message
+    :return: None
+    """
+    sys.stderr.write("pydoku: puzzle " + str(num) + ": " + error + "\n")
+
+
+def _solve_command(args):
+    """
+    Solve the input puzzles and write each solution to stdout
+    :param args: Namespace: The parsed arguments
+    :return: Integer: The exit status
+    """
+    import batch
+    status = 0
+    results = batch.solve_iter(_read_inputs(args.files), args.workers, args.chunksize, args.engine, args.max_nodes,
+                               args.timeout)
+    for num, result in enumerate(results, 1):
+        if result.is_solved():
+            solution = result.get_solution()
+            sys.stdout.write((solution if args.blank == "0" else solution.replace("0", args.blank)) + "\n")
+        else:
+            _report_error(num, result.get_error())
+            status = 1
+    return status
+
+
+def _count_command(args):
+    """
+    Count the solutions of the input puzzles and write each count to stdout
+    :param args: Namespace: The parsed arguments
+    :return: Integer: The exit status
+    """
+    import batch
+    status = 0
+    results = batch.count_iter(_read_inputs(args.files), args.limit, args.workers, args.chunksize, args.engine)
+    for num, result in enumerate(results, 1):
+        if result.get_error() is None:
+            sys.stdout.write(str(result.get_count()) + "\n")
+        else:
+            _report_error(num, result.get_error())
+            status = 1
+    return status
+
+
+def _grade_command(args):
+    """
+    Grade the input puzzles and write each grade and score to stdout
+    :param args: Namespace: The parsed arguments
+    :return: Integer: The exit status
+    """
+    from board import Board
+    import grader
+    status = 0
+    for num, puzzle in enumerate(_read_inputs(args.files), 1):
+        try:
+            grade = grader.grade_board(Board.from_string(puzzle))
+        except ValueError as e:
+            _report_error(num, str(e))
+            status = 1
+            continue
+        if grade.is_unique():
+            sys.stdout.write(grade.get_level() + " " + format(grade.get_score(), ".4g") + "\n")
+        else:
+            _report_error(num, "Board does not have exactly one solution")
+            status = 1
+    return status
+
+
+def _generate_command(args):
+    """
+    Generate puzzles and write each one to stdout
+    :param args: Namespace: The parsed arguments
+    :return: Integer: The exit status
+    """
+    import batch
+    max_remove = args.max_remove
+    if max_remove is None:
+        # A grade takes over from the difficulty, so only the grade limits the values removed:
+        max_remove = 81 if args.grade else DIFFICULTIES[args.difficulty]
+    puzzles = batch.generate_iter(args.count, max_remove, args.workers, args.chunksize, args.grade, args.symmetry,
+                                  args.minimal, args.seed)
+    for puzzle in puzzles:
+        sys.stdout.write((puzzle if args.blank == "0" else puzzle.replace("0", args.blank)) + "\n")
+    return 0
+
+
+def _variants_command(args):
+    """
+    Write transformed copies of the input puzzles to stdout
+    :param args: Namespace: The parsed arguments
+    :return: Integer: The exit status
+    """
+    from board import Board
+    from transforms import VariantGenerator
+    status = 0
+    for num, puzzle in enumerate(_read_inputs(args.files), 1):
+        try:
+            generator = VariantGenerator(Board.from_string(puzzle), None if args.seed is None else args.seed + num)
+        except ValueError as e:
+            _report_error(num, str(e))
+            status = 1
+            continue
+        for variant in generator.generate_strings(args.count):
+            sys.stdout.write((variant if args.blank == "0" else variant.replace("0", args.blank)) + "\n")
+    return status
+
+
+def _canonical_command(args):
+    """
+    Write the canonical form of each input puzzle, or each puzzle that does not repeat an earlier one, to stdout
+    :param args: Namespace: The parsed arguments
+    :return: Integer: The exit status
+    """
+    from board import Board
+    import canonical
+    seen = canonical.PuzzleSet()
+    status = 0
+    for num, puzzle in enumerate(_read_inputs(args.files), 1):
+        try:
+            b = Board.from_string(puzzle)
+        except ValueError as e:
+            _report_error(num, str(e))
+            status = 1
+            continue
+        if args.unique:
+            if not seen.add(b):
+                continue
+        else:
+            b = canonical.canonical_form(b)
+        sys.stdout.write(b.to_string(args.blank) + "\n")
+    return status
+
+
+def _bench_command(args):
+    """
+    Solve the input puzzles and write how long it took to stdout
+    :param args: Namespace: The parsed arguments
+    :return: Integer: The exit status
+    """
+    if args.suite:
+        return _bench_suite(args)
+    import batch
+    import time
+    puzzles = list(_read_inputs(args.files))  # Read everything first so only solving is timed
+    start = time.perf_counter()
+    failed = sum(not result.is_solved()
+                 for result in batch.solve_iter(puzzles, args.workers, args.chunksize, args.engine))
+    elapsed = time.perf_counter() - start
+    rate = len(puzzles) / elapsed if elapsed else 0.0
+    sys.stdout.write("solved " + str(len(puzzles) - failed) + " of " + str(len(puzzles)) + " puzzles in " +
+                     format(elapsed, ".3f") + "s (" + format(rate, ".1f") + " puzzles/sec)\n")
+    return 1 if failed else 0
+
+
+def _bench_suite(args):
+    """
+    Run the benchmark suite, write its results to stdout, and check them against earlier results
+    :param args: Namespace: The parsed arguments
+    :return: Integer: The exit status (1 if any regression was found)
+    """
+    import benchmark
+    baseline = benchmark.load_results(args.compare) if args.compare else None  # Load first to fail before running
+    results = benchmark.run_suite(args.repeat)
+    sys.stdout.write(benchmark.format_results(results) + "\n")
+    if args.output:
+        benchmark.save_results(results, args.output)
+    if baseline is None:
+        return 0
+    regressions = benchmark.compare_results(baseline, results, args.tolerance)
+    for regression in regressions:
+        sys.stderr.write("pydoku: regression: " + regression + "\n")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+import time
+
+# Limits on how much work a solve can do:
+# A budget is checked by the search each time it tries a value, and raises BudgetExceededError once the node limit is
+# passed, the timeout is reached, or its CancellationToken is cancelled. The clock and the token are only looked at
+# every CHECK_INTERVAL nodes since reading them costs more than trying a value.
+
+NODES_REASON = "max_nodes"  # The search tried more values than allowed
+TIMEOUT_REASON = "timeout"  # The search ran out of time
+CANCELLED_REASON = "cancelled"  # The search was cancelled through its token
+
+# Error message for each reason:
+_MESSAGES = {NODES_REASON: "Solve stopped after trying too many values", TIMEOUT_REASON: "Solve timed out",
+             CANCELLED_REASON: "Solve was cancelled"}
+
+
+class BudgetExceededError(Exception):
+    """Raised when a solve is stopped by its node limit, timeout, or cancellation token. The board is left with the
+    values it had before the solve."""
+
+    def __init__(self, reason):
+        """
+        Create a BudgetExceededError object
+        :param reason: String: Why the solve was stopped (NODES_REASON, TIMEOUT_REASON, or CANCELLED_REASON)
+        """
+        super().__init__(_MESSAGES[reason])
+        self._reason = reason
+
+    def get_reason(self):
+        """
+        Get why the solve was stopped
+        :return: String: NODES_REASON, TIMEOUT_REASON, or CANCELLED_REASON
+        """
+        return self._reason
+
+    def __reduce__(self):
+        """
+        Pickle the error by its reason so it can be sent back from a worker process
+        :return: Tuple: The class and the arguments to make it again
+        """
+        return BudgetExceededError, (self._reason,)
+
+
+class CancellationToken:
+    """Represents a flag that another thread (or a callback like a GUI button) sets to stop the solves using it"""
+
+    __slots__ = ('_cancelled',)
+
+    def __init__(self):
+        """Creates a CancellationToken object that is not cancelled"""
+        self._cancelled = False
+
+    def cancel(self):
+        """
+        Ask every solve using this token to stop
+        :return: None
+        """
+        self._cancelled = True
+
+    def is_cancelled(self):
+        """
+        Check if the token was cancelled
+        :return: Boolean: Was cancel called?
+        """
+        return self._cancelled
+
+
+class SolveBudget:
+    """Represents the node limit, deadline, and cancellation token of one solve"""
+
+    __slots__ = ('_max_nodes', '_deadline', '_cancel')
+
+    CHECK_INTERVAL = 256  # Number of nodes between looks at the clock and the cancellation token
+
+    def __init__(self, max_nodes=None, timeout=None, cancel=None):
+        """
+        Create a SolveBudget object, starting the timeout now
+        :param max_nodes: None or Integer: The most values the search can try (None for no limit)
+        :param timeout: None or Float: The most seconds the solve can take (None for no limit)
+        :param cancel: None or CancellationToken: A token that stops the solve once it is cancelled
+        """
+        self._max_nodes = max_nodes
+        self._deadline = None if timeout is None else time.perf_counter() + timeout
+        self._cancel = cancel
+
+    def check(self, nodes):
+        """
+        Check if the solve has gone over its budget
+        :param nodes: Integer: The number of values the search has tried so far
+        :return: None or String: Why the solve should stop, None if it can keep going
+        """
+        if self._max_nodes is not None and nodes > self._max_nodes:
+            return NODES_REASON
+        if nodes % SolveBudget.CHECK_INTERVAL == 0:
+            if self._cancel is not None and self._cancel.is_cancelled():
+                return CANCELLED_REASON
+            if self._deadline is not None and time.perf_counter() >= self._deadline:
+                return TIMEOUT_REASON
+        return None
+
+    @staticmethod
+    def make(max_nodes=None, timeout=None, cancel=None):
+        """
+        Create a budget only if there is a limit to enforce, so unlimited solves skip the checks entirely
+        :param max_nodes: None or Integer: The most values the search can try (None for no limit)
+        :param timeout: None or Float: The most seconds the solve can take (None for no limit)
+        :param cancel: None or CancellationToken: A token that stops the solve once it is cancelled
+        :return: None or SolveBudget: The budget, None if there are no limits
+        """
+        if max_nodes is None and timeout is None and cancel is None:
+            return None
+        return SolveBudget(max_nodes, timeout, cancel)
@@ -0,0 +1,150 @@
+class SolveStats:
+    """Represents counters collected while solving boards, to explain why some boards take longer than others. Give
+    one to Board.solve or Board.count_solutions and it is added to, so one object can also total a whole batch."""
+
+    __slots__ = ('_nodes', '_backtracks', '_max_depth', '_naked_singles', '_hidden_singles', '_eliminations',
+                 '_phase_times')
+
+    # Names of the phases that time is recorded for:
+    SIMPLE_PHASE = "simple"  # Filling in naked and hidden singles before searching
+    DEDUCTION_PHASE = "deduction"  # Filling in values with a DeductionPipeline before searching
+    SEARCH_PHASE = "search"  # The backtracking search
+    DLX_PHASE = "dlx"  # The dancing links search
+
+    def __init__(self):
+        """Creates a SolveStats object with every counter at zero"""
+        self._nodes = 0  # Number of values tried by a search
+        self._backtracks = 0  # Number of times a search ran out of values for a cell and went back to an earlier one
+        self._max_depth = 0  # Largest number of cells a search had guessed values for at once
+        self._naked_singles = 0  # Number of values placed because they were the only candidate of their cell
+        self._hidden_singles = 0  # Number of values placed because they only fit in one cell of a row, col, or box
+        self._eliminations = {}  # Number of candidates removed by each deduction technique, keyed by technique name
+        self._phase_times = {}  # Seconds spent in each phase, keyed by phase name
+
+    def get_nodes(self):
+        """
+        Get the number of values tried by the search
+        :return: Integer: The number of search nodes
+        """
+        return self._nodes
+
+    def get_backtracks(self):
+        """
+        Get the number of times the search ran out of values for a cell and went back to an earlier cell
+        :return: Integer: The number of backtracks
+        """
+        return self._backtracks
+
+    def get_max_depth(self):
+        """
+        Get the largest number of cells the search had guessed values for at once
+        :return: Integer: The maximum search depth
+        """
+        return self._max_depth
+
+    def get_naked_singles(self):
+        """
+        Get the number of values placed because they were the only candidate of their cell
+        :return: Integer: The number of naked singles placed
+        """
+        return self._naked_singles
+
+    def get_hidden_singles(self):
+        """
+        Get the number of values placed because they only fit in one cell of a row, col, or box
+        :return: Integer: The number of hidden singles placed
+        """
+        return self._hidden_singles
+
+    def get_eliminations(self, technique):
+        """
+        Get the number of candidates a deduction technique removed
+        :param technique: String: The name of the technique (see deductions.TECHNIQUES)
+        :return: Integer: The number of eliminations
+        """
+        return self._eliminations.get(technique, 0)
+
+    def get_phase_time(self, phase):
+        """
+        Get the time spent in a phase
+        :param phase: String: The name of the phase (SIMPLE_PHASE, SEARCH_PHASE, or DLX_PHASE)
+        :return: Float: The seconds spent in the phase
+        """
+        return self._phase_times.get(phase, 0.0)
+
+    def get_total_time(self):
+        """
+        Get the time spent in every phase
+        :return: Float: The total seconds recorded
+        """
+        return sum(self._phase_times.values())
+
+    def add_search(self, nodes, backtracks, max_depth):
+        """
+        Add the counters of one search
+        :param nodes: Integer: The number of values tried
+        :param backtracks: Integer: The number of times it went back to an earlier cell
+        :param max_depth: Integer: The largest number of guessed cells at once
+        :return: None
+        """
+        self._nodes += nodes
+        self._backtracks += backtracks
+        self._max_depth = max(self._max_depth, max_depth)
+
+    def add_singles(self, naked, hidden):
+        """
+        Add the values placed by one pass of filling in singles
+        :param naked: Integer: The number of naked singles placed
+        :param hidden: Integer: The number of hidden singles placed
+        :return: None
+        """
+        self._naked_singles += naked
+        self._hidden_singles += hidden
+
+    def add_eliminations(self, technique, count):
+        """
+        Add candidates removed by a deduction technique
+        :param technique: String: The name of the technique
+        :param count: Integer: The number of candidates removed
+        :return: None
+        """
+        self._eliminations[technique] = self._eliminations.get(technique, 0) + count
+
+    def add_phase_time(self, phase, seconds):
+        """
+        Add time spent in a phase
+        :param phase: String: The name of the phase
+        :param seconds: Float: The seconds spent
+        :return: None
+        """
+        self._phase_times[phase] = self._phase_times.get(phase, 0.0) + seconds
+
+    def to_dict(self):
+        """
+        Convert the counters to a dictionary, like for saving them as JSON
+        :return: Dictionary: Each counter by name, with the eliminations of each technique under "eliminations" and
+        the phase times under "phase_times"
+        """
+        return {
+            "nodes": self._nodes,
+            "backtracks": self._backtracks,
+            "max_depth": self._max_depth,
+            "naked_singles": self._naked_singles,
+            "hidden_singles": self._hidden_singles,
+            "eliminations": dict(self._eliminations),
+            "phase_times": dict(self._phase_times),
+        }
+
+    def __str__(self):
+        """
+        Convert the counters to a string
+        :return: String: The counters in string form
+        """
+        s = "nodes=" + str(self._nodes) + " backtracks=" + str(self._backtracks) + " max_depth=" + \
+            str(self._max_depth) + " naked_singles=" + str(self._naked_singles) + " hidden_singles=" + \
+            str(self._hidden_singles)
+        for technique, count in self._eliminations.items():
+            s += " " + technique + "=" + str(count)
+        for phase, seconds in self._phase_times.items():
+            s += " " + phase + "=" + format(seconds, ".6f") + "s"
+        return s
@@ -0,0 +1,62 @@
+from async_solver import AsyncSolver
+from board import Board
+from solve_budget import BudgetExceededError
+import asyncio
+import benchmark
+import unittest
+
+PUZZLE = benchmark.CORPORA["minimal17"][0]
+HARD_PUZZLE = benchmark.CORPORA["adversarial"][0]  # Needs thousands of nodes
+
+
+def solved(puzzle):
+    """
+    Solve a puzzle in this thread
+    :param puzzle: String: The puzzle as 81 characters
+    :return: String: The solution as 81 characters
+    """
+    b = Board.from_string(puzzle)
+    b.solve()
+    return b.to_string()
+
+
+class AsyncSolverTest(unittest.TestCase):
+    """Checks the asyncio facade with threads and processes, across event loops and with budgets"""
+
+    def test_solve_many_at_once(self):
+        for processes in False, True:
+            solver = AsyncSolver(workers=2, max_pending=2, processes=processes)
+
+            async def solve_all():
+                boards = [Board.from_string(PUZZLE) for _ in range(10)]
+                await asyncio.gather(*(solver.solve(b) for b in boards))
+                return [b.to_string() for b in boards]
+            try:
+                # A second event loop must be able to use the same solver:
+                for _ in range(2):
+                    self.assertEqual(asyncio.run(solve_all()), [solved(PUZZLE)] * 10)
+            finally:
+                solver.close()
+
+    def test_count_and_generate(self):
+        async def run():
+            async with AsyncSolver(workers=1, processes=False) as solver:
+                count = await solver.count_solutions(Board.from_string(PUZZLE))
+                puzzle = await solver.generate()
+            return count, puzzle
+        count, puzzle = asyncio.run(run())
+        self.assertEqual(count, 1)
+        self.assertEqual(puzzle.count_solutions(2), 1)
+
+    def test_budget_leaves_board_unchanged(self):
+        async def run():
+            async with AsyncSolver(workers=1, processes=False) as solver:
+                b = Board.from_string(HARD_PUZZLE)
+                with self.assertRaises(BudgetExceededError):
+                    await solver.solve(b, max_nodes=10)
+                return b
+        self.assertEqual(asyncio.run(run()).to_string("."), HARD_PUZZLE)
+
+
+if __name__ == "__main__":
+    unittest.main()
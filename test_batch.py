@@ -0,0 +1,55 @@
+from board import Board
+from solve_budget import BudgetExceededError
+import batch
+import benchmark
+import solve_budget
+import unittest
+
+PUZZLES = benchmark.CORPORA["easy"] + benchmark.CORPORA["minimal17"]
+INVALID = "11" + "0" * 79  # Two 1s in the first row
+
+
+class BatchTest(unittest.TestCase):
+    """Checks that batches come back in order with the errors of bad puzzles captured, in this process or a pool"""
+
+    def test_solutions_in_order(self):
+        expected = []
+        for puzzle in PUZZLES:
+            b = Board.from_string(puzzle)
+            b.solve()
+            expected.append(b.to_string())
+        for workers in 1, 2:
+            results = batch.solve_many(PUZZLES, workers=workers, chunksize=3)
+            self.assertEqual([result.get_puzzle() for result in results], list(PUZZLES), workers)
+            self.assertEqual([result.get_solution() for result in results], expected, workers)
+            self.assertTrue(all(result.is_solved() for result in results))
+
+    def test_errors_are_captured(self):
+        for workers in 1, 2:
+            results = batch.solve_many([PUZZLES[0], INVALID, "123", PUZZLES[1]], workers=workers, chunksize=1)
+            self.assertEqual([result.is_solved() for result in results], [True, False, False, True])
+            self.assertIsNotNone(results[1].get_error())
+            self.assertIsNone(results[1].get_solution())
+
+    def test_budget_error(self):
+        result = batch.solve_many([benchmark.CORPORA["adversarial"][0]], workers=1, max_nodes=10)[0]
+        self.assertFalse(result.is_solved())
+        self.assertEqual(result.get_error(), str(BudgetExceededError(solve_budget.NODES_REASON)))
+
+    def test_counts(self):
+        empty = "0" * 81
+        results = list(batch.count_iter([PUZZLES[0], empty, INVALID], limit=2, workers=2, chunksize=1))
+        self.assertEqual([result.get_count() for result in results[:2]], [1, 2])
+        self.assertIsNone(results[2].get_count())
+        self.assertIsNotNone(results[2].get_error())
+
+    def test_generate_is_the_same_for_any_workers(self):
+        one = list(batch.generate_iter(4, workers=1, seed=5))
+        two = list(batch.generate_iter(4, workers=2, chunksize=1, seed=5))
+        self.assertEqual(one, two)
+        for puzzle in one:
+            self.assertEqual(Board.from_string(puzzle).count_solutions(2), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
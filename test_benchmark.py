@@ -0,0 +1,27 @@
+import benchmark
+import copy
+import unittest
+
+
+class GenerateBenchmarkTest(unittest.TestCase):
+    """Checks that the generate benchmarks count the search of their uniqueness checks the same way every run"""
+
+    def test_counts_are_repeatable(self):
+        seeds = [(benchmark.DIFFICULTIES["hard"], seed) for seed in range(5)]
+        first = benchmark._measure(benchmark._generate, seeds, 1, False, True)
+        second = benchmark._measure(benchmark._generate, seeds, 1, False, True)
+        self.assertGreater(first["nodes"], 0)
+        self.assertEqual((first["nodes"], first["backtracks"]), (second["nodes"], second["backtracks"]))
+
+    def test_node_regression_is_found(self):
+        seeds = [(benchmark.DIFFICULTIES["medium"], seed) for seed in range(3)]
+        baseline = {"results": {"generate/medium": benchmark._measure(benchmark._generate, seeds, 1, False, True)}}
+        current = copy.deepcopy(baseline)
+        current["results"]["generate/medium"]["nodes"] *= 2
+        regressions = benchmark.compare_results(baseline, current)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("nodes", regressions[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
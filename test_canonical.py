@@ -0,0 +1,77 @@
+from board import Board
+from canonical import PuzzleSet
+from position import Position
+from transforms import VariantGenerator
+import benchmark
+import canonical
+import unittest
+
+PUZZLE = benchmark.CORPORA["easy"][0]
+OTHER = benchmark.CORPORA["easy"][1]
+
+
+class BoardEqualityTest(unittest.TestCase):
+    """Checks that boards and positions compare by value, hash to match, and can share containers with other types"""
+
+    def test_equal_boards(self):
+        first, second = Board.from_string(PUZZLE), Board.from_string(PUZZLE)
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertNotEqual(first, Board.from_string(OTHER))
+
+    def test_other_types(self):
+        b = Board.from_string(PUZZLE)
+        self.assertFalse(b == None)
+        self.assertNotEqual(b, PUZZLE)
+        self.assertTrue(b != 0)
+        # A dictionary keyed by both strings and boards must not raise when the hashes collide:
+        keys = {PUZZLE: "string", b: "board"}
+        self.assertEqual(keys[Board.from_string(PUZZLE)], "board")
+        self.assertEqual(keys[PUZZLE], "string")
+
+    def test_positions(self):
+        self.assertEqual(Position(2, 3), Position(2, 3))
+        self.assertEqual(hash(Position(2, 3)), hash(Position(2, 3)))
+        self.assertNotEqual(Position(2, 3), Position(3, 2))
+        self.assertFalse(Position(2, 3) == None)
+        self.assertEqual(len({Position(1, 1), Position(1, 1), (1, 1)}), 2)
+
+
+class CanonicalTest(unittest.TestCase):
+    """Checks that the canonical form and structural hash are the same for every variant of a puzzle"""
+
+    def test_variants_share_canonical_form(self):
+        for puzzle in (PUZZLE, OTHER, benchmark.CORPORA["minimal17"][0]):
+            b = Board.from_string(puzzle)
+            form = canonical.canonical_form(b)
+            key = canonical.structural_hash(b)
+            for variant in VariantGenerator(b, seed=1).generate_strings(20):
+                variant = Board.from_string(variant)
+                self.assertEqual(canonical.canonical_form(variant), form)
+                self.assertEqual(canonical.structural_hash(variant), key)
+                self.assertTrue(canonical.are_equivalent(b, variant))
+
+    def test_canonical_form_is_a_variant(self):
+        b = Board.from_string(PUZZLE)
+        form = canonical.canonical_form(b)
+        self.assertEqual(form.count_solutions(2), 1)
+        self.assertEqual(form.to_string().count("0"), PUZZLE.count("0"))
+        self.assertEqual(canonical.canonical_form(form), form)
+
+    def test_different_puzzles(self):
+        self.assertFalse(canonical.are_equivalent(Board.from_string(PUZZLE), Board.from_string(OTHER)))
+
+    def test_puzzle_set(self):
+        puzzles = PuzzleSet()
+        b = Board.from_string(PUZZLE)
+        self.assertTrue(puzzles.add(b))
+        for variant in VariantGenerator(b, seed=2).generate_strings(5):
+            self.assertIn(Board.from_string(variant), puzzles)
+            self.assertFalse(puzzles.add(Board.from_string(variant)))
+        self.assertTrue(puzzles.add(Board.from_string(OTHER)))
+        self.assertNotIn(Board.from_string(benchmark.CORPORA["easy"][2]), puzzles)
+        self.assertEqual(len(puzzles), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+from board import Board
+from concurrent.futures import ProcessPoolExecutor
+from corpus import PuzzleCorpus
+import benchmark
+import os
+import pickle
+import tempfile
+import unittest
+
+PUZZLES = benchmark.CORPORA["easy"] + benchmark.CORPORA["minimal17"]
+
+
+def read_strings(corpus):
+    """
+    Read every puzzle of a corpus (in a worker process)
+    :param corpus: PuzzleCorpus: The corpus or slice to read
+    :return: List of String: Each puzzle as 81 characters
+    """
+    return [b.to_string() for b in corpus]
+
+
+class PuzzleCorpusTest(unittest.TestCase):
+    """Checks that corpus files read back what was written, and that slices can be sent to other processes"""
+
+    def setUp(self):
+        self.puzzles = [Board.from_string(puzzle).to_string() for puzzle in PUZZLES]
+        self.solutions = []
+        for puzzle in PUZZLES:
+            b = Board.from_string(puzzle)
+            b.solve()
+            self.solutions.append(b.to_string())
+        fd, self.path = tempfile.mkstemp(suffix=".pdk")
+        os.close(fd)
+        PuzzleCorpus.write(self.path, self.puzzles, self.solutions)
+        self.corpus = PuzzleCorpus(self.path)
+
+    def tearDown(self):
+        self.corpus.close()
+        os.remove(self.path)
+
+    def test_round_trip(self):
+        self.assertTrue(self.corpus.has_solutions())
+        self.assertEqual(len(self.corpus), len(self.puzzles))
+        self.assertEqual(read_strings(self.corpus), self.puzzles)
+        self.assertEqual(self.corpus.get_solution(-1).to_string(), self.solutions[-1])
+        with self.assertRaises(IndexError):
+            self.corpus.get_puzzle(len(self.puzzles))
+
+    def test_pack(self):
+        for puzzle in self.puzzles:
+            cells = Board.from_string(puzzle).snapshot()
+            self.assertEqual(PuzzleCorpus.unpack(PuzzleCorpus.pack(cells)), cells)
+
+    def test_slices(self):
+        view = self.corpus[2:9][1:4]
+        self.assertEqual(read_strings(view), self.puzzles[3:6])
+        self.assertEqual(view.get_solution(0).to_string(), self.solutions[3])
+        with self.assertRaises(ValueError):
+            self.corpus[::2]
+
+    def test_pickled_slice_reads_the_same_records(self):
+        view = self.corpus[3:7]
+        copy = pickle.loads(pickle.dumps(view))
+        self.assertEqual(read_strings(copy), read_strings(view))
+        copy.close()
+        with ProcessPoolExecutor(2) as executor:
+            shards = list(executor.map(read_strings, [self.corpus[:5], self.corpus[5:]]))
+        self.assertEqual(shards[0] + shards[1], self.puzzles)
+
+    def test_not_a_corpus(self):
+        fd, path = tempfile.mkstemp(suffix=".pdk")
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"not a corpus file at all")
+        try:
+            with self.assertRaises(ValueError):
+                PuzzleCorpus(path)
+        finally:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+from board import Board
+from deductions import DeductionPipeline
+from solve_stats import SolveStats
+import benchmark
+import deductions
+import masks
+import unittest
+
+PUZZLES = [puzzle for corpus in benchmark.CORPORA.values() for puzzle in corpus]
+
+
+class DeductionPipelineTest(unittest.TestCase):
+    """Checks that every value the techniques deduce is right and that each technique removes what it should"""
+
+    def test_deductions_match_solution(self):
+        for puzzle in PUZZLES:
+            b = Board.from_string(puzzle)
+            cells = list(b.snapshot())
+            b.solve()
+            solution = b.snapshot()
+            stats = SolveStats()
+            placements = DeductionPipeline().run(cells, stats=stats)
+            self.assertEqual(len({ind for ind, _ in placements}), len(placements), puzzle)
+            for ind, val in placements:
+                self.assertFalse(cells[ind], puzzle)
+                self.assertEqual(val, solution[ind], puzzle)
+            # Every placement is counted as a naked or hidden single:
+            self.assertEqual(stats.get_naked_singles() + stats.get_hidden_singles(), len(placements), puzzle)
+            # Singles alone can never find more:
+            self.assertLessEqual(len(DeductionPipeline(()).run(cells)), len(placements), puzzle)
+
+    def test_solve_with_deductions(self):
+        for puzzle in PUZZLES:
+            plain = Board.from_string(puzzle)
+            plain.solve()
+            deduced = Board.from_string(puzzle)
+            stats = SolveStats()
+            deduced.solve(deductions=DeductionPipeline(), stats=stats)
+            self.assertEqual(deduced, plain, puzzle)
+            self.assertGreater(stats.get_phase_time(SolveStats.DEDUCTION_PHASE), 0, puzzle)
+
+    def test_unknown_technique(self):
+        with self.assertRaises(ValueError):
+            DeductionPipeline(("no_such_technique",))
+        pipeline = DeductionPipeline((deductions.SWORDFISH, deductions.POINTING))
+        self.assertEqual(pipeline.get_techniques(), (deductions.POINTING, deductions.SWORDFISH))
+
+    def test_naked_pair(self):
+        cands = [masks.ALL_VALUES] * 81
+        pair = masks.VALUE_BITS[1] | masks.VALUE_BITS[2]
+        cands[0] = cands[1] = pair
+        self.assertGreater(deductions._TECHNIQUE_FUNCTIONS[deductions.NAKED_PAIRS](cands), 0)
+        self.assertEqual(cands[0], pair)
+        self.assertFalse(cands[8] & pair)  # Same row
+        self.assertFalse(cands[20] & pair)  # Same box
+        self.assertEqual(cands[40], masks.ALL_VALUES)
+
+    def test_pointing(self):
+        cands = [masks.ALL_VALUES] * 81
+        bit = masks.VALUE_BITS[1]
+        # In the first box, 1 only fits in the first row:
+        for ind in (9, 10, 11, 18, 19, 20):
+            cands[ind] &= ~bit
+        self.assertGreater(deductions._TECHNIQUE_FUNCTIONS[deductions.POINTING](cands), 0)
+        self.assertFalse(any(cands[ind] & bit for ind in range(3, 9)))
+        self.assertTrue(cands[27] & bit)
+
+    def test_x_wing(self):
+        cands = [masks.ALL_VALUES] * 81
+        bit = masks.VALUE_BITS[1]
+        # In rows 0 and 5, 1 only fits in cols 0 and 4:
+        for row in 0, 5:
+            for col in range(9):
+                if col not in (0, 4):
+                    cands[row * 9 + col] &= ~bit
+        self.assertGreater(deductions._TECHNIQUE_FUNCTIONS[deductions.X_WING](cands), 0)
+        for row in range(9):
+            for col in 0, 4:
+                self.assertEqual(bool(cands[row * 9 + col] & bit), row in (0, 5))
+        self.assertTrue(cands[1 * 9 + 1] & bit)
+
+
+if __name__ == "__main__":
+    unittest.main()
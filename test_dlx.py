@@ -0,0 +1,65 @@
+from board import Board
+from position import Position
+import benchmark
+import constants
+import random
+import unittest
+
+PUZZLES = [puzzle for corpus in benchmark.CORPORA.values() for puzzle in corpus]
+
+
+class DLXEngineTest(unittest.TestCase):
+    """Checks that the dancing links engine finds the same solutions and counts as the backtracking search"""
+
+    def test_solve_matches_backtracking(self):
+        for puzzle in PUZZLES:
+            backtracking = Board.from_string(puzzle)
+            backtracking.solve()
+            dlx = Board.from_string(puzzle)
+            dlx.solve(engine=constants.DLX_ENGINE)
+            self.assertEqual(dlx, backtracking, puzzle)
+
+    def test_count_matches_backtracking(self):
+        boards = [Board.from_string(puzzle) for puzzle in PUZZLES]
+        # Puzzles with many solutions, made by emptying the first row of each:
+        boards += [Board.from_string("0" * 9 + puzzle[9:]) for puzzle in PUZZLES[:4]]
+        for b in boards:
+            for limit in 1, 2, 10:
+                self.assertEqual(b.count_solutions(limit, constants.DLX_ENGINE), b.count_solutions(limit),
+                                 b.to_string())
+        self.assertEqual(Board().count_solutions(5, constants.DLX_ENGINE), 5)
+
+    def test_random(self):
+        b = Board()
+        b.solve(rand=random.Random(3), engine=constants.DLX_ENGINE)
+        self.assertEqual(b.count_solutions(), 1)
+        again = Board()
+        again.solve(rand=random.Random(3), engine=constants.DLX_ENGINE)
+        self.assertEqual(b, again)
+
+    def test_restricted(self):
+        puzzle = benchmark.CORPORA["easy"][0]
+        solved = Board.from_string(puzzle)
+        solved.solve()
+        ind = puzzle.index("0")
+        pos = Position(ind // 9, ind % 9)
+        # Keeping the only solution's value out of a cell leaves no solution for either engine:
+        for engine in constants.BACKTRACKING_ENGINE, constants.DLX_ENGINE:
+            b = Board.from_string(puzzle)
+            with self.assertRaises(ValueError):
+                b.solve(restrict_val=solved.get_val(pos), restrict_pos=pos, engine=engine)
+
+    def test_unsolvable(self):
+        # Two of the same value in the first row:
+        b = Board()
+        b.restore(bytes([1, 1] + [0] * 79))
+        with self.assertRaises(ValueError):
+            b.solve(engine=constants.DLX_ENGINE)
+        # The board is only changed once a solution is found:
+        self.assertEqual(b.snapshot(), bytes([1, 1] + [0] * 79))
+        with self.assertRaises(ValueError):
+            Board().solve(engine="no_such_engine")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+from board import Board
+from generator import PuzzleGenerator
+from solve_stats import SolveStats
+import generator
+import unittest
+
+
+class PuzzleGeneratorTest(unittest.TestCase):
+    """Checks that generated puzzles have one solution and keep the symmetry, minimality, and seed asked for"""
+
+    def test_seed(self):
+        self.assertEqual(Board.generate_board(seed=5), Board.generate_board(seed=5))
+        self.assertNotEqual(Board.generate_board(seed=5), Board.generate_board(seed=6))
+        gen = PuzzleGenerator(generator.MIRROR_SYMMETRY, True, 7)
+        again = PuzzleGenerator(generator.MIRROR_SYMMETRY, True, 7)
+        for _ in range(3):
+            self.assertEqual(gen.generate(), again.generate())
+
+    def test_unique(self):
+        for seed in range(5):
+            b = Board.generate_board(seed=seed)
+            self.assertEqual(b.count_solutions(), 1)
+
+    def test_max_remove(self):
+        for max_remove in 0, 20, 45:
+            for symmetry in generator.SYMMETRIES:
+                b = Board.generate_board(max_remove, symmetry=symmetry, seed=max_remove)
+                self.assertLessEqual(b.to_string().count("0"), max_remove, symmetry)
+                self.assertEqual(b.count_solutions(), 1)
+
+    def test_symmetry(self):
+        for symmetry in generator.SYMMETRIES:
+            for seed in range(3):
+                cells = Board.generate_board(symmetry=symmetry, seed=seed).snapshot()
+                # Every orbit is either all empty or all filled:
+                for orbit in generator._ORBITS[symmetry]:
+                    self.assertEqual(len({bool(cells[ind]) for ind in orbit}), 1, symmetry)
+
+    def test_minimal(self):
+        for symmetry in generator.SYMMETRIES:
+            gen = PuzzleGenerator(symmetry, True, 11)
+            self.assertTrue(gen.is_minimal())
+            self.assertEqual(gen.get_symmetry(), symmetry)
+            b = gen.generate()
+            self.assertEqual(b.count_solutions(), 1)
+            cells = b.snapshot()
+            # Removing any filled orbit gives a second solution:
+            for orbit in generator._ORBITS[symmetry]:
+                if cells[orbit[0]]:
+                    test = bytearray(cells)
+                    for ind in orbit:
+                        test[ind] = 0
+                    b.restore(bytes(test))
+                    self.assertEqual(b.count_solutions(), 2, symmetry)
+
+    def test_stats(self):
+        stats = SolveStats()
+        Board.generate_board(seed=1, stats=stats)
+        self.assertGreater(stats.get_nodes(), 0)
+
+    def test_unknown_symmetry(self):
+        with self.assertRaises(ValueError):
+            PuzzleGenerator("spiral")
+        with self.assertRaises(ValueError):
+            Board.generate_board(symmetry="spiral")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+from board import Board
+import benchmark
+import constants
+import grader
+import unittest
+
+
+class GraderTest(unittest.TestCase):
+    """Checks the grades given to known puzzles and that generated puzzles get the grade asked for"""
+
+    def test_known_grades(self):
+        self.assertEqual(grader.grade_board(Board.from_string(benchmark.CORPORA["easy"][0])).get_level(),
+                         constants.EASY_GRADE)
+        grade = grader.grade_board(Board.from_string(benchmark.CORPORA["adversarial"][0]))
+        self.assertEqual(grade.get_level(), constants.EXPERT_GRADE)
+        self.assertGreater(grade.get_nodes(), 0)
+        self.assertTrue(grade.is_unique())
+        self.assertGreater(grade.get_score(), len(constants.GRADES))
+
+    def test_solved_and_empty(self):
+        b = Board.from_string(benchmark.CORPORA["easy"][0])
+        b.solve()
+        grade = grader.grade_board(b)
+        self.assertEqual(grade.get_level(), constants.EASY_GRADE)
+        self.assertIsNone(grade.get_hardest_technique())
+        self.assertEqual(grade.get_nodes(), 0)
+        self.assertEqual(grade.get_score(), 0)
+        self.assertTrue(grade.is_unique())
+        # The empty board needs search and has many solutions:
+        grade = grader.grade_board(Board())
+        self.assertEqual(grade.get_level(), constants.EXPERT_GRADE)
+        self.assertFalse(grade.is_unique())
+
+    def test_board_unchanged(self):
+        puzzle = benchmark.CORPORA["adversarial"][0]
+        b = Board.from_string(puzzle)
+        grader.grade_board(b)
+        self.assertEqual(b, Board.from_string(puzzle))
+
+    def test_grade_rank(self):
+        for rank, level in enumerate(constants.GRADES):
+            self.assertEqual(grader.get_grade_rank(level), rank)
+        with self.assertRaises(ValueError):
+            grader.get_grade_rank("impossible")
+
+    def test_generate_grade(self):
+        # Hard puzzles take a while to find, so only the quick grades are generated:
+        for level in constants.EASY_GRADE, constants.MEDIUM_GRADE, constants.EXPERT_GRADE:
+            for seed in 1, 2:
+                grade = grader.grade_board(Board.generate_board(grade=level, seed=seed))
+                self.assertEqual(grade.get_level(), level)
+                self.assertTrue(grade.is_unique())
+        with self.assertRaises(ValueError):
+            Board.generate_board(grade="impossible", seed=1)
+
+    def test_unreachable_grade(self):
+        # Removing only 30 values always leaves enough for singles:
+        with self.assertRaises(ValueError):
+            Board.generate_board(30, grade=constants.EXPERT_GRADE, seed=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+import unittest
+
+CORE_MODULES = ("board", "position", "entry", "constants")  # The solver core that worker processes import
+# Modules the core must not load, since only the GUI, shuffling, or the dancing links engine need them:
+DEFERRED_MODULES = ("tkinter", "random", "copy", "dlx")
+IMPORT_BUDGET = 100000  # Most microseconds importing the core may take, well above its usual few milliseconds
+
+
+def import_times(module):
+    """
+    Import a module in a new interpreter and read the time each import took
+    :param module: String: The module to import
+    :return: Dictionary of String to Integer: The cumulative microseconds of each module that was imported
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + module], capture_output=True,
+                            text=True, cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        # Each line is "import time: self [us] | cumulative | name", with the name indented by its depth:
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+class ImportTest(unittest.TestCase):
+    """Checks that importing the solver core stays fast and never loads the modules it defers"""
+
+    def test_deferred_modules(self):
+        for module in CORE_MODULES:
+            times = import_times(module)
+            for deferred in DEFERRED_MODULES:
+                self.assertNotIn(deferred, times, module + " imports " + deferred)
+
+    def test_budget(self):
+        for module in CORE_MODULES:
+            self.assertLess(import_times(module)[module], IMPORT_BUDGET, module)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import io
+import os
+import puzzle_io
+import pydoku
+import tempfile
+import unittest
+import unittest.mock
+
+PUZZLE = "003020600900305001001806400008102900700000008006708200002609500800203009005010300"
+SOLUTION = "483921657967345821251876493548132976729564138136798245372689514814253769695417382"
+
+
+class ReadPuzzlesTest(unittest.TestCase):
+    """Checks that puzzle files are streamed line by line and a bad line does not end the stream"""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(fd, "w") as f:
+            f.write("# A comment\n" + PUZZLE + " solution\n\n12345\n" + PUZZLE.replace("0", ".") + "\n")
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_short_line_is_passed_on(self):
+        self.assertEqual(list(puzzle_io.read_puzzle_strings(self.path)),
+                         [PUZZLE, "12345", PUZZLE.replace("0", ".")])
+
+    def test_commands_finish_the_stream(self):
+        for command, first in (("solve", SOLUTION), ("count", "1")):
+            out, err = io.StringIO(), io.StringIO()
+            with unittest.mock.patch("sys.stdout", out), unittest.mock.patch("sys.stderr", err):
+                status = pydoku.main([command, self.path])
+            self.assertEqual(status, 1, command)
+            self.assertEqual(out.getvalue().split(), [first, first], command)
+            self.assertIn("puzzle 2:", err.getvalue(), command)
+
+    def test_write_round_trip(self):
+        out = io.StringIO()
+        self.assertEqual(puzzle_io.write_puzzles(out, [PUZZLE, SOLUTION]), 2)
+        out.seek(0)
+        self.assertEqual([b.to_string() for b in puzzle_io.read_puzzles(out)], [PUZZLE, SOLUTION])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+from puzzle_reservoir import PuzzleReservoir
+import constants
+import os
+import signal
+import time
+import unittest
+
+
+def wait_for(check, timeout=60):
+    """
+    Wait until a check passes
+    :param check: Function: Takes nothing and returns whether the wait is over
+    :param timeout: Float: The most seconds to wait
+    :return: Boolean: Did the check pass in time?
+    """
+    end = time.monotonic() + timeout
+    while not check():
+        if time.monotonic() > end:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+class PuzzleReservoirTest(unittest.TestCase):
+    """Checks that the reservoir fills up in the background and recovers on its own when a worker process dies"""
+
+    def setUp(self):
+        self.reservoir = PuzzleReservoir(high_water=6, workers=1, difficulties=(constants.HARD_REMOVE,))
+
+    def tearDown(self):
+        self.reservoir.shutdown()
+
+    def test_fills_to_high_water(self):
+        self.reservoir.start()
+        self.assertTrue(wait_for(lambda: self.reservoir.size(constants.HARD_REMOVE) == 6))
+        self.assertEqual(len(self.reservoir.get(constants.HARD_REMOVE).to_string()), 81)
+
+    def test_refills_after_worker_dies(self):
+        self.reservoir.start()
+        # Kill the worker while it still has jobs, which breaks the pool:
+        for process in list(self.reservoir._executor._processes.values()):
+            os.kill(process.pid, signal.SIGKILL)
+        self.assertTrue(wait_for(lambda: self.reservoir.size(constants.HARD_REMOVE) == 6))
+        self.assertEqual(self.reservoir._restarts, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
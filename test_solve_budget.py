@@ -0,0 +1,69 @@
+from board import Board
+from chrome_trace import ChromeTraceCollector
+from solve_budget import BudgetExceededError, CancellationToken
+import benchmark
+import constants
+import pickle
+import solve_budget
+import unittest
+
+HARD_PUZZLE = benchmark.CORPORA["adversarial"][0]  # Needs thousands of nodes with either engine
+
+
+class SolveBudgetTest(unittest.TestCase):
+    """Checks that a solve stopped by its budget raises, leaves the board as it was, and takes back its guesses"""
+
+    def test_max_nodes_leaves_board_unchanged(self):
+        for engine in constants.BACKTRACKING_ENGINE, constants.DLX_ENGINE:
+            b = Board.from_string(HARD_PUZZLE)
+            with self.assertRaises(BudgetExceededError) as caught:
+                b.solve(engine=engine, max_nodes=50)
+            self.assertEqual(caught.exception.get_reason(), solve_budget.NODES_REASON)
+            self.assertEqual(b.to_string("."), HARD_PUZZLE, engine)
+
+    def test_count_solutions_budget(self):
+        b = Board.from_string(HARD_PUZZLE)
+        with self.assertRaises(BudgetExceededError):
+            b.count_solutions(2, max_nodes=50)
+        self.assertEqual(b.to_string("."), HARD_PUZZLE)
+
+    def test_cancelled_token(self):
+        token = CancellationToken()
+        token.cancel()
+        b = Board.from_string(HARD_PUZZLE)
+        with self.assertRaises(BudgetExceededError) as caught:
+            b.solve(cancel=token)
+        self.assertEqual(caught.exception.get_reason(), solve_budget.CANCELLED_REASON)
+        self.assertEqual(b.to_string("."), HARD_PUZZLE)
+
+    def test_timeout(self):
+        b = Board.from_string(HARD_PUZZLE)
+        with self.assertRaises(BudgetExceededError) as caught:
+            b.solve(timeout=0)
+        self.assertEqual(caught.exception.get_reason(), solve_budget.TIMEOUT_REASON)
+        self.assertEqual(b.to_string("."), HARD_PUZZLE)
+
+    def test_error_pickles(self):
+        error = pickle.loads(pickle.dumps(BudgetExceededError(solve_budget.NODES_REASON)))
+        self.assertEqual(error.get_reason(), solve_budget.NODES_REASON)
+
+    def test_enough_budget_solves(self):
+        b = Board.from_string(benchmark.CORPORA["easy"][0])
+        b.solve(max_nodes=10000, timeout=60)
+        self.assertTrue(b.count_solutions(2) == 1 and "0" not in b.to_string())
+
+    def test_stopped_trace_is_balanced(self):
+        b = Board.from_string(HARD_PUZZLE)
+        collector = ChromeTraceCollector()
+        collector.attach(b)
+        with self.assertRaises(BudgetExceededError):
+            b.solve(max_nodes=200)
+        collector.detach(b)
+        phases = [event["ph"] for event in collector._events]
+        self.assertGreater(phases.count("B"), 0)
+        self.assertEqual(phases.count("B"), phases.count("E"))
+        self.assertEqual(collector._open, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+from board import Board
+from chrome_trace import ChromeTraceCollector
+import benchmark
+import constants
+import json
+import os
+import tempfile
+import unittest
+
+HARD_PUZZLE = benchmark.CORPORA["adversarial"][0]  # Needs a search after the singles
+
+
+class SolveHooksTest(unittest.TestCase):
+    """Checks that the solver hooks report every change to the board and that a trace of them is well formed"""
+
+    def test_replaying_events_gives_the_solution(self):
+        b = Board.from_string(HARD_PUZZLE)
+        cells = bytearray(b.snapshot())
+        backtracks = []
+
+        def assigned(ind, val, depth):
+            self.assertFalse(cells[ind])
+            cells[ind] = val
+
+        def removed(ind, val):
+            self.assertEqual(cells[ind], val)
+            cells[ind] = 0
+        b.add_hook(constants.CELL_ASSIGNED_EVENT, assigned)
+        b.add_hook(constants.VALUE_REMOVED_EVENT, removed)
+        b.add_hook(constants.BACKTRACK_EVENT, lambda ind, depth: backtracks.append(depth))
+        b.solve()
+        self.assertEqual(bytes(cells), b.snapshot())
+        self.assertTrue(backtracks)
+
+    def test_add_and_remove(self):
+        b = Board.from_string(HARD_PUZZLE)
+        calls = []
+
+        def backtrack(ind, depth):
+            calls.append(ind)
+        with self.assertRaises(ValueError):
+            b.add_hook("no_such_event", backtrack)
+        b.add_hook(constants.BACKTRACK_EVENT, backtrack)
+        b.remove_hook(constants.BACKTRACK_EVENT, backtrack)
+        with self.assertRaises(ValueError):
+            b.remove_hook(constants.BACKTRACK_EVENT, backtrack)
+        b.solve()
+        self.assertEqual(calls, [])
+
+    def test_trace_is_balanced(self):
+        b = Board.from_string(HARD_PUZZLE)
+        collector = ChromeTraceCollector()
+        collector.attach(b)
+        b.count_solutions(2)
+        collector.detach(b)
+        phases = [event["ph"] for event in collector.get_events()]
+        self.assertGreater(phases.count("B"), 0)
+        self.assertEqual(phases.count("B"), phases.count("E"))
+        self.assertIn("i", phases)
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            collector.write(path)
+            with open(path) as f:
+                self.assertEqual(len(json.load(f)["traceEvents"]), len(phases))
+        finally:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+from board import Board
+import benchmark
+import unittest
+
+
+def sweep(b):
+    """
+    Fill in singles the slow way, checking every cell and unit again until a whole sweep places nothing
+    :param b: Board: The board to fill in
+    :return: None
+    """
+    placed = True
+    while placed:
+        placed = False
+        for ind in range(81):
+            if b._check_ind_cell(ind):
+                placed = True
+        for unit in range(27):
+            if b._check_unit(unit):
+                placed = True
+
+
+class SolveSimpleTest(unittest.TestCase):
+    """Checks that the queued single pass reaches the same fixed point as sweeping every cell and unit"""
+
+    def test_matches_sweep(self):
+        puzzles = [puzzle for corpus in benchmark.CORPORA.values() for puzzle in corpus]
+        puzzles += [Board.generate_board(seed=seed).to_string() for seed in range(40)]
+        for puzzle in puzzles:
+            queued = Board.from_string(puzzle)
+            queued._solve_simple()
+            swept = Board.from_string(puzzle)
+            sweep(swept)
+            self.assertEqual(queued.snapshot(), swept.snapshot(), puzzle)
+            # A second pass must not find anything the first one missed:
+            queued._solve_simple()
+            self.assertEqual(queued.snapshot(), swept.snapshot(), puzzle)
+
+
+if __name__ == "__main__":
+    unittest.main()
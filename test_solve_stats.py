@@ -0,0 +1,63 @@
+from board import Board
+from solve_stats import SolveStats
+import benchmark
+import constants
+import unittest
+
+HARD_PUZZLE = benchmark.CORPORA["adversarial"][0]  # Needs a search after the singles
+EASY_PUZZLE = benchmark.CORPORA["easy"][0]  # Singles are enough
+
+
+class SolveStatsTest(unittest.TestCase):
+    """Checks that the search counters and phase times are collected and add up across solves"""
+
+    def test_search_counters(self):
+        stats = SolveStats()
+        b = Board.from_string(HARD_PUZZLE)
+        self.assertIs(b.solve(stats=stats), stats)
+        self.assertGreater(stats.get_nodes(), 0)
+        self.assertGreater(stats.get_backtracks(), 0)
+        self.assertLess(stats.get_backtracks(), stats.get_nodes())
+        self.assertGreater(stats.get_max_depth(), 0)
+        self.assertGreater(stats.get_phase_time(SolveStats.SEARCH_PHASE), 0)
+        self.assertGreater(stats.get_total_time(), 0)
+        # Collecting stats must not change the solution:
+        plain = Board.from_string(HARD_PUZZLE)
+        plain.solve()
+        self.assertEqual(b, plain)
+
+    def test_singles_only(self):
+        stats = SolveStats()
+        Board.from_string(EASY_PUZZLE).solve(stats=stats)
+        self.assertEqual(stats.get_nodes(), 0)
+        self.assertEqual(stats.get_naked_singles() + stats.get_hidden_singles(), EASY_PUZZLE.count("0"))
+
+    def test_counters_add_up(self):
+        first = SolveStats()
+        Board.from_string(HARD_PUZZLE).solve(stats=first)
+        total = SolveStats()
+        for _ in range(2):
+            Board.from_string(HARD_PUZZLE).solve(stats=total)
+        self.assertEqual(total.get_nodes(), first.get_nodes() * 2)
+        self.assertEqual(total.get_backtracks(), first.get_backtracks() * 2)
+        self.assertEqual(total.get_max_depth(), first.get_max_depth())
+
+    def test_count_solutions_and_dlx(self):
+        for engine, phase in ((constants.BACKTRACKING_ENGINE, SolveStats.SEARCH_PHASE),
+                              (constants.DLX_ENGINE, SolveStats.DLX_PHASE)):
+            stats = SolveStats()
+            self.assertEqual(Board.from_string(HARD_PUZZLE).count_solutions(2, engine, stats), 1)
+            self.assertGreater(stats.get_nodes(), 0, engine)
+            self.assertGreater(stats.get_phase_time(phase), 0, engine)
+
+    def test_to_dict(self):
+        stats = SolveStats()
+        Board.from_string(HARD_PUZZLE).solve(stats=stats)
+        counters = stats.to_dict()
+        self.assertEqual(counters["nodes"], stats.get_nodes())
+        self.assertIn(SolveStats.SEARCH_PHASE, counters["phase_times"])
+        self.assertIn("nodes=" + str(stats.get_nodes()), str(stats))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+from board import Board
+from transforms import Transformation, VariantGenerator
+import benchmark
+import random
+import unittest
+import units
+
+PUZZLE = benchmark.CORPORA["easy"][0]
+
+
+def is_valid_solution(state):
+    """
+    Check if the values of a board are a valid filled sudoku
+    :param state: Bytes: The 81 values of the board
+    :return: Boolean: Does every row, col, and box hold each value once?
+    """
+    return all(sorted(state[ind] for ind in unit) == list(range(1, 10)) for unit in units.UNIT_CELLS)
+
+
+def transformations():
+    """
+    Make one of each kind of transformation
+    :return: List of Transformation: The transformations
+    """
+    return [Transformation(), Transformation.relabel((2, 3, 1, 5, 4, 9, 8, 7, 6)),
+            Transformation.permute_bands((2, 0, 1)), Transformation.permute_stacks((1, 2, 0)),
+            Transformation.permute_rows(1, (2, 1, 0)), Transformation.permute_cols(2, (1, 0, 2)),
+            Transformation.transpose(), Transformation.rotate(), Transformation.rotate(3),
+            Transformation.random(random.Random(1))]
+
+
+class TransformationTest(unittest.TestCase):
+    """Checks that transformations keep boards valid and compose like applying them in turn"""
+
+    def test_keeps_validity(self):
+        puzzle = Board.from_string(PUZZLE)
+        solved = Board.from_string(PUZZLE)
+        solved.solve()
+        for t in transformations():
+            self.assertTrue(is_valid_solution(t.apply(solved).snapshot()))
+            variant = t.apply(puzzle)
+            self.assertEqual(variant.count_solutions(), 1)
+            self.assertEqual(variant.to_string().count("0"), PUZZLE.count("0"))
+            # The solution of the variant is the variant of the solution:
+            variant.solve()
+            self.assertEqual(variant, t.apply(solved))
+
+    def test_then(self):
+        state = Board.from_string(PUZZLE).snapshot()
+        for first in transformations():
+            for second in transformations():
+                self.assertEqual(first.then(second).apply_state(state), second.apply_state(first.apply_state(state)))
+
+    def test_identities(self):
+        state = Board.from_string(PUZZLE).snapshot()
+        self.assertEqual(Transformation.rotate(4).get_sources(), Transformation().get_sources())
+        self.assertEqual(Transformation.transpose().then(Transformation.transpose()).apply_state(state), state)
+        self.assertEqual(Transformation.rotate(2).apply_state(state), state[::-1])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            Transformation([0] * 81)
+        with self.assertRaises(ValueError):
+            Transformation(labels=(1, 0, 2, 3, 4, 5, 6, 7, 8, 9))
+        with self.assertRaises(ValueError):
+            Transformation.relabel((1, 1, 2, 3, 4, 5, 6, 7, 8))
+
+
+class VariantGeneratorTest(unittest.TestCase):
+    """Checks that the variants are repeatable by seed and keep one solution"""
+
+    def test_seed(self):
+        board = Board.from_string(PUZZLE)
+        first = list(VariantGenerator(board, 3).generate_strings(20))
+        self.assertEqual(first, list(VariantGenerator(board, 3).generate_strings(20)))
+        self.assertNotEqual(first, list(VariantGenerator(board, 4).generate_strings(20)))
+
+    def test_variants(self):
+        gen = VariantGenerator(Board.from_string(PUZZLE), 5)
+        for _ in range(20):
+            variant = gen.generate()
+            self.assertEqual(variant.count_solutions(), 1)
+            self.assertEqual(variant.to_string().count("0"), PUZZLE.count("0"))
+
+    def test_not_unique(self):
+        with self.assertRaises(ValueError):
+            VariantGenerator(Board())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,227 @@
+from board import Board
+import itertools
+import operator
+import random
+
+# Transformations that turn a sudoku into another valid one with the same number of solutions:
+# Relabelling the digits, reordering the bands (groups of 3 rows) or stacks (groups of 3 cols), reordering the rows
+# in a band or the cols in a stack, transposing, and rotating. Each one moves the cells and relabels the values the
+# same way for the puzzle and its solution, so a puzzle with one solution keeps exactly one solution and no search is
+# needed to check the variants. A transformation is stored as the cell each cell takes its value from and the new
+# label of each value, so applying one is a single pass over the 81 values.
+
+_ORDERS = tuple(itertools.permutations(range(3)))  # Every order of 3 bands, stacks, rows, or cols
+# Every order of the 9 rows (or cols) that keeps each band (or stack) together, as the line that goes in each line:
+_LINE_ORDERS = tuple(tuple(band * 3 + row for band in bands for row in rows[band])
+                     for bands in _ORDERS for rows in itertools.product(_ORDERS, repeat=3))
+_PADDING = bytes(246)  # The end of a bytes.translate table, for the bytes that are never values
+
+# Tables used by VariantGenerator to make each variant with a few calls into C instead of a loop over the cells:
+# For each line order, a function that picks the 9 rows of a board in that order:
+_ROW_PICKS = tuple(operator.itemgetter(*rows) for rows in _LINE_ORDERS)
+# For each line order, and then each again with a transposition after it, a function that picks the values of a
+# snapshot in that order of cols:
+_COL_SOURCES = [[ind - ind % 9 + cols[ind % 9] for ind in range(81)] for cols in _LINE_ORDERS]
+_COL_TAKES = tuple(operator.itemgetter(*sources) for sources in _COL_SOURCES) + \
+    tuple(operator.itemgetter(*[sources[ind % 9 * 9 + ind // 9] for ind in range(81)]) for sources in _COL_SOURCES)
+# Every relabelling is one table that swaps values 5-9 among themselves, followed by one table that chooses the new
+# labels of values 1-4 and gives values 5-9 the labels left in increasing order, as ASCII digits:
+_SWAP_TABLES = tuple(bytes((0, 1, 2, 3, 4) + order) + _PADDING for order in itertools.permutations(range(5, 10)))
+_LABEL_TABLES = tuple(bytes([48] + [48 + label for label in first + tuple(sorted(set(range(1, 10)) - set(first)))]) +
+                      _PADDING for first in itertools.permutations(range(1, 10), 4))
+
+
+class Transformation:
+    """Represents a validity-preserving transformation of a sudoku board, which moves the cells and relabels the
+    values"""
+
+    __slots__ = ('_sources', '_labels', '_take', '_table')
+
+    def __init__(self, sources=tuple(range(81)), labels=tuple(range(10))):
+        """
+        Create a Transformation object (the identity if no arguments are given)
+        :param sources: Sequence of Integer: The flat index of the cell each cell takes its value from
+        :param labels: Sequence of Integer: The new value of each value, with labels[0] = 0 for empty cells
+        """
+        if sorted(sources) != list(range(81)) or sorted(labels) != list(range(10)) or labels[0] != 0:
+            raise ValueError("Transformation must move every cell and relabel every value exactly once")
+        self._sources = tuple(sources)
+        self._labels = tuple(labels)
+        self._take = operator.itemgetter(*self._sources)  # Picks the moved values out of a snapshot in one call
+        self._table = bytes(self._labels) + _PADDING  # Relabels a snapshot with bytes.translate
+
+    def get_sources(self):
+        """
+        Get where each cell takes its value from
+        :return: Tuple of Integer: The flat index of the source of each cell
+        """
+        return self._sources
+
+    def get_labels(self):
+        """
+        Get the new value of each value
+        :return: Tuple of Integer: The new value of each value from 0 to 9 (0 stays empty)
+        """
+        return self._labels
+
+    def apply(self, board):
+        """
+        Make the transformed copy of a board
+        :param board: Board: The board to transform (it is not changed)
+        :return: Board: The transformed board
+        """
+        b = Board()
+        b.restore(self.apply_state(board.snapshot()))
+        return b
+
+    def apply_state(self, state):
+        """
+        Transform the values of a board
+        :param state: Bytes: The 81 values of the board from Board.snapshot
+        :return: Bytes: The 81 transformed values, which can be given to Board.restore
+        """
+        return bytes(self._take(state)).translate(self._table)
+
+    def then(self, other):
+        """
+        Combine this transformation with one applied after it
+        :param other: Transformation: The transformation to apply second
+        :return: Transformation: The transformation that does both
+        """
+        return Transformation([self._sources[ind] for ind in other._sources],
+                              [other._labels[val] for val in self._labels])
+
+    @staticmethod
+    def relabel(labels):
+        """
+        Make a transformation that renames the values
+        :param labels: Sequence of Integer: The new value of each value from 1 to 9, in order
+        :return: Transformation: The relabelling
+        """
+        return Transformation(labels=(0,) + tuple(labels))
+
+    @staticmethod
+    def permute_bands(order):
+        """
+        Make a transformation that reorders the bands (rows 0-2, 3-5, and 6-8)
+        :param order: Sequence of Integer: The band that goes in each band's place
+        :return: Transformation: The reordering
+        """
+        return Transformation([order[ind // 27] * 27 + ind % 27 for ind in range(81)])
+
+    @staticmethod
+    def permute_stacks(order):
+        """
+        Make a transformation that reorders the stacks (cols 0-2, 3-5, and 6-8)
+        :param order: Sequence of Integer: The stack that goes in each stack's place
+        :return: Transformation: The reordering
+        """
+        return Transformation([ind - ind % 9 + order[ind % 9 // 3] * 3 + ind % 3 for ind in range(81)])
+
+    @staticmethod
+    def permute_rows(band, order):
+        """
+        Make a transformation that reorders the rows within a band
+        :param band: Integer: The band (0-2) whose rows are reordered
+        :param order: Sequence of Integer: The row of the band (0-2) that goes in each row's place
+        :return: Transformation: The reordering
+        """
+        return Transformation([(band * 3 + order[ind // 9 % 3]) * 9 + ind % 9 if ind // 27 == band else ind
+                               for ind in range(81)])
+
+    @staticmethod
+    def permute_cols(stack, order):
+        """
+        Make a transformation that reorders the cols within a stack
+        :param stack: Integer: The stack (0-2) whose cols are reordered
+        :param order: Sequence of Integer: The col of the stack (0-2) that goes in each col's place
+        :return: Transformation: The reordering
+        """
+        return Transformation([ind - ind % 9 + stack * 3 + order[ind % 3] if ind % 9 // 3 == stack else ind
+                               for ind in range(81)])
+
+    @staticmethod
+    def transpose():
+        """
+        Make a transformation that swaps the rows and cols (a flip across the main diagonal)
+        :return: Transformation: The transposition
+        """
+        return Transformation([ind % 9 * 9 + ind // 9 for ind in range(81)])
+
+    @staticmethod
+    def rotate(turns=1):
+        """
+        Make a transformation that turns the board clockwise
+        :param turns: Integer: The number of quarter turns
+        :return: Transformation: The rotation
+        """
+        t = Transformation()
+        for _ in range(turns % 4):
+            # A clockwise quarter turn puts the value of (8 - col, row) at (row, col):
+            t = t.then(Transformation([(8 - ind % 9) * 9 + ind // 9 for ind in range(81)]))
+        return t
+
+    @staticmethod
+    def random(rand):
+        """
+        Make a random transformation, with every layout of the cells and labelling of the values equally likely
+        :param rand: Random: The random.Random to choose with
+        :return: Transformation: The random transformation
+        """
+        rows = _LINE_ORDERS[rand.randrange(len(_LINE_ORDERS))]  # The row that goes in each row
+        cols = _LINE_ORDERS[rand.randrange(len(_LINE_ORDERS))]  # The col that goes in each col
+        if rand.getrandbits(1):
+            sources = [rows[ind % 9] * 9 + cols[ind // 9] for ind in range(81)]
+        else:
+            sources = [rows[ind // 9] * 9 + cols[ind % 9] for ind in range(81)]
+        labels = list(range(1, 10))
+        rand.shuffle(labels)
+        return Transformation(sources, [0] + labels)
+
+
+class VariantGenerator:
+    """Generates variants of one puzzle (or solved board) by applying random transformations to it. The puzzle is
+    checked for one solution once, and every variant keeps that one solution without being checked again, so this is
+    far faster than generating new puzzles. The variants come out the same for the same seed."""
+
+    __slots__ = ('_rows', '_random')
+
+    def __init__(self, board, seed=None):
+        """
+        Create a VariantGenerator object
+        :param board: Board: The puzzle or solved board to make variants of, which must have exactly one solution
+        :param seed: None or Integer: The seed of the random transformations (None for different variants each run)
+        """
+        if board.count_solutions(limit=2) != 1:
+            raise ValueError("Board must have exactly one solution to make variants of")
+        state = board.snapshot()
+        self._rows = tuple(state[row * 9:row * 9 + 9] for row in range(9))  # The values of each row of the board
+        self._random = random.Random(seed)
+
+    def generate(self):
+        """
+        Generate a variant of the board
+        :return: Board: A board with one solution that is a random transformation of the original
+        """
+        return Board.from_string(self._next())
+
+    def generate_strings(self, count):
+        """
+        Generate variants of the board as strings, without making a Board or Transformation for each one
+        :param count: Integer: The number of variants to generate
+        :return: Generator of String: Each variant as 81 characters with '0' for empty cells
+        """
+        for _ in range(count):
+            yield self._next()
+
+    def _next(self):
+        """
+        Make the next variant by reordering the rows, reordering the cols (and maybe transposing), and relabelling the
+        values, each with a precomputed table
+        :return: String: The variant as 81 characters with '0' for empty cells
+        """
+        randrange = self._random.randrange
+        rows = b"".join(_ROW_PICKS[randrange(len(_ROW_PICKS))](self._rows))
+        values = bytes(_COL_TAKES[randrange(len(_COL_TAKES))](rows))
+        values = values.translate(_SWAP_TABLES[randrange(len(_SWAP_TABLES))])
+        return values.translate(_LABEL_TABLES[randrange(len(_LABEL_TABLES))]).decode()
@@ -0,0 +1,21 @@
+# Index tables shared by every board, built once when the module is imported:
+# Cells are numbered row-wise from 0 to 80 (row * 9 + col) and boxes are numbered row-wise from the top-left.
+# Units are numbered 0-8 for the rows, 9-17 for the cols, and 18-26 for the boxes.
+
+ROW_OF = tuple(cell // 9 for cell in range(81))  # ROW_OF[cell] is the row index of the cell
+COL_OF = tuple(cell % 9 for cell in range(81))  # COL_OF[cell] is the column index of the cell
+BOX_OF = tuple(cell // 27 * 3 + cell % 9 // 3 for cell in range(81))  # BOX_OF[cell] is the box index of the cell
+
+# The cells in each row, col, and box, in row-wise order:
+ROW_CELLS = tuple(tuple(range(i * 9, i * 9 + 9)) for i in range(9))
+COL_CELLS = tuple(tuple(range(i, 81, 9)) for i in range(9))
+BOX_CELLS = tuple(tuple(i // 3 * 27 + i % 3 * 3 + r * 9 + c for r in range(3) for c in range(3)) for i in range(9))
+
+UNIT_CELLS = ROW_CELLS + COL_CELLS + BOX_CELLS  # UNIT_CELLS[unit] is the cells in that unit
+
+# UNITS_OF[cell] is the (row, col, box) unit numbers of the cell:
+UNITS_OF = tuple((ROW_OF[cell], 9 + COL_OF[cell], 18 + BOX_OF[cell]) for cell in range(81))
+
+# PEERS[cell] is the 20 other cells that share a row, col, or box with the cell, in increasing order:
+PEERS = tuple(tuple(sorted(set(ROW_CELLS[ROW_OF[cell]] + COL_CELLS[COL_OF[cell]] + BOX_CELLS[BOX_OF[cell]]) - {cell}))
+              for cell in range(81))